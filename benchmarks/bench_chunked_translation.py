@@ -0,0 +1,66 @@
+"""
+End-to-end translation latency against text length, single request versus parallel chunks.
+
+Uses a local stand-in for the Google endpoint whose latency grows with request size.
+Run from the repository root:
+    python -m benchmarks.bench_chunked_translation
+"""
+import asyncio
+import time
+
+from benchmarks.stand_in_servers import StandInServer, google_translate_app
+from utils.text_chunker import encoded_length, split_text, translate_in_chunks
+from utils.translation_client import GoogleTranslateClient
+
+PARAGRAPH = (
+    "Server maintenance is scheduled for this weekend. Expect short outages while we migrate "
+    "the database and update the bot. Events will resume on Monday evening. "
+)
+LENGTHS = [200, 500, 1000, 2000, 4000]
+CHUNK_SIZE = 1800
+
+
+def make_text(length):
+    paragraphs = []
+    while sum(len(p) + 2 for p in paragraphs) < length:
+        paragraphs.append(PARAGRAPH * 2)
+    return "\n\n".join(paragraphs)[:length]
+
+
+async def timed(coro_factory, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def main():
+    async with StandInServer(google_translate_app()) as server:
+        client = GoogleTranslateClient(base_url=f"{server.base_url}/m")
+        try:
+            print(f"{'chars':>8}{'single ms':>12}{'chunked ms':>12}{'chunks':>8}")
+            for length in LENGTHS:
+                text = make_text(length)
+
+                async def single():
+                    return await client.translate(text, 'en', 'fr')
+
+                async def chunked(size):
+                    return await translate_in_chunks(
+                        lambda chunk: client.translate(chunk, 'en', 'fr'), text, chunk_size=size
+                    )
+
+                single_ms = await timed(single)
+                # Smaller chunks show the effect of parallelism on texts under the production chunk size
+                size = min(CHUNK_SIZE, max(200, length // 4))
+                chunked_ms = await timed(lambda: chunked(size))
+                chunks = len(split_text(text, size, measure=encoded_length))
+                print(f"{length:>8}{single_ms:>12.1f}{chunked_ms:>12.1f}{chunks:>8}")
+        finally:
+            await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
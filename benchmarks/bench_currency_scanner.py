@@ -0,0 +1,87 @@
+"""
+Per-message cost of the passive currency scanner over a chat-like corpus.
+
+Most chat has no digits at all, some has numbers that are not prices, and a few
+messages mention an amount with a currency. Each group is timed separately, with
+and without the digit pre-check, along with the full corpus in its usual mix.
+
+Run from the repository root:
+    python -m benchmarks.bench_currency_scanner
+"""
+import time
+from decimal import Decimal
+
+from benchmarks.stand_in_servers import stand_in_rates
+from utils.fx_rates import CURRENCY_MENTION_PATTERN, RateTable, find_currency_mentions
+
+NO_DIGITS = [
+    "good morning everyone, anyone up for ranked tonight?",
+    "lol that patch notes thread is wild",
+    "can someone pin the event schedule pls",
+    "buenos días a todos, ¿quién juega esta noche?",
+    "c'est vraiment pas mal ce nouveau mode de jeu",
+    "das Update ist echt gut geworden",
+    "terima kasih banyak atas bantuannya",
+    "all good, try again after the restart",
+    "みなさんおはようございます、今夜だれか遊びますか？",
+    "모두 안녕하세요, 오늘 밤 누가 게임해요?",
+    "nah the new boss is way harder than the last one, we wiped like a dozen times before anyone "
+    "figured out the second phase and even then it took forever to get the timing right",
+    "ok",
+]
+
+NUMBERS_ONLY = [
+    "meet at 10:30 in voice",
+    "version 1.2.3 is out",
+    "room 101 at 5pm",
+    "2024 was a good year for the server",
+    "we need 3 more for the raid",
+    "gg 3 all, rematch?",
+    "my ping is 250 ms today, unplayable",
+]
+
+MENTIONS = [
+    "that's 50 SGD per person",
+    "€1.200,50 for the flights, not bad",
+    "the hotel was RM12.90 for breakfast lol",
+    "anyone selling the bundle for under $20?",
+    "paid 1,000,000 IDR for the tour",
+    "US$1,299.99 for the new phone is crazy",
+    "it's ¥3500 at the shop near the station",
+]
+
+# Roughly one message in twenty mentions a price, a few more have other numbers
+CORPUS = NO_DIGITS * 12 + NUMBERS_ONLY * 4 + MENTIONS * 1
+
+
+def per_message(func, texts, loops=2000):
+    start = time.perf_counter()
+    for _ in range(loops):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (loops * len(texts)) * 1e6
+
+
+def main():
+    rates = {currency: Decimal(str(rate)) for currency, rate in stand_in_rates('2026-01-15').items()}
+    rates['eur'] = Decimal(1)
+    table = RateTable('eur', '2026-01-15', rates)
+
+    def scan(text):
+        return find_currency_mentions(text, table)
+
+    def regex_only(text):
+        return CURRENCY_MENTION_PATTERN.search(text)
+
+    for text in MENTIONS:
+        print(f"{text!r:<48} {[(str(amount), code) for amount, code in scan(text)]}")
+    print()
+
+    print(f"{'messages':<22}{'count':>7}{'scanner us':>13}{'regex only us':>16}")
+    for name, texts in (("no digits", NO_DIGITS), ("numbers, no price", NUMBERS_ONLY),
+                        ("price mentions", MENTIONS), ("realistic mix", CORPUS)):
+        print(f"{name:<22}{len(texts):>7}{per_message(scan, texts):>13.2f}{per_message(regex_only, texts):>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
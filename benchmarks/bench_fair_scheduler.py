@@ -0,0 +1,65 @@
+"""
+Wait times under FairScheduler when one guild floods an operation.
+
+A heavy guild queues a burst of jobs just before several light guilds submit a
+few each. Compares first-come-first-served with weighted fair queuing.
+Run from the repository root:
+    python -m benchmarks.bench_fair_scheduler
+"""
+import asyncio
+import statistics
+import time
+
+from utils.quotas import FairScheduler
+
+SLOTS = 2
+JOB_TIME = 0.02
+HEAVY_JOBS = 60
+LIGHT_GUILDS = 4
+LIGHT_JOBS = 3
+
+
+class FifoScheduler:
+    """Plain semaphore for comparison."""
+
+    def __init__(self, slots):
+        self._semaphore = asyncio.Semaphore(slots)
+
+    async def acquire(self, guild_id, weight=1.0, cost=1):
+        await self._semaphore.acquire()
+
+    def release(self):
+        self._semaphore.release()
+
+
+async def job(scheduler, guild_id, waits):
+    start = time.perf_counter()
+    await scheduler.acquire(guild_id)
+    waits.setdefault(guild_id, []).append(time.perf_counter() - start)
+    try:
+        await asyncio.sleep(JOB_TIME)
+    finally:
+        scheduler.release()
+
+
+async def run(scheduler):
+    waits = {}
+    tasks = [asyncio.create_task(job(scheduler, 'heavy', waits)) for _ in range(HEAVY_JOBS)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(job(scheduler, f"light-{g}", waits))
+              for g in range(LIGHT_GUILDS) for _ in range(LIGHT_JOBS)]
+    await asyncio.gather(*tasks)
+    heavy = waits.pop('heavy')
+    light = [w for guild_waits in waits.values() for w in guild_waits]
+    return statistics.median(heavy), statistics.median(light), max(light)
+
+
+async def main():
+    print(f"{'scheduler':<12}{'heavy median ms':>17}{'light median ms':>17}{'light max ms':>14}")
+    for name, scheduler in [("fifo", FifoScheduler(SLOTS)), ("fair", FairScheduler(SLOTS))]:
+        heavy, light, light_max = await run(scheduler)
+        print(f"{name:<12}{heavy * 1000:>17.1f}{light * 1000:>17.1f}{light_max * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Throughput of FX history backfills against a local stand-in of the currency API.
+
+Always measures fetching and packing a year of daily snapshots, sequentially and
+with FxHistory's concurrent batches. When DATABASE_URL points at a scratch
+Postgres database, also runs the full backfill into fx_history there.
+Run from the repository root:
+    python -m benchmarks.bench_fx_backfill
+"""
+import asyncio
+import os
+import time
+from datetime import date, timedelta
+
+import asyncpg
+
+from benchmarks.stand_in_servers import StandInServer, currency_api_app
+from utils.fx_history import FxHistory
+from utils.fx_rates import FxRates
+
+DAYS = 365
+END = date(2026, 1, 15)
+
+
+class ScratchDatabase:
+    """Just enough of the bot for FxHistory: a pool and execute_db_operation."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def execute_db_operation(self, operation):
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                return await operation(conn)
+
+
+async def fetch_and_pack(history, days, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(day):
+        async with semaphore:
+            return await history.fetch_snapshot(day)
+
+    tables = await asyncio.gather(*(fetch(day) for day in days))
+    for table in tables:
+        for code in table.rates:
+            history.positions.setdefault(code, len(history.positions) + 1)
+    return [history.pack(table) for table in tables]
+
+
+async def main():
+    app = currency_api_app(latest=END.isoformat(), base_latency=0.01)
+    days = [END - timedelta(days=i) for i in range(DAYS)]
+    async with StandInServer(app) as server:
+        rates = FxRates(urls=[f"{server.base_url}/{{date}}/v1/currencies/{{base}}.json"], cache_path="/tmp/fx_bench.json")
+        try:
+            print(f"{'mode':<24}{'days':>6}{'seconds':>10}{'days/s':>10}")
+            for label, concurrency in [("sequential", 1), ("concurrent (6)", 6)]:
+                history = FxHistory(None, rates)
+                start = time.perf_counter()
+                packed = await fetch_and_pack(history, days, concurrency)
+                elapsed = time.perf_counter() - start
+                print(f"{label:<24}{len(packed):>6}{elapsed:>10.2f}{len(packed) / elapsed:>10.1f}")
+            print(f"packed row: {len(packed[0])} float8 values, ~{len(packed[0]) * 8 + 24} bytes")
+
+            database_url = os.getenv('DATABASE_URL')
+            if not database_url:
+                print("DATABASE_URL not set, skipping the database backfill")
+                return
+            pool = await asyncpg.create_pool(database_url)
+            try:
+                async with pool.acquire() as conn:
+                    await conn.execute("CREATE TABLE IF NOT EXISTS fx_currencies (idx SMALLINT PRIMARY KEY, code TEXT NOT NULL UNIQUE)")
+                    await conn.execute("CREATE TABLE IF NOT EXISTS fx_history (day DATE PRIMARY KEY, base TEXT NOT NULL, rates DOUBLE PRECISION[] NOT NULL)")
+                history = FxHistory(ScratchDatabase(pool), rates)
+                await history.load()
+                start = time.perf_counter()
+                stored = await history.backfill(days[-1], END)
+                elapsed = time.perf_counter() - start
+                print(f"{'database backfill':<24}{stored:>6}{elapsed:>10.2f}{stored / elapsed if elapsed else 0:>10.1f}")
+                series = await history.series('usd', 'sgd', days[-1], END)
+                print(f"usd/sgd series: {len(series)} points")
+            finally:
+                await pool.close()
+        finally:
+            await rates.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""
+Lookup time of the /translate language autocomplete index.
+
+Replays every prefix a user would type for each language's English and native
+name, plus a set of misspellings, and reports per-lookup latency. Discord drops
+autocomplete responses after 3 seconds. Run from the repository root:
+    python -m benchmarks.bench_language_autocomplete
+"""
+import random
+import statistics
+import time
+
+from utils.language_index import _build_index
+
+TYPOS = ["japnese", "deutsh", "portugese", "vietnamse", "ukranian", "swahilli", "indonesain", "farsee", "tagalg", "chinse"]
+
+
+def typed_prefixes(index):
+    queries = []
+    for code, name in index.names.items():
+        for term in (name, index.native_names.get(code) or ''):
+            queries.extend(term[:i] for i in range(1, len(term) + 1))
+    return queries
+
+
+def measure(index, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)], samples[-1]
+
+
+def main():
+    start = time.perf_counter()
+    index = _build_index()
+    print(f"index build: {(time.perf_counter() - start) * 1000:.1f} ms for {len(index.names)} languages")
+
+    prefixes = typed_prefixes(index)
+    random.Random(0).shuffle(prefixes)
+    print(f"{'queries':<20}{'count':>8}{'median us':>12}{'p99 us':>10}{'max us':>10}")
+    for label, queries in [("typed prefixes", prefixes), ("misspellings", TYPOS * 100), ("empty", [""] * 1000)]:
+        median, p99, worst = measure(index, queries)
+        print(f"{label:<20}{len(queries):>8}{median:>12.1f}{p99:>10.1f}{worst:>10.1f}")
+
+    for query in TYPOS:
+        print(f"  {query!r} -> {[index.label(code) for code in index.search(query, 3)]}")
+
+
+if __name__ == "__main__":
+    main()
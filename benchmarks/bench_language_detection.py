@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of language detection latency on Discord-length messages.
+
+Run from the repository root:
+    python -m benchmarks.bench_language_detection
+"""
+import statistics
+import time
+
+from langdetect import detect
+
+from utils import language_detection
+from utils.language_detection import detect_language, warm_up
+
+CORPUS = [
+    "good morning everyone, anyone up for ranked tonight?",
+    "lol that patch notes thread is wild",
+    "can someone pin the event schedule pls",
+    "buenos días a todos, ¿quién juega esta noche?",
+    "no entiendo nada de lo que pasó ayer jaja",
+    "salut tout le monde, on se retrouve à 21h ?",
+    "c'est vraiment pas mal ce nouveau mode de jeu",
+    "guten Morgen, hat jemand Lust auf eine Runde?",
+    "das Update ist echt gut geworden",
+    "bom dia pessoal, alguém online?",
+    "ciao a tutti, stasera si gioca?",
+    "goedemorgen allemaal, wie doet er mee vanavond?",
+    "selamat pagi semua, ada yang mau main?",
+    "terima kasih banyak atas bantuannya",
+    "magandang umaga sa inyong lahat",
+    "chào buổi sáng mọi người, tối nay chơi không?",
+    "merhaba arkadaşlar, bu akşam kim oynuyor?",
+    "dzień dobry, ktoś chce zagrać wieczorem?",
+    "всем привет, кто сегодня играет?",
+    "доброго ранку всім, хто сьогодні грає?",
+    "καλημέρα σε όλους, ποιος παίζει απόψε;",
+    "مرحبا بالجميع، من سيلعب الليلة؟",
+    "سلام به همه، کی امشب بازی می‌کند؟",
+    "שלום לכולם, מי משחק הערב?",
+    "สวัสดีทุกคน คืนนี้ใครเล่นบ้าง",
+    "みなさんおはようございます、今夜だれか遊びますか？",
+    "모두 안녕하세요, 오늘 밤 누가 게임해요?",
+    "大家早上好，今晚谁一起玩？",
+    "大家早安，今晚誰要一起玩？",
+    "नमस्ते सबको, आज रात कौन खेल रहा है?",
+]
+
+
+def measure(func, texts, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            func(text)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+
+def main():
+    start = time.perf_counter()
+    warm_up()
+    print(f"profile warm-up: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    rows = [
+        ("langdetect.detect", lambda: measure(detect, CORPUS)),
+        ("script detection only", lambda: measure(language_detection.detect_script, CORPUS)),
+    ]
+
+    def uncached():
+        samples = []
+        for _ in range(5):
+            language_detection._detected.clear()
+            samples.append(measure(detect_language, CORPUS, repeat=1))
+        return statistics.median(s[0] for s in samples), statistics.median(s[1] for s in samples)
+
+    rows.append(("detect_language (cold cache)", uncached))
+    rows.append(("detect_language (memoized)", lambda: measure(detect_language, CORPUS)))
+
+    print(f"{'variant':<32}{'median us':>12}{'p95 us':>12}")
+    for name, run in rows:
+        median, p95 = run()
+        print(f"{name:<32}{median:>12.1f}{p95:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
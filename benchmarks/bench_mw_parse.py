@@ -0,0 +1,150 @@
+"""
+Cost of parsing Merriam-Webster entry pages, and how long it stalls the event loop.
+
+Parses each page with PyMultiDictionary's full-document soup and with
+parse_mw_page, which only builds the definition parts. Then runs a burst of
+parses on the event loop and through the parse pool while a heartbeat task
+measures the longest gap between its ticks, the delay gateway heartbeats would see.
+
+Pass a directory of saved entry pages (e.g. `curl -o cat.html
+https://www.merriam-webster.com/dictionary/cat`) to benchmark real pages;
+without one, stand-in pages with the same markup and typical size are generated.
+
+The full-soup comparison needs PyMultiDictionary, which the bot no longer depends
+on (`pip install pymultidictionary`); without it only parse_mw_page is timed.
+
+Run from the repository root:
+    python -m benchmarks.bench_mw_parse [pages_dir]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+try:
+    from PyMultiDictionary import DICT_MW, MultiDictionary
+    from PyMultiDictionary import _dictionary
+except ImportError:  # Optional, only used for the full-soup comparison
+    MultiDictionary = None
+
+from utils import mw_dictionary
+from utils.mw_dictionary import MW_URL, parse_mw_page
+
+WORDS = ["run", "set", "light", "cat", "serendipity", "bank"]
+
+
+def stand_in_page(word, parts=3, senses=6, filler_kb=300):
+    """An entry page shaped like MW's: definitions amid scripts, navigation and related content."""
+    sections = []
+    for p, pos in enumerate(["noun", "verb", "adjective"][:parts]):
+        sense_html = "".join(
+            f'<div class="sb sb-{i}"><span class="sn">{i + 1}</span><span class="dt">'
+            f'<span class="dtText"><strong class="mw_t_bc">: </strong>meaning {i + 1} of {word} as a {pos} '
+            f'<a href="/dictionary/other">with a link</a> and <em>emphasis</em></span>'
+            f'<span class="ex-sent">example sentence using {word}</span></span></div>'
+            for i in range(senses)
+        )
+        sections.append(
+            f'<div class="entry-header"><h1 class="hword">{word}</h1>'
+            f'<h2 class="parts-of-speech"><a class="important-blue-link">{pos}</a></h2></div>'
+            f'<div class="vg" id="dictionary-entry-{p + 1}">{sense_html}</div>'
+        )
+    block = ('<div class="related-item"><ul>' + "".join(f'<li><a href="/dictionary/w{i}">word {i}</a></li>' for i in range(20))
+             + '</ul><p class="note">Usage notes, etymology and trending words.</p></div>'
+             + '<script>window.dataLayer=window.dataLayer||[];dataLayer.push({"event":"pageview"});</script>')
+    filler = block * (filler_kb * 1024 // len(block))
+    nav = '<nav class="header">' + "".join(f'<a href="/browse/{c}">{c}</a>' for c in "abcdefghijklmnopqrstuvwxyz") + '</nav>'
+    return f'<!DOCTYPE html><html><head><title>{word}</title></head><body>{nav}{"".join(sections)}{filler}</body></html>'
+
+
+def load_pages(directory):
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".html"):
+            with open(os.path.join(directory, name), encoding="utf-8") as page:
+                pages[name[:-5]] = page.read()
+    return pages
+
+
+def pymultidictionary_parse(word, path):
+    md = MultiDictionary()
+    _dictionary._CACHED_SOUPS.clear()
+    md._test_cached_file[MW_URL.format(word=word)] = path
+    return md.meaning("en", word, dictionary=DICT_MW)
+
+
+def time_ms(func, *args, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples)
+
+
+async def worst_heartbeat_gap(work):
+    gaps = []
+    done = False
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.02)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done = True
+    await beat
+    return elapsed * 1e3, max(gaps) * 1e3
+
+
+async def main():
+    if len(sys.argv) > 1:
+        directory = sys.argv[1]
+        pages = load_pages(directory)
+        print(f"{len(pages)} saved pages from {directory}")
+    else:
+        directory = tempfile.mkdtemp(prefix="mw_pages_")
+        pages = {word: stand_in_page(word) for word in WORDS}
+        for word, html in pages.items():
+            with open(os.path.join(directory, f"{word}.html"), "w", encoding="utf-8") as page:
+                page.write(html)
+        print(f"{len(pages)} stand-in pages of ~{len(next(iter(pages.values()))) // 1024} KB")
+
+    if MultiDictionary is None:
+        print("PyMultiDictionary is not installed, skipping the full soup comparison")
+
+    print(f"\n{'page':<16}{'KB':>6}{'senses':>8}{'full soup ms':>14}{'strained ms':>13}")
+    for word, html in pages.items():
+        path = os.path.join(directory, f"{word}.html")
+        full = f"{time_ms(pymultidictionary_parse, word, path):.1f}" if MultiDictionary is not None else "n/a"
+        strained = time_ms(parse_mw_page, html)
+        senses = sum(len(defs) for defs in parse_mw_page(html).values())
+        print(f"{word:<16}{len(html) // 1024:>6}{senses:>8}{full:>14}{strained:>13.1f}")
+
+    burst = list(pages.values()) * 3
+    loop = asyncio.get_running_loop()
+
+    async def on_loop():
+        for html in burst:
+            parse_mw_page(html)
+
+    async def in_pool():
+        await asyncio.gather(*(loop.run_in_executor(mw_dictionary._parse_pool, parse_mw_page, html) for html in burst))
+
+    print(f"\n{len(burst)} parses{'':<14}{'total ms':>10}{'worst loop stall ms':>22}")
+    for name, work in (("on the event loop", on_loop), ("in the parse pool", in_pool)):
+        total, stall = await worst_heartbeat_gap(work)
+        print(f"{name:<24}{total:>10.1f}{stall:>22.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
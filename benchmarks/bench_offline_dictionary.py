@@ -0,0 +1,51 @@
+"""
+Latency of offline dictionary lookups and spelling suggestions.
+
+Needs a built database, for example from the WordNet files bundled in the `wn`
+0.0.x source distribution:
+    python -m utils.offline_dictionary path/to/wordnet-3.0 --out /tmp/dictionary.sqlite3
+
+Run from the repository root:
+    python -m benchmarks.bench_offline_dictionary [/tmp/dictionary.sqlite3]
+"""
+import statistics
+import sys
+import time
+
+from utils.offline_dictionary import DICTIONARY_PATH, OfflineDictionary
+
+COMMON = ["cat", "house", "run", "running", "geese", "better", "beautiful", "ice cream", "serendipity", "quickly"]
+TYPOS = ["recieve", "definately", "accomodate", "seperate", "occured", "goverment", "wierd", "teh", "yeet", "xqzv"]
+
+
+def measure_us(func, words, repeat=20):
+    samples = []
+    for _ in range(repeat):
+        for word in words:
+            start = time.perf_counter()
+            func(word)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DICTIONARY_PATH
+    dictionary = OfflineDictionary.open(path)
+    if dictionary is None:
+        sys.exit(f"No dictionary at {path}, build one first (see the module docstring)")
+
+    for word in TYPOS:
+        print(f"{word:<12} -> {', '.join(dictionary.suggest(word)) or '(none)'}")
+    print()
+
+    print(f"{'operation':<28}{'median us':>12}{'p95 us':>12}")
+    for name, func, words in (("lookup, common words", dictionary.lookup, COMMON),
+                              ("lookup, misspelled words", dictionary.lookup, TYPOS),
+                              ("suggest, misspelled words", dictionary.suggest, TYPOS)):
+        median, p95 = measure_us(func, words)
+        print(f"{name:<28}{median:>12.1f}{p95:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Latency of routed translations when the primary provider is healthy, slow or failing.
+
+Runs a stand-in Google endpoint and a stand-in LibreTranslate instance locally and
+prints per-scenario latency along with the router's provider metrics.
+Run from the repository root:
+    python -m benchmarks.bench_provider_failover
+"""
+import asyncio
+import statistics
+import time
+
+from benchmarks.stand_in_servers import StandInServer, google_translate_app, libretranslate_app
+from utils.translation_client import GoogleTranslateClient
+from utils.translation_providers import GoogleProvider, LibreTranslateProvider, ProviderRouter
+
+REQUESTS = 20
+
+SCENARIOS = [
+    ("healthy primary", {'base_latency': 0.05, 'status': 200}),
+    ("slow primary (hedged)", {'base_latency': 2.5, 'status': 200}),
+    ("failing primary (failover)", {'base_latency': 0.05, 'status': 429}),
+    ("recovered primary", {'base_latency': 0.05, 'status': 200}),
+]
+
+
+async def main():
+    google_app = google_translate_app()
+    async with StandInServer(google_app) as google, StandInServer(libretranslate_app()) as libre:
+        router = ProviderRouter([
+            GoogleProvider(GoogleTranslateClient(base_url=f"{google.base_url}/m")),
+            LibreTranslateProvider(libre.base_url),
+        ], probe_interval=0.5, trip_for=1.0)
+        try:
+            print(f"{'scenario':<30}{'median ms':>12}{'max ms':>10}  served by")
+            for name, settings in SCENARIOS:
+                google_app.update(settings)
+                before = {p.name: p.stats.requests - p.stats.errors for p in router.providers}
+                samples = []
+                for i in range(REQUESTS):
+                    start = time.perf_counter()
+                    await router.translate(f"message {i}", 'en', 'fr')
+                    samples.append((time.perf_counter() - start) * 1000)
+                    # Let the router's probe interval elapse a few times per scenario
+                    await asyncio.sleep(0.05)
+                served = ", ".join(f"{p.name}={p.stats.requests - p.stats.errors - before[p.name]}"
+                                   for p in router.providers)
+                print(f"{name:<30}{statistics.median(samples):>12.1f}{max(samples):>10.1f}  {served}")
+
+            print()
+            for provider, stats in router.stats().items():
+                latency = f"{stats['latency'] * 1000:.1f} ms" if stats['latency'] is not None else "n/a"
+                print(f"{provider}: requests={stats['requests']} errors={stats['errors']} "
+                      f"cancelled={stats['cancelled']} latency={latency} score={stats['score']:.2f} "
+                      f"healthy={stats['healthy']}")
+        finally:
+            await router.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
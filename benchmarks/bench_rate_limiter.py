@@ -0,0 +1,58 @@
+"""
+Backend round trips and latency of RateLimiter with and without its local fast path.
+
+The shared backend is a MemoryBackend behind an artificial delay standing in for a
+Postgres round trip. Run from the repository root:
+    python -m benchmarks.bench_rate_limiter
+"""
+import asyncio
+import random
+import statistics
+import time
+
+from utils.ratelimit import MemoryBackend, RateLimiter
+
+ROUND_TRIP = 0.002
+USERS = 200
+CALLS = 5000
+
+
+class SlowBackend(MemoryBackend):
+    """A MemoryBackend that answers after a database-like delay."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    async def consume(self, bucket, capacity, refill, cost=1):
+        await asyncio.sleep(self.delay)
+        return await super().consume(bucket, capacity, refill, cost)
+
+
+async def run(limiter, rate, per, burst):
+    rng = random.Random(0)
+    samples = []
+    allowed = 0
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        retry_after = await limiter.hit('bench', rng.randrange(USERS), rate, per, burst=burst)
+        samples.append((time.perf_counter() - start) * 1000)
+        allowed += not retry_after
+    await asyncio.gather(*limiter._pending)
+    return allowed, statistics.median(samples), sorted(samples)[int(len(samples) * 0.99)]
+
+
+async def main():
+    print(f"{'limit':<28}{'allowed':>9}{'fast path':>11}{'backend calls':>15}{'median ms':>11}{'p99 ms':>9}")
+    for label, rate, per, burst in [
+        ("1 per 10s (cooldown)", 1, 10.0, None),
+        ("30 per 60s, burst 30", 30, 60.0, None),
+    ]:
+        limiter = RateLimiter(SlowBackend(ROUND_TRIP))
+        allowed, median, p99 = await run(limiter, rate, per, burst)
+        fast = limiter.fast_allowed + limiter.fast_denied
+        print(f"{label:<28}{allowed:>9}{fast:>11}{limiter.backend_calls:>15}{median:>11.3f}{p99:>9.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
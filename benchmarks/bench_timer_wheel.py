@@ -0,0 +1,107 @@
+"""
+Cost of keeping many view timeouts pending: a task per view versus the shared timer wheel.
+
+The per-view side mirrors discord.py's View timeout: a task sleeping until the
+expiry, re-armed by pushing the expiry forward on interaction and cancelled on
+stop(). Measures the time to arm N timeouts, the memory they hold, the event
+loop's scheduled handles, how long a round of interactions pushing back every
+expiry takes, and the cost of cancelling them all.
+
+Run from the repository root:
+    python -m benchmarks.bench_timer_wheel
+"""
+import asyncio
+import time
+import tracemalloc
+
+from utils.timer_wheel import TimerWheel
+
+COUNTS = [1_000, 10_000, 50_000]
+TIMEOUT = 180.0
+
+
+class TaskTimeout:
+    """discord.py's per-view timeout: one task sleeping until the expiry."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.expiry = time.monotonic() + timeout
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while True:
+            now = time.monotonic()
+            if now >= self.expiry:
+                return
+            await asyncio.sleep(self.expiry - now)
+
+    def refresh(self):
+        self.expiry = time.monotonic() + self.timeout
+
+    def cancel(self):
+        self.task.cancel()
+
+
+class WheelTimeout:
+    """A WheelView's timeout: one handle on the shared wheel, re-checked when it fires."""
+
+    def __init__(self, wheel, timeout):
+        self.wheel = wheel
+        self.timeout = timeout
+        self.expiry = time.monotonic() + timeout
+        self.handle = wheel.schedule(timeout, self.expired, kind='view')
+
+    def expired(self):
+        pass
+
+    def refresh(self):
+        self.expiry = time.monotonic() + self.timeout
+
+    def cancel(self):
+        self.handle.cancel()
+
+
+async def measure(name, make, count):
+    loop = asyncio.get_running_loop()
+    tracemalloc.start()
+    timers = [make() for _ in range(count)]
+    # Let every task reach its first sleep
+    await asyncio.sleep(0)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    for timer in timers:
+        timer.cancel()
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    timers = [make() for _ in range(count)]
+    await asyncio.sleep(0)
+    arm = time.perf_counter() - start
+    handles = len(loop._scheduled)
+
+    start = time.perf_counter()
+    for timer in timers:
+        timer.refresh()
+    refresh = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for timer in timers:
+        timer.cancel()
+    await asyncio.sleep(0)
+    cancel = time.perf_counter() - start
+    print(f"{name:<14}{count:>8}{arm * 1e3:>10.1f}{memory / 1024 / 1024:>10.1f}{handles:>12}"
+          f"{refresh * 1e3:>12.1f}{cancel * 1e3:>12.1f}")
+
+
+async def main():
+    print(f"{'timeouts':<14}{'count':>8}{'arm ms':>10}{'MiB':>10}{'loop timers':>12}"
+          f"{'refresh ms':>12}{'cancel ms':>12}")
+    for count in COUNTS:
+        await measure("task per view", lambda: TaskTimeout(TIMEOUT), count)
+        wheel = TimerWheel()
+        await measure("timer wheel", lambda: WheelTimeout(wheel, TIMEOUT), count)
+        await wheel.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Local stand-ins for the HTTP services the bot talks to, for benchmarks and manual testing.
+
+The servers mimic the response shapes the bot parses, with a configurable latency,
+so nothing here reaches the real upstream services.
+"""
+import asyncio
+import html
+
+from aiohttp import web
+
+
+class StandInServer:
+    """Runs an aiohttp application on a free local port."""
+
+    def __init__(self, app):
+        self.app = app
+        self.runner = None
+        self.base_url = None
+
+    async def __aenter__(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
+
+
+def fake_translation(text, target):
+    return f"[{target}] {text}"
+
+
+def google_translate_app(base_latency=0.15, per_char_latency=0.0002, status=200):
+    """
+    Serves /m like Google's mobile page; latency grows with the length of the text.
+
+    The latency and status live on the app, so a benchmark can make the server slow
+    or failing between requests.
+    """
+    app = web.Application()
+    app['requests'] = 0
+    app['base_latency'] = base_latency
+    app['status'] = status
+
+    async def translate(request):
+        app['requests'] += 1
+        text = request.query.get('q', '')
+        await asyncio.sleep(app['base_latency'] + per_char_latency * len(text))
+        if app['status'] != 200:
+            return web.Response(status=app['status'])
+        translation = html.escape(fake_translation(text, request.query.get('tl', '')))
+        return web.Response(text=f'<html><body><div class="result-container">{translation}</div></body></html>',
+                            content_type='text/html')
+
+    app.router.add_get('/m', translate)
+    return app
+
+
+def libretranslate_app(base_latency=0.05, status=200):
+    """Serves POST /translate like a LibreTranslate instance."""
+    app = web.Application()
+    app['requests'] = 0
+    app['base_latency'] = base_latency
+    app['status'] = status
+
+    async def translate(request):
+        app['requests'] += 1
+        payload = await request.json()
+        await asyncio.sleep(app['base_latency'])
+        if app['status'] != 200:
+            return web.json_response({'error': 'unavailable'}, status=app['status'])
+        return web.json_response({'translatedText': fake_translation(payload['q'], payload['target'])})
+
+    app.router.add_post('/translate', translate)
+    return app
+
+
+STAND_IN_CURRENCIES = {
+    'usd': 1.08, 'gbp': 0.85, 'jpy': 162.0, 'cad': 1.47, 'hkd': 8.45, 'inr': 90.1,
+    'idr': 17150.0, 'myr': 5.1, 'sgd': 1.46, 'krw': 1470.0, 'aud': 1.64, 'chf': 0.96,
+}
+
+
+def stand_in_rates(date):
+    """Deterministic EUR-based rates for a YYYY-MM-DD date, drifting a little each day."""
+    drift = 1 + (hash(date) % 200 - 100) / 10_000
+    return {currency: round(rate * drift, 6) for currency, rate in STAND_IN_CURRENCIES.items()}
+
+
+def currency_api_app(latest='2026-01-15', base_latency=0.01):
+    """
+    Serves /{date}/v1/currencies/{base}.json like the fawazahmed0 currency API.
+
+    'latest' resolves to app['latest'], which can be moved forward between requests.
+    Responses carry an ETag and honour If-None-Match.
+    """
+    app = web.Application()
+    app['requests'] = 0
+    app['latest'] = latest
+
+    async def currencies(request):
+        app['requests'] += 1
+        await asyncio.sleep(base_latency)
+        date = request.match_info['date']
+        date = app['latest'] if date == 'latest' else date
+        if date > app['latest']:
+            return web.Response(status=404)
+        base = request.match_info['base']
+        rates = stand_in_rates(date)
+        if base != 'eur':
+            if base not in rates:
+                return web.Response(status=404)
+            rates = {currency: rate / rates[base] for currency, rate in rates.items()}
+            rates['eur'] = 1 / stand_in_rates(date)[base]
+        else:
+            rates['eur'] = 1.0
+        etag = f'"{date}-{base}"'
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.json_response({'date': date, base: rates}, headers={'ETag': etag})
+
+    app.router.add_get('/{date}/v1/currencies/{base}.json', currencies)
+    return app
@@ -9,6 +9,12 @@ import asyncpg
 import discord
 from discord.ext import commands
 
+from utils.channel_settings import ChannelSettings
+from utils.paginator import PageButton
+from utils.quotas import GuildQuotas
+from utils.ratelimit import PostgresBackend, RateLimiter
+from utils.timer_wheel import timer_wheel
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -36,6 +42,10 @@ class MyBot(commands.Bot):
         db_pool (Optional[asyncpg.Pool]): Connection pool for database operations
         config (Dict[str, Any]): Bot configuration settings
         guild_ids (List[int]): Cached list of guild IDs
+        channel_settings (ChannelSettings): Cached per-channel settings
+        rate_limiter (RateLimiter): Token-bucket limits shared through the database
+        quotas (GuildQuotas): Per-guild daily budgets and fair scheduling
+        timer_wheel (TimerWheel): Shared timer for view timeouts and cache expiry
         ready_event (asyncio.Event): Event to track bot's ready state
     """
 
@@ -57,6 +67,10 @@ class MyBot(commands.Bot):
         self.config_path = config_path
         self.db_pool: Optional[asyncpg.Pool] = None
         self.guild_ids: List[int] = []
+        self.channel_settings = ChannelSettings(self)
+        self.rate_limiter = RateLimiter(PostgresBackend(self))
+        self.quotas = GuildQuotas(self)
+        self.timer_wheel = timer_wheel
         
         with open(self.config_path, 'r') as config_file:
             self.config = json.load(config_file)
@@ -120,12 +134,24 @@ class MyBot(commands.Bot):
         This method is automatically called by discord.py.
         """
         try:
+            # Drive view timeouts and cache expiry from a single task
+            self.timer_wheel.start()
+
             # Initialize database
             await self.init_database()
             
             # Cache guild IDs
             await self.cache_guild_ids()
+
+            # Cache per-channel settings
+            await self.channel_settings.load()
+
+            # Cache quota settings and today's usage
+            await self.quotas.load()
             
+            # Route persistent paginator buttons, including those sent before a restart
+            self.add_dynamic_items(PageButton)
+
             # Load cogs
             await self.load_all_cogs()
             
@@ -160,6 +186,74 @@ class MyBot(commands.Bot):
                     PRIMARY KEY (key, guild_id)
                 )
             ''')
+
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS channel_settings (
+                    channel_id BIGINT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    guild_id BIGINT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (channel_id, key)
+                )
+            ''')
+
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    text_hash TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (text_hash, source, target)
+                )
+            ''')
+
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS translated_messages (
+                    message_id BIGINT NOT NULL,
+                    lang TEXT NOT NULL,
+                    translation_id BIGINT NOT NULL,
+                    channel_id BIGINT NOT NULL,
+                    expires_at TIMESTAMPTZ NOT NULL,
+                    PRIMARY KEY (message_id, lang)
+                )
+            ''')
+
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    bucket TEXT PRIMARY KEY,
+                    tokens DOUBLE PRECISION NOT NULL,
+                    updated_at TIMESTAMPTZ NOT NULL,
+                    last_allowed TIMESTAMPTZ NOT NULL
+                )
+            ''')
+
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS guild_usage (
+                    guild_id BIGINT NOT NULL,
+                    operation TEXT NOT NULL,
+                    day DATE NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (guild_id, operation, day)
+                )
+            ''')
+
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS fx_currencies (
+                    idx SMALLINT PRIMARY KEY,
+                    code TEXT NOT NULL UNIQUE
+                )
+            ''')
+
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS fx_history (
+                    day DATE PRIMARY KEY,
+                    base TEXT NOT NULL,
+                    rates DOUBLE PRECISION[] NOT NULL
+                )
+            ''')
         
         try:
             await self.execute_db_operation(create_tables)
@@ -331,9 +425,11 @@ class MyBot(commands.Bot):
             async with self.db_pool.acquire() as conn:
                 await conn.execute("DELETE FROM guilds WHERE guild_id = $1", guild_id)
                 await conn.execute("DELETE FROM bot_settings WHERE guild_id = $1", guild_id)
+                await conn.execute("DELETE FROM channel_settings WHERE guild_id = $1", guild_id)
                 if guild_id in self.guild_ids:
                     self.guild_ids.remove(guild_id)
                 logger.info(f"Removed guild {guild_id} from database")
+            await self.channel_settings.load()
         except Exception as e:
             logger.error(f"Failed to remove guild {guild_id}: {e}")
 
@@ -367,6 +463,13 @@ class MyBot(commands.Bot):
         await self.apply_server_nicknames()
         await self.sync_all_commands()
 
+    async def close(self) -> None:
+        """
+        Stops the shared timer wheel and closes the connection to Discord.
+        """
+        await self.timer_wheel.stop()
+        await super().close()
+
     async def start_bot(self) -> None:
         """
         Starts the bot with the configured token.
@@ -1,6 +1,9 @@
 import discord
 from discord.ext import commands
 
+from utils.helpers import admin_only
+from utils.quotas import BUDGET_KEY, DM_GUILD_ID, OPERATIONS, WEIGHT_KEY
+
 class Admin(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -19,5 +22,62 @@ class Admin(commands.Cog):
         await member.remove_roles(role)
         await ctx.send(f'Removed {role.mention} from {member.mention}')
 
+    @commands.command(name='usage', help="Shows today's usage of metered operations.")
+    @admin_only()
+    async def usage(self, ctx, scope: str = None):
+        """Shows this server's usage, or every server's with `all` for the bot owner."""
+        quotas = self.bot.quotas
+        if scope == 'all' and await self.bot.is_owner(ctx.author):
+            usage = quotas.usage()
+        else:
+            usage = quotas.usage(ctx.guild.id)
+
+        embed = discord.Embed(title="Usage Today (UTC)", color=discord.Color.blue())
+        for guild_id, operations in list(usage.items())[:25]:
+            guild = self.bot.get_guild(guild_id)
+            name = guild.name if guild else "Direct messages" if guild_id == DM_GUILD_ID else guild_id
+            lines = []
+            for operation, (used, budget) in operations.items():
+                waiting = quotas.schedulers[operation].waiting(guild_id)
+                line = f"`{operation}`: {used}/{budget}"
+                lines.append(f"{line} ({waiting} queued)" if waiting else line)
+            weight = quotas.weight_for(guild_id)
+            embed.add_field(
+                name=f"{name} (weight {weight:g})",
+                value="\n".join(lines),
+                inline=False
+            )
+        if not usage:
+            embed.description = "Nothing has been used today."
+        await ctx.send(embed=embed)
+
+    @commands.command(name='setquota', help='Sets the daily budget of an operation for a server.')
+    @commands.is_owner()
+    async def setquota(self, ctx, operation: str, budget: str, guild_id: int = None):
+        """Sets a daily budget; `default` clears it, guild ID 0 sets the default for every server."""
+        if operation not in OPERATIONS:
+            await ctx.send(f"Unknown operation. Choose from: {', '.join(OPERATIONS)}")
+            return
+        guild_id = ctx.guild.id if guild_id is None else guild_id
+        if budget == 'default':
+            await self.bot.quotas.set(guild_id, f"{BUDGET_KEY}{operation}", None)
+        elif budget.isdigit():
+            await self.bot.quotas.set(guild_id, f"{BUDGET_KEY}{operation}", int(budget))
+        else:
+            await ctx.send("The budget must be a whole number or `default`.")
+            return
+        await ctx.send(f"Daily `{operation}` budget for {guild_id} is now {self.bot.quotas.budget_for(guild_id, operation)}.")
+
+    @commands.command(name='setweight', help="Sets a server's share of busy operations.")
+    @commands.is_owner()
+    async def setweight(self, ctx, weight: float, guild_id: int = None):
+        """Sets a server's fair-share weight; higher weights get more of the queue."""
+        if weight <= 0:
+            await ctx.send("The weight must be positive.")
+            return
+        guild_id = ctx.guild.id if guild_id is None else guild_id
+        await self.bot.quotas.set(guild_id, WEIGHT_KEY, weight)
+        await ctx.send(f"Scheduling weight for {guild_id} is now {weight:g}.")
+
 async def setup(bot):
     await bot.add_cog(Admin(bot))
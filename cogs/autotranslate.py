@@ -0,0 +1,194 @@
+import asyncio
+import logging
+
+import discord
+from discord.ext import commands
+
+from utils.helpers import admin_only
+from utils.quotas import QuotaExceeded
+from utils.text_chunker import split_text
+
+SETTING_PREFIX = 'autotranslate:'
+WEBHOOK_NAME = 'Auto-Translate'
+
+
+class AutoTranslate(commands.Cog):
+    """A cog that mirrors every message in a channel into other languages.
+
+    Messages are buffered per channel for a short window. Each window is then
+    translated with one batched request per source and target language through
+    TranslationCog, and posted through a webhook under the original author's name.
+    """
+    def __init__(self, bot):
+        self.bot = bot
+        self.window = 3.0
+        self.max_buffered = 50
+        self.buffers = {}
+        self.flush_tasks = {}
+        self.webhooks = {}
+
+    @property
+    def translator(self):
+        return self.bot.get_cog('TranslationCog')
+
+    def cog_unload(self):
+        for task in self.flush_tasks.values():
+            task.cancel()
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.author.bot or message.webhook_id or message.guild is None or not message.content:
+            return
+        if not self.bot.channel_settings.keys_for(message.channel.id, SETTING_PREFIX):
+            return
+        prefix = await self.bot.get_prefix(message)
+        if message.content.startswith((prefix,) if isinstance(prefix, str) else tuple(prefix)):
+            return
+
+        buffer = self.buffers.setdefault(message.channel.id, [])
+        buffer.append(message)
+        if len(buffer) >= self.max_buffered:
+            task = self.flush_tasks.pop(message.channel.id, None)
+            if task is not None:
+                task.cancel()
+            await self.flush(message.channel.id)
+        elif message.channel.id not in self.flush_tasks:
+            self.flush_tasks[message.channel.id] = asyncio.create_task(self.flush_later(message.channel.id))
+
+    async def flush_later(self, channel_id):
+        await asyncio.sleep(self.window)
+        self.flush_tasks.pop(channel_id, None)
+        try:
+            await self.flush(channel_id)
+        except Exception:
+            logging.exception(f"Auto-translate failed in channel {channel_id}")
+
+    async def flush(self, channel_id):
+        """Translates and posts every message buffered for a channel."""
+        messages = self.buffers.pop(channel_id, [])
+        translator = self.translator
+        if not messages or translator is None:
+            return
+
+        targets = self.bot.channel_settings.keys_for(channel_id, SETTING_PREFIX)
+        guild_id = messages[0].guild.id
+        try:
+            async with self.bot.quotas.run('translate', guild_id, cost=len(messages) * len(targets)):
+                await self.translate_and_post(translator, messages, targets)
+        except QuotaExceeded:
+            logging.info(f"Auto-translate skipped in channel {channel_id}: guild {guild_id} is over its daily budget")
+
+    async def translate_and_post(self, translator, messages, targets):
+        """Translates messages into every target language, one batched request per source language."""
+        by_source = {}
+        for message in messages:
+            by_source.setdefault(translator.detect_source(message.content), []).append(message)
+
+        for key, target_channel_id in targets.items():
+            target_lang = key[len(SETTING_PREFIX):]
+            translated = {}
+            for src_lang, group in by_source.items():
+                # Messages already in the target language are not mirrored
+                if src_lang == translator.lang_code_map.get(target_lang.lower(), target_lang):
+                    continue
+                try:
+                    texts = await translator.translate_many([m.content for m in group], src_lang, target_lang)
+                except Exception as e:
+                    logging.error(f"Auto-translate to {target_lang} failed in channel {messages[0].channel.id}: {e}")
+                    continue
+                translated.update((message.id, text) for message, text in zip(group, texts))
+
+            ordered = [(m, translated[m.id]) for m in messages if m.id in translated]
+            if ordered:
+                target = self.bot.get_channel(int(target_channel_id)) or messages[0].channel
+                await self.post(target, ordered, target_lang)
+
+    async def get_webhook(self, channel):
+        webhook = self.webhooks.get(channel.id)
+        if webhook is None:
+            for existing in await channel.webhooks():
+                if existing.name == WEBHOOK_NAME and existing.user == self.bot.user:
+                    webhook = existing
+                    break
+            else:
+                webhook = await channel.create_webhook(name=WEBHOOK_NAME)
+            self.webhooks[channel.id] = webhook
+        return webhook
+
+    async def post(self, channel, translations, target_lang):
+        """Posts translations through a webhook, one message per run of messages by the same author."""
+        runs = []
+        for message, text in translations:
+            if runs and runs[-1][0].id == message.author.id:
+                runs[-1][1].append(text)
+            else:
+                runs.append((message.author, [text]))
+
+        webhook = None
+        if isinstance(channel, discord.TextChannel):
+            try:
+                webhook = await self.get_webhook(channel)
+            except discord.Forbidden:
+                logging.warning(f"Missing permission to manage webhooks in channel {channel.id}")
+
+        for author, texts in runs:
+            for chunk, _ in split_text("\n".join(texts), 2000 - len(target_lang) - 4):
+                content = f"`{target_lang}` {chunk}"
+                try:
+                    if webhook is not None:
+                        await webhook.send(
+                            content,
+                            username=author.display_name,
+                            avatar_url=author.display_avatar.url,
+                            allowed_mentions=discord.AllowedMentions.none()
+                        )
+                    else:
+                        await channel.send(f"**{author.display_name}**: {content}"[:2000],
+                                           allowed_mentions=discord.AllowedMentions.none())
+                except discord.NotFound:
+                    # The webhook was deleted, create a new one next time
+                    self.webhooks.pop(channel.id, None)
+                    logging.warning(f"Auto-translate webhook missing in channel {channel.id}")
+                    return
+
+    @commands.group(name='autotranslate', invoke_without_command=True)
+    @admin_only()
+    async def autotranslate(self, ctx):
+        """Mirror this channel's messages into other languages"""
+        await ctx.send("Usage: `!autotranslate add <lang> [#channel]`, `!autotranslate remove <lang>` or `!autotranslate list`")
+
+    @autotranslate.command(name='add')
+    @admin_only()
+    async def autotranslate_add(self, ctx, lang: str, target: discord.TextChannel = None):
+        """Start mirroring this channel into a language"""
+        translator = self.translator
+        lang = translator.lang_code_map.get(lang.lower(), lang.lower()) if translator else lang.lower()
+        if translator is None or lang not in translator.language_names:
+            await ctx.send("Invalid language code. Use `!languages` to see available options.")
+            return
+
+        target = target or ctx.channel
+        await self.bot.channel_settings.set(ctx.guild.id, ctx.channel.id, f"{SETTING_PREFIX}{lang}", str(target.id))
+        await ctx.send(f"Messages in this channel will be translated to `{lang}` in {target.mention}.")
+
+    @autotranslate.command(name='remove')
+    @admin_only()
+    async def autotranslate_remove(self, ctx, lang: str):
+        """Stop mirroring this channel into a language"""
+        translator = self.translator
+        lang = translator.lang_code_map.get(lang.lower(), lang.lower()) if translator else lang.lower()
+        await self.bot.channel_settings.delete(ctx.channel.id, f"{SETTING_PREFIX}{lang}")
+        await ctx.send(f"Stopped translating this channel to `{lang}`.")
+
+    @autotranslate.command(name='list')
+    async def autotranslate_list(self, ctx):
+        """Show the languages this channel is mirrored into"""
+        settings = self.bot.channel_settings.keys_for(ctx.channel.id, SETTING_PREFIX)
+        if not settings:
+            await ctx.send("Auto-translate is off for this channel.")
+            return
+        lines = [f"`{key[len(SETTING_PREFIX):]}` → <#{target}>" for key, target in settings.items()]
+        await ctx.send("Auto-translate targets:\n" + "\n".join(lines))
+
+async def setup(bot):
+    await bot.add_cog(AutoTranslate(bot))
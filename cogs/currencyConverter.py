@@ -1,9 +1,30 @@
+import asyncio
+import logging
 import re
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation
 
-import aiohttp
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+
+from utils.fx_history import FxHistory, sparkline
+from utils.cache import TTLCache
+from utils.fx_rates import AMOUNT_PATTERN, FxRates, find_currency_mentions, parse_amount
+from utils.helpers import admin_only, parse_time
+from utils.paginator import PaginatorView
+from utils.ratelimit import rate_limit
+
+CHART_RANGE_DAYS = {'d': 1, 'w': 7, 'm': 30, 'y': 365}
+DEFAULTS_KEY = 'fx_defaults'
+CURRENCY_CODE = re.compile(r'^[a-z]{3}$')
+
+# Channels with this setting get a reaction on messages that mention prices
+SCAN_SETTING = 'fx_scan'
+SCAN_EMOJI = '💱'
+
+# Table pages stay inside an embed description
+MATRIX_ROWS_PER_PAGE = 15
+MATRIX_COLUMNS_PER_PAGE = 4
 
 # For reference: ISO 4217 Currencies: https://en.wikipedia.org/wiki/ISO_4217
 
@@ -12,9 +33,19 @@ class CurrencyConverter(commands.Cog):
     
     This cog allows users to convert between different currencies using real-time exchange rates.
     It supports various international number formats and displays results in a grid.
+    Rates come from a daily table kept in memory and on disk, so conversions do not
+    wait on the network. Every daily table is also stored in the database for
+    historical conversions and charts.
     """
     def __init__(self, bot):
         self.bot = bot
+        self.rates = FxRates()
+        self.history = FxHistory(bot, self.rates)
+        self.history_days = 30
+        self.history_task = None
+        self.guild_defaults = {}
+        # Message ID to the mentions found in it, until someone asks for the conversion
+        self.scan_offers = TTLCache(maxsize=10_000, ttl=6 * 3600, wheel=bot.timer_wheel)
         self.default_currencies = [
             'cad', 'hkd', 'inr',
             'idr', 'myr', 'sgd',
@@ -41,111 +72,81 @@ class CurrencyConverter(commands.Cog):
             'usd': 'US Dollar',
         }
 
-    def format_currency_field(self, currency: str, amount: Decimal) -> str:
-        """Format currency value in a box-like format"""
-        return f"```\n{amount:,.2f} {currency.upper()}```"
+    async def cog_load(self):
+        self.rates.load()
+        await self.load_guild_defaults()
+        self.history_task = asyncio.create_task(self.sync_history())
+        self.refresh_rates.start()
 
-    def get_flag(self, currency: str) -> str:
-        """Get flag emoji for currency, with fallback to 💱"""
-        return self.currency_flags.get(currency.lower(), '💱')
+    async def cog_unload(self):
+        self.refresh_rates.cancel()
+        if self.history_task is not None:
+            self.history_task.cancel()
+        await self.rates.close()
+
+    async def load_guild_defaults(self):
+        async def fetch_defaults(conn):
+            return await conn.fetch("SELECT guild_id, value FROM bot_settings WHERE key = $1", DEFAULTS_KEY)
 
-    @commands.command(name="fx")
-    async def convert_command(self, ctx, *, args: str):
-        """Convert currency"""
-        match = re.match(
-            r'^(\d+(?:[.,]\d{3})*(?:[.,]\d+)?)\s+([A-Za-z]{3})(?:\s+to\s+([A-Za-z]{3}))?$',
-            args.strip(),
-            re.IGNORECASE
-        )
-        if not match:
-            await ctx.send("**Invalid format!** Use `!fx <amount> <source_currency> [to <target_currency>]`")
-            return
-
-        amount_str, source_currency, target_currency = match.groups()
-        
-        # Normalize the amount string for Decimal parsing
-        # First, determine if it's using comma or period as decimal separator
-        if ',' in amount_str and '.' in amount_str:
-            # If both separators are present, the last one is the decimal separator
-            if amount_str.rindex(',') > amount_str.rindex('.'):
-                # European format (1.000,00)
-                amount_str = amount_str.replace('.', '').replace(',', '.')
-            else:
-                # US/UK format (1,000.00)
-                amount_str = amount_str.replace(',', '')
-        elif ',' in amount_str:
-            # If only comma is present, check if it's used as decimal or thousands separator
-            if amount_str.count(',') == 1 and len(amount_str.split(',')[1]) <= 2:
-                # Likely a decimal separator (e.g., 1000,50)
-                amount_str = amount_str.replace(',', '.')
-            else:
-                # Likely thousands separators (e.g., 1,000,000)
-                amount_str = amount_str.replace(',', '')
-        # If only period is present, no changes needed
-        
-        # Convert to Decimal for better precision
         try:
-            amount = Decimal(amount_str)
-        except InvalidOperation:
-            await ctx.send("**Invalid number format!** Please use a valid number.")
+            rows = await self.bot.execute_db_operation(fetch_defaults)
+        except Exception as e:
+            logging.error(f"Failed to load FX defaults: {e}")
             return
-            
-        source_currency = source_currency.lower()
-        target_currency = target_currency.lower() if target_currency else None
+        self.guild_defaults = {row['guild_id']: row['value'].split(',') for row in rows if row['value']}
+
+    def defaults_for(self, guild):
+        """Returns the guild's default target currencies, or the bot's."""
+        if guild is None:
+            return self.default_currencies
+        return self.guild_defaults.get(guild.id, self.default_currencies)
 
-        # Fetch exchange rates from the API
+    async def sync_history(self):
+        """Fills any gaps in the last history_days of stored rates."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/{source_currency}.json"
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        # Fallback to the secondary API
-                        url = f"https://latest.currency-api.pages.dev/v1/currencies/{source_currency}.json"
-                        async with session.get(url) as fallback_response:
-                            if fallback_response.status != 200:
-                                await ctx.send("**Error fetching rates.** Check the currency code and try again.")
-                                return
-                            data = await fallback_response.json()
-                    else:
-                        data = await response.json()
+            await self.history.load()
+            today = datetime.now(timezone.utc).date()
+            await self.history.backfill(today - timedelta(days=self.history_days), today - timedelta(days=1))
+            table = await self.rates.get_table()
+            if table is not None:
+                await self.history.ingest(table)
         except Exception as e:
-            await ctx.send(f"**API Error:** {str(e)}")
-            return
+            logging.error(f"Failed to sync FX history: {e}")
 
-        if source_currency not in data:
-            await ctx.send(f"**Currency not found:** {source_currency.upper()}")
-            return
+    @tasks.loop(hours=1)
+    async def refresh_rates(self):
+        if await self.rates.refresh():
+            try:
+                await self.history.ingest(self.rates.table)
+            except Exception as e:
+                logging.error(f"Failed to store FX snapshot: {e}")
 
-        rates = data[source_currency]
-        date = data.get('date', 'Unknown date')
+    def format_currency_field(self, currency: str, amount: Decimal) -> str:
+        """Format currency value in a box-like format"""
+        return f"```\n{amount:,.2f} {currency.upper()}```"
 
+    def get_flag(self, currency: str) -> str:
+        """Get flag emoji for currency, with fallback to 💱"""
+        return self.currency_flags.get(currency.lower(), '💱')
+
+    def build_conversion_embed(self, table, amount, source, targets):
+        """Builds the grid of conversions of amount into every target the table knows."""
         # Build the embed with a modern design
         embed = discord.Embed(
-            title=f"{self.get_flag(source_currency)} {amount:,.2f} {source_currency.upper()} Conversion",
+            title=f"{self.get_flag(source)} {amount:,.2f} {source.upper()} Conversion",
             color=discord.Color.green()
         )
-        embed.set_footer(text=f"Exchange rates as of {date}")
+        embed.set_footer(text=f"Exchange rates as of {table.date}")
 
         # Prepare conversion results
         conversion_results = []
-        
-        # Process default currencies first (for grid layout)
-        for curr in self.default_currencies:
-            if curr in rates:
-                rate = Decimal(str(rates[curr]))
-                converted = amount * rate
+        for curr in targets:
+            if curr in table:
+                converted = table.convert(amount, source, curr)
                 flag = self.get_flag(curr)
                 name = self.currency_names.get(curr, curr.upper())
                 conversion_results.append((curr, converted, flag, name))
 
-        # If there's a specific target currency not in defaults, add it to the end
-        if target_currency and target_currency not in self.default_currencies and target_currency in rates:
-            rate = Decimal(str(rates[target_currency]))
-            converted = amount * rate
-            flag = self.get_flag(target_currency)
-            name = self.currency_names.get(target_currency, target_currency.upper())
-            conversion_results.append((target_currency, converted, flag, name))
-
         # Add fields in a grid layout (3x3)
         for i in range(0, len(conversion_results), 3):
             row = conversion_results[i:i+3]
@@ -160,12 +161,276 @@ class CurrencyConverter(commands.Cog):
             remaining = 3 - len(row)
             for _ in range(remaining):
                 embed.add_field(name="\u200b", value="\u200b", inline=True)
+        return embed
+
+    @commands.group(name="fx", invoke_without_command=True)
+    async def convert_command(self, ctx, *, args: str):
+        """Convert currency"""
+        match = re.match(
+            rf'^({AMOUNT_PATTERN})\s+([A-Za-z]{{3}})(?:\s+to\s+([A-Za-z]{{3}}))?(?:\s+on\s+(.+))?$',
+            args.strip(),
+            re.IGNORECASE
+        )
+        if not match:
+            await ctx.send("**Invalid format!** Use `!fx <amount> <source_currency> [to <target_currency>] [on <date>]`")
+            return
+
+        amount_str, source_currency, target_currency, date_str = match.groups()
+
+        # Convert to Decimal for better precision
+        try:
+            amount = parse_amount(amount_str)
+        except InvalidOperation:
+            await ctx.send("**Invalid number format!** Please use a valid number.")
+            return
+            
+        source_currency = source_currency.lower()
+        target_currency = target_currency.lower() if target_currency else None
 
+        if date_str:
+            try:
+                day = parse_time(date_str).date()
+            except (ValueError, OverflowError):
+                await ctx.send("**Invalid date!** Use a date such as `2024-03-15`.")
+                return
+            table = await self.history.table_on(day)
+            if table is None:
+                await ctx.send(f"**No rates stored for {day}.**")
+                return
+        else:
+            table = await self.rates.get_table()
+            if table is None:
+                await ctx.send("**Error fetching rates.** Please try again later.")
+                return
+
+        if source_currency not in table:
+            await ctx.send(f"**Currency not found:** {source_currency.upper()}")
+            return
+
+        targets = list(self.defaults_for(ctx.guild))
+        # A specific target currency not in the defaults goes at the end
+        if target_currency and target_currency not in targets:
+            targets.append(target_currency)
+
+        embed = self.build_conversion_embed(table, amount, source_currency, targets)
         if not embed.fields:
             await ctx.send("No valid target currencies found.")
             return
 
         await ctx.send(embed=embed)
 
+    def build_matrix_pages(self, table, amounts, source, targets):
+        """Renders the conversion matrix as monospace table pages, split by rows and columns."""
+        matrix = table.matrix(amounts, source, targets)
+        amount_labels = [f"{amount:,.2f}" for amount in amounts]
+        cells = [[f"{value:,.2f}" for value in row] for row in matrix]
+
+        pages = []
+        column_chunks = range(0, len(targets), MATRIX_COLUMNS_PER_PAGE)
+        row_chunks = range(0, len(amounts), MATRIX_ROWS_PER_PAGE)
+        for c in column_chunks:
+            columns = range(c, min(c + MATRIX_COLUMNS_PER_PAGE, len(targets)))
+            first_width = max(len(source), *(len(label) for label in amount_labels))
+            widths = [max(len(targets[j]), *(len(row[j]) for row in cells)) for j in columns]
+            header = " | ".join([source.upper().rjust(first_width)] + [targets[j].upper().rjust(w) for j, w in zip(columns, widths)])
+            rule = "-+-".join("-" * w for w in [first_width] + widths)
+            for r in row_chunks:
+                lines = [header, rule]
+                for i in range(r, min(r + MATRIX_ROWS_PER_PAGE, len(amounts))):
+                    lines.append(" | ".join([amount_labels[i].rjust(first_width)] + [cells[i][j].rjust(w) for j, w in zip(columns, widths)]))
+                embed = discord.Embed(
+                    title=f"{self.get_flag(source)} {source.upper()} Conversion Table",
+                    description="```\n" + "\n".join(lines) + "\n```",
+                    color=discord.Color.green()
+                )
+                pages.append(embed)
+
+        for i, embed in enumerate(pages):
+            embed.set_footer(text=f"Page {i + 1}/{len(pages)} • Exchange rates as of {table.date}")
+        return pages
+
+    @convert_command.command(name="batch")
+    async def batch_command(self, ctx, *, args: str):
+        """Convert several amounts at once, e.g. `!fx batch 10 25 99.90 usd to eur gbp jpy`"""
+        match = re.match(r'^(.+?)\s+([A-Za-z]{3})(?:\s+to\s+(.+))?$', args.strip(), re.IGNORECASE)
+        if not match:
+            await ctx.send("**Invalid format!** Use `!fx batch <amount> [amount ...] <source_currency> [to <currency> ...]`")
+            return
+
+        amounts_str, source_currency, targets_str = match.groups()
+        try:
+            amounts = [parse_amount(amount) for amount in amounts_str.split()]
+        except InvalidOperation:
+            await ctx.send("**Invalid number format!** Separate amounts with spaces.")
+            return
+        if len(amounts) > 100:
+            await ctx.send("**Too many amounts!** Use at most 100.")
+            return
+
+        source_currency = source_currency.lower()
+        targets = re.split(r'[\s,]+', targets_str.lower().strip()) if targets_str else self.defaults_for(ctx.guild)
+        targets = list(dict.fromkeys(t for t in targets if t and t != source_currency))
+
+        table = await self.rates.get_table()
+        if table is None:
+            await ctx.send("**Error fetching rates.** Please try again later.")
+            return
+        if source_currency not in table:
+            await ctx.send(f"**Currency not found:** {source_currency.upper()}")
+            return
+        unknown = [t for t in targets if t not in table]
+        targets = [t for t in targets if t in table]
+        if not targets:
+            await ctx.send("No valid target currencies found.")
+            return
+
+        pages = self.build_matrix_pages(table, amounts, source_currency, targets)
+        if unknown:
+            pages[0].add_field(name="Unknown currencies", value=", ".join(t.upper() for t in unknown), inline=False)
+        if len(pages) == 1:
+            await ctx.send(embed=pages[0])
+        else:
+            await PaginatorView(pages, author=ctx.author).send(ctx)
+
+    @convert_command.command(name="defaults")
+    @admin_only()
+    async def defaults_command(self, ctx, *currencies: str):
+        """Set this server's default currencies, or `reset` to restore the bot's"""
+        if not currencies:
+            current = self.defaults_for(ctx.guild)
+            await ctx.send(f"Default currencies: {', '.join(c.upper() for c in current)}")
+            return
+
+        if len(currencies) == 1 and currencies[0].lower() == 'reset':
+            value = None
+        else:
+            codes = list(dict.fromkeys(c.lower().strip(',') for c in currencies))
+            table = await self.rates.get_table()
+            invalid = [c for c in codes if not CURRENCY_CODE.match(c) or (table is not None and c not in table)]
+            if invalid or len(codes) > 25:
+                await ctx.send(f"**Invalid currencies:** {', '.join(invalid) or 'at most 25 are allowed'}")
+                return
+            value = ",".join(codes)
+
+        async def store_defaults(conn):
+            if value is None:
+                await conn.execute("DELETE FROM bot_settings WHERE key = $1 AND guild_id = $2", DEFAULTS_KEY, ctx.guild.id)
+            else:
+                await conn.execute(
+                    "INSERT INTO bot_settings (key, value, guild_id) VALUES ($1, $2, $3) "
+                    "ON CONFLICT (key, guild_id) DO UPDATE SET value = $2, updated_at = CURRENT_TIMESTAMP",
+                    DEFAULTS_KEY, value, ctx.guild.id
+                )
+
+        await self.bot.execute_db_operation(store_defaults)
+        if value is None:
+            self.guild_defaults.pop(ctx.guild.id, None)
+        else:
+            self.guild_defaults[ctx.guild.id] = value.split(',')
+        await ctx.send(f"Default currencies: {', '.join(c.upper() for c in self.defaults_for(ctx.guild))}")
+
+    @convert_command.command(name="chart")
+    async def chart_command(self, ctx, pair: str, period: str = "30d"):
+        """Chart an exchange rate, e.g. `!fx chart usd/sgd 3m`"""
+        pair_match = re.match(r'^([a-z]{3})[/\-]?([a-z]{3})$', pair.lower())
+        period_match = re.match(r'^(\d+)\s*([dwmy])$', period.lower())
+        if not pair_match or not period_match:
+            await ctx.send("**Invalid format!** Use `!fx chart <source>/<target> <range>`, e.g. `!fx chart usd/sgd 3m`")
+            return
+
+        source_currency, target_currency = pair_match.groups()
+        days = min(int(period_match.group(1)) * CHART_RANGE_DAYS[period_match.group(2)], 3650)
+        end = datetime.now(timezone.utc).date()
+        try:
+            series = await self.history.series(source_currency, target_currency, end - timedelta(days=days), end)
+        except KeyError:
+            await ctx.send(f"**No history for {source_currency.upper()}/{target_currency.upper()}.**")
+            return
+        if len(series) < 2:
+            await ctx.send("**Not enough history stored for that range yet.**")
+            return
+
+        values = [rate for _, rate in series]
+        change = (values[-1] - values[0]) / values[0] * 100
+        embed = discord.Embed(
+            title=f"{self.get_flag(source_currency)} {source_currency.upper()}/{target_currency.upper()} • {period}",
+            description=f"```\n{sparkline(values)}\n```",
+            color=discord.Color.green() if change >= 0 else discord.Color.red()
+        )
+        embed.add_field(name=f"Start ({series[0][0]})", value=f"{values[0]:,.4f}", inline=True)
+        embed.add_field(name=f"End ({series[-1][0]})", value=f"{values[-1]:,.4f}", inline=True)
+        embed.add_field(name="Change", value=f"{change:+.2f}%", inline=True)
+        embed.add_field(name="Low", value=f"{min(values):,.4f}", inline=True)
+        embed.add_field(name="High", value=f"{max(values):,.4f}", inline=True)
+        embed.add_field(name="Days", value=str(len(series)), inline=True)
+        await ctx.send(embed=embed)
+
+    @convert_command.command(name="backfill")
+    @commands.is_owner()
+    async def backfill_command(self, ctx, days: int):
+        """Fetch and store up to a year of missing daily rates"""
+        days = max(1, min(days, 365))
+        end = datetime.now(timezone.utc).date() - timedelta(days=1)
+        async with ctx.typing():
+            stored = await self.history.backfill(end - timedelta(days=days - 1), end)
+        await ctx.send(f"Stored {stored} day(s) of exchange rates.")
+
+    @convert_command.command(name="scan")
+    @admin_only()
+    async def scan_command(self, ctx, mode: str):
+        """Turn price detection on or off for this channel"""
+        mode = mode.lower()
+        if mode == 'on':
+            await self.bot.channel_settings.set(ctx.guild.id, ctx.channel.id, SCAN_SETTING, 'on')
+            await ctx.send(f"Messages mentioning prices in this channel will get a {SCAN_EMOJI} reaction to convert them.")
+        elif mode == 'off':
+            await self.bot.channel_settings.delete(ctx.channel.id, SCAN_SETTING)
+            await ctx.send("Price detection is now off for this channel.")
+        else:
+            await ctx.send("Usage: `!fx scan on` or `!fx scan off`")
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.author.bot or message.guild is None:
+            return
+        if not self.bot.channel_settings.is_enabled(message.channel.id, SCAN_SETTING):
+            return
+        table = self.rates.table
+        if table is None:
+            return
+        mentions = find_currency_mentions(message.content, table)
+        if not mentions:
+            return
+        self.scan_offers.set(message.id, mentions)
+        try:
+            await message.add_reaction(SCAN_EMOJI)
+        except discord.HTTPException as e:
+            logging.warning(f"Failed to offer currency conversion: {e}")
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        if str(payload.emoji) != SCAN_EMOJI or payload.user_id == self.bot.user.id:
+            return
+        if payload.message_id in self.scan_offers:
+            await self.post_scan_conversions(payload)
+
+    @rate_limit('fx_scan', 5, 60.0)
+    async def post_scan_conversions(self, payload):
+        # Each message is converted once, for whoever asks first
+        mentions = self.scan_offers.pop(payload.message_id)
+        channel = self.bot.get_channel(payload.channel_id)
+        table = self.rates.table
+        if mentions is None or channel is None or table is None:
+            return
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        embeds = [
+            self.build_conversion_embed(table, amount, source, [c for c in self.defaults_for(guild) if c != source])
+            for amount, source in mentions
+        ]
+        try:
+            await channel.get_partial_message(payload.message_id).reply(embeds=embeds, mention_author=False)
+        except discord.HTTPException as e:
+            logging.warning(f"Failed to post currency conversion: {e}")
+
 async def setup(bot):
     await bot.add_cog(CurrencyConverter(bot))
@@ -1,48 +1,103 @@
+import asyncio
+import logging
+
 import aiohttp
 import discord
 from discord.ext import commands
-from PyMultiDictionary import DICT_MW, MultiDictionary
 
-from utils.paginator import PaginatorView
+from utils.mw_dictionary import MerriamWebster
+from utils.offline_dictionary import OfflineDictionary
+from utils.paginator import PageSource, register_page_source, send_persistent_paginator
+from utils.quotas import QuotaExceeded
 
 class Define(commands.Cog):
     """A cog that provides word definition functionality.
     
     This cog allows users to look up definitions of words from multiple sources,
     including Dictionary API, Merriam-Webster, and Urban Dictionary.
+    When an offline dictionary has been built, words in it are answered locally
+    and misspellings get suggestions without any remote lookup.
     """
     def __init__(self, bot):
         self.bot = bot
-
-    def get_mw_fallback_embed(self, word: str) -> discord.Embed | None:
+        self.mw = MerriamWebster()
+        self.offline = OfflineDictionary.open()
+        register_page_source('urban', self.urban_source)
+
+    async def cog_unload(self):
+        await self.mw.close()
+        if self.offline is not None:
+            self.offline.close()
+
+    def build_definitions_embed(self, word: str, results: dict, source: str) -> discord.Embed:
+        """Build an embed listing definitions grouped by part of speech"""
+        embed = discord.Embed(
+            title=f"Definition of {word}", color=discord.Color.green()
+        )
+        for part_of_speech, definitions in list(results.items())[:25]:
+            lines = []
+            for i, d in enumerate(definitions):
+                line = f"{i + 1}. {d}"
+                # Embed field values are limited to 1024 characters
+                if sum(len(l) + 1 for l in lines) + len(line) > 1024:
+                    break
+                lines.append(line)
+            embed.add_field(name=part_of_speech, value="\n".join(lines) or "\u200b", inline=False)
+
+        embed.set_footer(text=f"Source: {source}")
+        return embed
+
+    async def get_mw_fallback_embed(self, word: str) -> discord.Embed | None:
         """Get the definition of a word from Merriam-Webster"""
-        md = MultiDictionary()
         try:
-            results = md.meaning("en", word, dictionary=DICT_MW)
-            if not results:
-                return None
+            results = await self.mw.lookup(word)
+        except Exception as e:
+            logging.warning(f"Merriam-Webster lookup for {word!r} failed: {e}")
+            return None
+        if not results:
+            return None
+        return self.build_definitions_embed(word, results, "Merriam-Webster")
 
-            embed = discord.Embed(
-                title=f"Definition of {word}", color=discord.Color.green()
-            )
+    async def get_dictionary_api_embed(self, word: str) -> discord.Embed | None:
+        """Get the definition of a word from Dictionary API"""
+        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return None
+                data = await response.json()
 
-            if isinstance(results, tuple) and len(results) > 0:
-                definitions = results[0]
-                if definitions:
-                    embed.add_field(
-                        name="Definition",
-                        value="\n".join(
-                            [f"{i + 1}. {d}" for i, d in enumerate(definitions)]
-                        ),
-                        inline=False,
-                    )
+        if not isinstance(data, list) or len(data) == 0:
+            return None
 
-            embed.set_footer(text="Source: Merriam-Webster (PyMultiDictionary)")
-            return embed
+        embed = discord.Embed(
+            title=f"Definition of {word}", color=discord.Color.green()
+        )
+
+        for meaning in data[0]["meanings"]:
+            part_of_speech = meaning["partOfSpeech"]
+            definitions = meaning["definitions"]
+
+            embed.add_field(
+                name=part_of_speech,
+                value="\n".join(
+                    [
+                        f"{i + 1}. {d['definition']}"
+                        for i, d in enumerate(definitions)
+                    ]
+                ),
+                inline=False,
+            )
 
-        except Exception as e:
-            print(f"**MW Error:** {e}")
-            return None
+        embed.set_footer(text="Source: Dictionary API")
+        return embed
+
+    async def lookup_remote(self, word: str) -> tuple[discord.Embed | None, list | None]:
+        """Look a word up remotely, falling back from Dictionary API to Merriam-Webster and then Urban Dictionary"""
+        embed = await self.get_dictionary_api_embed(word) or await self.get_mw_fallback_embed(word)
+        if embed:
+            return embed, None
+        return None, await self.get_urban_definitions(word)
 
     async def get_urban_definitions(self, word):
         """Get the definitions from Urban Dictionary"""
@@ -55,108 +110,83 @@ class Define(commands.Cog):
                 else:
                     return None
 
-    def build_urban_embeds(self, results: list, word: str) -> list[discord.Embed]:
-        """Build Urban Dictionary embeds"""
-        pages = []
-        for i, entry in enumerate(results):
-            embed = discord.Embed(
-                title=entry["word"],
-                description=entry["definition"].replace("[", "").replace("]", ""),
-                color=discord.Color.green(),
-            )
-            embed.set_footer(
-                text=f"Definition {i + 1}/{len(results)} • Source: Urban Dictionary"
-            )
-            pages.append(embed)
-        return pages
+    def build_urban_embed(self, results: list, index: int) -> discord.Embed:
+        """Build the Urban Dictionary embed for one result"""
+        entry = results[index]
+        embed = discord.Embed(
+            title=entry["word"],
+            description=entry["definition"].replace("[", "").replace("]", ""),
+            color=discord.Color.green(),
+        )
+        embed.set_footer(
+            text=f"Definition {index + 1}/{len(results)} • Source: Urban Dictionary"
+        )
+        return embed
+
+    def urban_pages(self, results: list) -> PageSource:
+        """Page through Urban Dictionary results, building each embed when it is first shown"""
+        return PageSource(lambda index: self.build_urban_embed(results, index), total=len(results))
+
+    async def urban_source(self, word: str, interaction: discord.Interaction = None) -> PageSource | None:
+        """Rebuild the pages of an Urban Dictionary paginator sent before a restart"""
+        try:
+            async with self.bot.quotas.run('define', interaction and interaction.guild_id):
+                results = await self.get_urban_definitions(word)
+        except QuotaExceeded as e:
+            if interaction is not None:
+                await interaction.response.send_message(str(e), ephemeral=True)
+            return None
+        return self.urban_pages(results) if results else None
+
+    async def send_urban(self, ctx, word: str, results: list):
+        await send_persistent_paginator(ctx, 'urban', word, source=self.urban_pages(results), owner=ctx.author, loop=True)
 
     @commands.command()
     async def ud(self, ctx, *, word: str):
         """Get the definition of a word from Urban Dictionary"""
-        results = await self.get_urban_definitions(word)
+        try:
+            async with self.bot.quotas.run('define', ctx.guild and ctx.guild.id):
+                results = await self.get_urban_definitions(word)
+        except QuotaExceeded as e:
+            return await ctx.send(str(e))
 
         if not results or len(results) == 0:
             return await ctx.send(f"Could not find the definition for **{word}**.")
 
-        pages = self.build_urban_embeds(results, word)
-        paginator = PaginatorView(pages, author=ctx.author, loop=True)
-        await paginator.send(ctx)
+        await self.send_urban(ctx, word, results)
 
     @commands.command()
     async def define(self, ctx, *, word: str):
         """Get the definition of a word"""
 
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        fallback_embed = self.get_mw_fallback_embed(word)
-                        if fallback_embed:
-                            await ctx.send(embed=fallback_embed)
-                            return
-
-                        results = await self.get_urban_definitions(word)
-                        if results:
-                            embeds = self.build_urban_embeds(results, word)
-                            paginator = PaginatorView(embeds, author=ctx.author, loop=True)
-                            await paginator.send(ctx)
-                            return
-
-                        else:
-                            await ctx.send(
-                                f"Could not find the definition for **{word}**."
-                            )
-                            return
+        if self.offline is not None:
+            found = self.offline.lookup(word)
+            if found:
+                lemma, definitions = found
+                return await ctx.send(embed=self.build_definitions_embed(lemma, definitions, f"{self.offline.source} (offline)"))
 
-                    data = await response.json()
-
-                    if isinstance(data, list) and len(data) > 0:
-                        embed = discord.Embed(
-                            title=f"Definition of {word}", color=discord.Color.green()
-                        )
-
-                        for meaning in data[0]["meanings"]:
-                            part_of_speech = meaning["partOfSpeech"]
-                            definitions = meaning["definitions"]
-
-                            embed.add_field(
-                                name=part_of_speech,
-                                value="\n".join(
-                                    [
-                                        f"{i + 1}. {d['definition']}"
-                                        for i, d in enumerate(definitions)
-                                    ]
-                                ),
-                                inline=False,
-                            )
-
-                        embed.set_footer(text="Source: Dictionary API")
-
-                        await ctx.send(embed=embed)
-                    else:
-                        fallback_embed = self.get_mw_fallback_embed(word)
-                        if fallback_embed:
-                            await ctx.send(embed=fallback_embed)
-                            return
-
-                        results = await self.get_urban_definitions(word)
-                        if results:
-                            embeds = self.build_urban_embeds(results, word)
-                            paginator = PaginatorView(embeds, author=ctx.author, loop=True)
-                            await paginator.send(ctx)
-                            return
-
-                        else:
-                            await ctx.send(
-                                f"Could not find the definition for **{word}**."
-                            )
-                            return
+            # A single word missing from the dictionary is most likely misspelled
+            suggestions = await asyncio.to_thread(self.offline.suggest, word) if ' ' not in word.strip() else []
+            if suggestions:
+                return await ctx.send(
+                    f"Could not find **{word}**. Did you mean {', '.join(f'**{s}**' for s in suggestions)}?\n"
+                    f"For slang, try `!ud {word}`."
+                )
 
+        try:
+            async with self.bot.quotas.run('define', ctx.guild and ctx.guild.id):
+                embed, results = await self.lookup_remote(word)
+        except QuotaExceeded as e:
+            return await ctx.send(str(e))
         except Exception as e:
-            await ctx.send(f"**API Error:** {str(e)}")
-            return
+            return await ctx.send(f"**API Error:** {str(e)}")
+
+        if embed:
+            await ctx.send(embed=embed)
+        elif results:
+            await self.send_urban(ctx, word, results)
+        else:
+            await ctx.send(f"Could not find the definition for **{word}**.")
 
 
 async def setup(bot):
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -8,6 +9,10 @@ import instaloader
 from discord import app_commands
 from discord.ext import commands
 from utils.helpers import get_random_user_agent, do_sleep
+from utils.media_prefetch import metadata_cache
+from utils.quotas import QuotaExceeded
+from utils.timer_wheel import WheelView
+from utils.upload_planner import send_files_in_batches
 
 
 def unique_filename(directory, base_name, index):
@@ -18,7 +23,7 @@ def load_config():
     with open('/app/config/config.json', 'r') as config_file:
         return json.load(config_file)
 
-def download_instagram_photos(post_url, download_dir):
+def download_instagram_photos(post_url, download_dir, post=None):
     L = instaloader.Instaloader(
         dirname_pattern=download_dir, 
         filename_pattern="{shortcode}", 
@@ -26,10 +31,11 @@ def download_instagram_photos(post_url, download_dir):
         user_agent=get_random_user_agent()
         )
     L.download_comments = False
-    shortcode = post_url.split('/')[-2]
 
-    do_sleep()
-    post = instaloader.Post.from_shortcode(L.context, shortcode)
+    if post is None:
+        do_sleep()
+        post = instaloader.Post.from_shortcode(L.context, post_url.split('/')[-2])
+    shortcode = post.shortcode
 
     do_sleep()
     L.download_post(post, target=download_dir)
@@ -73,7 +79,11 @@ class PhotoDownload(commands.Cog):
         logging.info(f"{interaction.user} requested to download a photo from Instagram with URL: {url}")
         
         try:
-            photo_paths = download_instagram_photos(url, self.download_dir)
+            post = await metadata_cache.get(url)
+            if not isinstance(post, instaloader.Post):
+                post = None
+            async with self.bot.quotas.run('ig_photo', interaction.guild_id):
+                photo_paths = await asyncio.to_thread(download_instagram_photos, url, self.download_dir, post)
             
             if len(photo_paths) == 1:
                 selected_photos = [photo_paths[0]]
@@ -89,17 +99,22 @@ class PhotoDownload(commands.Cog):
                         super().__init__(placeholder="Choose images to download", min_values=1, max_values=len(options), options=options)
 
                     async def callback(self, select_interaction: discord.Interaction):
+                        self.view.stop()
+                        # Acknowledge now, uploading and recompressing can outlast the 3 second window
+                        await select_interaction.response.defer()
+
                         selected_indexes = [int(i) for i in self.values]
                         selected_photos = [photo_paths[i] for i in selected_indexes]
 
-                        files = []
-                        for photo in selected_photos:
-                            files.append(discord.File(photo, filename=os.path.basename(photo)))
-
-                        await select_interaction.channel.send(f"{interaction.user.mention} Here are your selected photos:", files=files)
-
-                        # Dismiss the interaction
-                        await select_interaction.response.defer()
+                        skipped = await send_files_in_batches(
+                            select_interaction.channel,
+                            f"{interaction.user.mention} Here are your selected photos:",
+                            selected_photos
+                        )
+                        if skipped:
+                            await select_interaction.channel.send(
+                                f"{interaction.user.mention} {len(skipped)} photo(s) exceeded the upload size limit and were not sent."
+                            )
 
                         # Delete the original message with the dropdown
                         await interaction.delete_original_response()
@@ -110,13 +125,20 @@ class PhotoDownload(commands.Cog):
                             if os.path.isfile(file_path):
                                 os.remove(file_path)
 
-                view = discord.ui.View(timeout=30)  # Set the timeout to 30 seconds
+                view = WheelView(timeout=30)  # Set the timeout to 30 seconds
                 view.add_item(MultiPhotoSelect(self.download_dir))
 
                 async def on_timeout():
                     # If timeout occurs, send all photos
-                    files = [discord.File(photo, filename=os.path.basename(photo)) for photo in photo_paths]
-                    await interaction.channel.send(f"{interaction.user.mention} You did not respond in time, so here are all the photos:", files=files)
+                    skipped = await send_files_in_batches(
+                        interaction.channel,
+                        f"{interaction.user.mention} You did not respond in time, so here are all the photos:",
+                        photo_paths
+                    )
+                    if skipped:
+                        await interaction.channel.send(
+                            f"{interaction.user.mention} {len(skipped)} photo(s) exceeded the upload size limit and were not sent."
+                        )
 
                     # Clean up after sending
                     for f in os.listdir(self.download_dir):
@@ -132,9 +154,13 @@ class PhotoDownload(commands.Cog):
                 return
 
             # If there's only one image, send it directly
-            for selected_photo in selected_photos:
-                file = discord.File(selected_photo, filename=os.path.basename(selected_photo))
-                await interaction.channel.send(f"{interaction.user.mention} Here is your downloaded photo:", file=file)
+            skipped = await send_files_in_batches(
+                interaction.channel,
+                f"{interaction.user.mention} Here is your downloaded photo:",
+                selected_photos
+            )
+            if skipped:
+                await interaction.followup.send("The downloaded photo exceeds the upload size limit.", ephemeral=True)
 
             # Clean up download directory
             for f in os.listdir(self.download_dir):
@@ -142,6 +168,8 @@ class PhotoDownload(commands.Cog):
                 if os.path.isfile(file_path):
                     os.remove(file_path)
 
+        except QuotaExceeded as e:
+            await interaction.followup.send(str(e), ephemeral=True)
         except Exception as e:
             logging.exception("Failed to download or send the photo")
             await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
@@ -1,47 +1,73 @@
 import asyncio
+import functools
 import logging
 import re
-from datetime import datetime, timedelta
 
 import discord
-from deep_translator import GoogleTranslator
+from discord import app_commands
 from discord.ext import commands, tasks
-from discord.ui import Button, Select, View
-from langdetect import detect
-
-from utils.__language_data import (ADDITIONAL_LANGUAGE_NAMES, EMOJI_TO_LANG,
-                                 LANG_CODE_MAP, LANGUAGE_EMOJI_MAP,
-                                 MULTI_LANG_COUNTRIES)
-
-
-class LanguagePaginator(View):
-    def __init__(self, pages):
-        super().__init__(timeout=60)
-        self.pages = pages
-        self.current_page = 0
-        self.update_buttons()
-
-    @discord.ui.button(label="Previous", style=discord.ButtonStyle.grey)
-    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.update_buttons()
-            await interaction.response.edit_message(embed=self.pages[self.current_page], view=self)
-
-    @discord.ui.button(label="Next", style=discord.ButtonStyle.grey)
-    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page < len(self.pages) - 1:
-            self.current_page += 1
-            self.update_buttons()
-            await interaction.response.edit_message(embed=self.pages[self.current_page], view=self)
-
-    def update_buttons(self):
-        self.previous_button.disabled = (self.current_page == 0)
-        self.next_button.disabled = (self.current_page == len(self.pages) - 1)
 
-    async def on_timeout(self):
-        message = await self.message.fetch()
-        await message.delete()
+from utils import language_catalog
+from utils.cache import TTLCache
+from utils.__language_data import (EMOJI_TO_LANG, LANG_CODE_MAP,
+                                 LANGUAGE_EMOJI_MAP, MULTI_LANG_COUNTRIES)
+from utils.language_detection import detect_language, warm_up_in_background
+from utils.language_index import language_index
+from utils.paginator import PageSource, PaginatorView, register_page_source, send_persistent_paginator
+from utils.quotas import QuotaExceeded
+from utils.ratelimit import rate_limit
+from utils.text_chunker import encoded_length, split_text, translate_in_chunks
+from utils.timer_wheel import WheelView
+from utils.translation_cache import TranslationCache
+from utils.translation_providers import build_router_from_env
+from utils.translation_tracker import TranslationTracker
+
+FIELD_LIMIT = 1024
+BATCH_SEPARATOR = "\n§\n"
+BATCH_SPLIT = re.compile(r'\s*§\s*')
+DESCRIPTION_LIMIT = 4000
+EMBED_TOTAL_LIMIT = 6000
+EMBED_FIELD_COUNT_LIMIT = 25
+FOOTER_LIMIT = 2048
+LANGUAGES_PER_PAGE = 10
+
+
+def build_translation_pages(original, src_lang, translation, target_lang, footer):
+    """Builds paginated embeds for a translation too long to fit in a single embed field."""
+    pieces = split_text(translation, DESCRIPTION_LIMIT) or [("\u200b", '')]
+    pages = []
+    for i, (piece, _) in enumerate(pieces):
+        embed = discord.Embed(title=f"Translation ({target_lang})", description=piece, color=discord.Color.blue())
+        if i == 0:
+            excerpt = original if len(original) <= FIELD_LIMIT else original[:FIELD_LIMIT - 1] + "…"
+            embed.add_field(name=f"Original ({src_lang})", value=excerpt, inline=False)
+        embed.set_footer(text=f"Page {i + 1}/{len(pieces)} • {footer}" if len(pieces) > 1 else footer)
+        pages.append(embed)
+    return pages
+
+
+def requested_by(names):
+    """Builds the footer crediting everyone who asked for a translation, cut to Discord's footer limit."""
+    text = f"Requested by {', '.join(names)}"
+    return text if len(text) <= FOOTER_LIMIT else text[:FOOTER_LIMIT - 1] + "…"
+
+
+def add_translation_fields(embed, translations):
+    """
+    Adds translation fields to embed until Discord's size or field count limit would be exceeded.
+
+    Returns:
+        tuple[list, list]: The languages added, and the (lang, text) pairs that did not fit
+    """
+    added = []
+    for i, (lang, text) in enumerate(translations):
+        name = f"Translation ({lang})"
+        if len(embed.fields) >= EMBED_FIELD_COUNT_LIMIT or len(embed) + len(name) + len(text) > EMBED_TOTAL_LIMIT:
+            return added, translations[i:]
+        embed.add_field(name=name, value=text, inline=False)
+        added.append(lang)
+    return added, []
+
 
 class LanguageSelector(discord.ui.Select):
     def __init__(self, cog, message, user, options):
@@ -56,193 +82,406 @@ class LanguageSelector(discord.ui.Select):
             return
 
         selected_lang = self.values[0]
+        self.view.stop()
         await interaction.response.defer()
         await self.cog.translate_message(self.message, selected_lang, self.user)
         await interaction.message.delete()
 
-class LanguageSelectorView(discord.ui.View):
+class LanguageSelectorView(WheelView):
     def __init__(self, cog, message, user, options):
         super().__init__()
         self.add_item(LanguageSelector(cog, message, user, options))
 
-class LanguageButtons(discord.ui.View):
-    def __init__(self, cog, message, user, options):
-        super().__init__()
+class LanguageButtons(WheelView):
+    def __init__(self, cog, message, user, options, timeout=30.0):
+        super().__init__(timeout=timeout)
         self.cog = cog
         self.message = message
         self.user = user
+        self.prompt = None
         for code, name in options.items():
-            self.add_item(discord.ui.Button(label=name, custom_id=code, style=discord.ButtonStyle.primary))
+            button = discord.ui.Button(label=name, custom_id=code, style=discord.ButtonStyle.primary)
+            button.callback = functools.partial(self.choose, code)
+            self.add_item(button)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return interaction.user.id == self.user.id
 
+    async def choose(self, lang, interaction: discord.Interaction):
+        self.stop()
+        await interaction.response.defer()
+        await self.cog.translate_message(self.message, lang, self.user)
+        await interaction.message.delete()
+
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger)
     async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.message.delete()
         self.stop()
 
     async def on_timeout(self):
-        await self.message.delete()
+        # Only the prompt goes; the message being translated is not ours to delete
+        if self.prompt is not None:
+            try:
+                await self.prompt.delete()
+            except discord.NotFound:
+                pass
 
 class TranslationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.char_limit = 1000
-        self.cooldown = commands.CooldownMapping.from_cooldown(1, 10.0, commands.BucketType.user)
+        self.char_limit = 4000
+        self.chunk_size = 1800
+        self.cooldown_rate = 1
+        self.cooldown_per = 10.0
         self.language_emoji_map = LANGUAGE_EMOJI_MAP
         self.multi_lang_countries = MULTI_LANG_COUNTRIES
         self.lang_code_map = LANG_CODE_MAP
         self.emoji_to_lang = EMOJI_TO_LANG
-        self.translated_messages = {}
-        self.language_names = self.get_language_names()
-        self.FLAG_EMOJI_PATTERN = re.compile(r'[\U0001F1E6-\U0001F1FF]{2}')
+        self.translated_messages = TranslationTracker(bot)
+        self.translation_cache = TranslationCache(bot)
+        self.translator = build_router_from_env()
+        self.message_cache = TTLCache(maxsize=256, ttl=600.0, wheel=bot.timer_wheel)
+        self.batch_window = 2.0
+        self.pending_batches = {}
+        self.batch_locks = {}
+        self.batch_tasks = set()
+        self.batch_messages = TTLCache(maxsize=512, ttl=3600.0, wheel=bot.timer_wheel)
+        # Names credited in the footer of each message's consolidated translation
+        self.batch_requesters = TTLCache(maxsize=512, ttl=3600.0, wheel=bot.timer_wheel)
         self.cleanup_translations.start()
+        self.refresh_language_catalog.start()
+        self.warm_up_task = None
+        self._language_pages = None
+        register_page_source('languages', self.language_source)
 
-    def cog_unload(self):
+    async def cog_load(self):
+        self.warm_up_task = asyncio.create_task(warm_up_in_background())
+
+    async def cog_unload(self):
         self.cleanup_translations.cancel()
+        self.refresh_language_catalog.cancel()
+        if self.warm_up_task is not None:
+            self.warm_up_task.cancel()
+        for task in list(self.batch_tasks):
+            task.cancel()
+        await self.translator.close()
 
     @tasks.loop(minutes=15)
     async def cleanup_translations(self):
-        current_time = datetime.utcnow()
-        to_remove = []
-        for message_id, translations in self.translated_messages.items():
-            for lang, (translation_id, timestamp) in translations.items():
-                if current_time - timestamp > timedelta(hours=1):
-                    to_remove.append((message_id, lang))
-        
-        for message_id, lang in to_remove:
-            del self.translated_messages[message_id][lang]
-            if not self.translated_messages[message_id]:
-                del self.translated_messages[message_id]
-        
-        logging.info(f"Cleaned up {len(to_remove)} old translations")
-
-    def get_language_names(self):
-        translator = GoogleTranslator()
-        languages = translator.get_supported_languages(as_dict=True)
-        languages.update(ADDITIONAL_LANGUAGE_NAMES)
-        return languages
+        # Expired entries leave memory on their own timers; only the database needs sweeping
+        await self.translated_messages.prune_persisted()
+        logging.info(f"Tracking {len(self.translated_messages)} translations")
+
+        await self.translation_cache.prune()
+        stats = self.translation_cache.stats()
+        logging.info(
+            f"Translation cache hit ratio {stats['hit_ratio']:.1%} "
+            f"(memory {stats['memory_hits']}, database {stats['db_hits']}, misses {stats['misses']})"
+        )
+
+    @tasks.loop(hours=24)
+    async def refresh_language_catalog(self):
+        await language_catalog.refresh(self.translator)
+
+    @property
+    def language_names(self):
+        return language_catalog.get_language_names()
+
+    def detect_source(self, text):
+        """Detects the language of text and maps it to the code the translator expects."""
+        src_lang = detect_language(text)
+        mapped = self.lang_code_map.get(src_lang.lower(), src_lang)
+        logging.info(f"Detected source language: {src_lang}, Mapped to: {mapped}")
+        return mapped
+
+    async def translate_from(self, text, src_lang, dest_lang):
+        """Translates text whose source language is already known, using the cache when possible."""
+        original_dest_lang = dest_lang
+        dest_lang = self.lang_code_map.get(dest_lang.lower(), dest_lang)
+        logging.info(f"Original destination language: {original_dest_lang}, Mapped to: {dest_lang}")
+
+        if src_lang == dest_lang:
+            return text
+
+        async def translate_chunk(chunk):
+            cached = await self.translation_cache.get(chunk, src_lang, dest_lang)
+            if cached is not None:
+                return cached
+
+            translation = await self.translator.translate(chunk, src_lang, dest_lang)
+            await self.translation_cache.set(chunk, src_lang, dest_lang, translation)
+            return translation
+
+        # Long texts are split to keep each request well inside the endpoint's URL length limit
+        return await translate_in_chunks(translate_chunk, text, chunk_size=self.chunk_size)
 
     async def translate_text(self, text, dest_lang):
         try:
-            src_lang = detect(text)
-            logging.info(f"Detected source language: {src_lang}")
-            
-            original_src_lang = src_lang
-            original_dest_lang = dest_lang
-            
-            src_lang = self.lang_code_map.get(src_lang.lower(), src_lang)
-            dest_lang = self.lang_code_map.get(dest_lang.lower(), dest_lang)
-
-            logging.info(f"Original source language: {original_src_lang}, Mapped to: {src_lang}")
-            logging.info(f"Original destination language: {original_dest_lang}, Mapped to: {dest_lang}")
-
-            translator = GoogleTranslator(source=src_lang, target=dest_lang)
-            translation = translator.translate(text)
-            
-            if not translation:
-                raise ValueError(f"Translation failed for {src_lang} to {dest_lang}")
-            
-            return translation, src_lang
+            src_lang = self.detect_source(text)
+            return await self.translate_from(text, src_lang, dest_lang), src_lang
         except Exception as e:
             logging.error(f"Translation error: {str(e)}")
             raise
 
+    async def translate_many(self, texts, src_lang, dest_lang):
+        """
+        Translates several texts from one source language using as few upstream requests as possible.
+
+        Duplicates are translated once and cached texts are never sent upstream. The
+        rest are joined with a separator into requests of up to chunk_size URL-encoded characters,
+        and a request whose reply does not split back into the same number of parts
+        is retried one text at a time.
+        """
+        dest_lang = self.lang_code_map.get(dest_lang.lower(), dest_lang)
+        if src_lang == dest_lang:
+            return list(texts)
+
+        results = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            cached = await self.translation_cache.get(text, src_lang, dest_lang)
+            if cached is not None:
+                results[text] = cached
+            else:
+                missing.append(text)
+
+        groups = []
+        singles = []
+        for text in missing:
+            if "§" in text or encoded_length(text) > self.chunk_size:
+                singles.append(text)
+            elif groups and len(groups[-1]) < 50 and sum(encoded_length(t + BATCH_SEPARATOR) for t in groups[-1]) + encoded_length(text) <= self.chunk_size:
+                groups[-1].append(text)
+            else:
+                groups.append([text])
+
+        async def translate_group(group):
+            if len(group) > 1:
+                translated = await self.translator.translate(BATCH_SEPARATOR.join(group), src_lang, dest_lang)
+                parts = [part for part in BATCH_SPLIT.split(translated) if part]
+                if len(parts) == len(group):
+                    for text, part in zip(group, parts):
+                        results[text] = part
+                        await self.translation_cache.set(text, src_lang, dest_lang, part)
+                    return
+                logging.info(f"Batched translation returned {len(parts)} parts for {len(group)} texts, retrying individually")
+            singles.extend(group)
+
+        await asyncio.gather(*(translate_group(group) for group in groups))
+
+        translations = await asyncio.gather(*(self.translate_from(text, src_lang, dest_lang) for text in singles))
+        results.update(zip(singles, translations))
+        return [results[text] for text in texts]
+
+    async def fetch_message(self, channel_id, message_id):
+        """Fetches a message through a small LRU so repeated reactions cost one REST call."""
+        message = self.message_cache.get(message_id)
+        if message is not None:
+            return message
+
+        channel = self.bot.get_channel(channel_id)
+        try:
+            if channel is None:
+                channel = await self.bot.fetch_channel(channel_id)
+            message = await channel.fetch_message(message_id)
+        except (discord.NotFound, discord.Forbidden):
+            return None
+
+        self.message_cache.set(message_id, message)
+        return message
+
     @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        if user.bot or reaction.message.author.bot:
+    async def on_raw_message_edit(self, payload):
+        self.message_cache.pop(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        self.message_cache.pop(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        # Filter on the emoji before doing anything that could hit the API
+        emoji = str(payload.emoji)
+        if emoji not in self.emoji_to_lang and emoji not in self.multi_lang_countries:
             return
 
-        emoji = str(reaction.emoji)
-        logging.info(f"Reaction added: {emoji} by {user}")
+        user = payload.member or self.bot.get_user(payload.user_id)
+        if user is None or user.bot:
+            return
 
-        if not self.FLAG_EMOJI_PATTERN.match(emoji):
+        message = await self.fetch_message(payload.channel_id, payload.message_id)
+        if message is None or message.author.bot:
             return
 
+        logging.info(f"Reaction added: {emoji} by {user}")
+
         if emoji in self.multi_lang_countries:
             options = self.multi_lang_countries[emoji]
-            view = LanguageButtons(self, reaction.message, user, options)
-            prompt = await reaction.message.channel.send(f"{user.mention} Please select a language:", view=view)
-            
-            def check(i: discord.Interaction):
-                return i.data["custom_id"] in options and i.user.id == user.id
-
-            try:
-                interaction = await self.bot.wait_for("interaction", timeout=30.0, check=check)
-                selected_lang = interaction.data["custom_id"]
-                await self.translate_message(reaction.message, selected_lang, user)
-                await prompt.delete()
-            except asyncio.TimeoutError:
-                await prompt.delete()
-        elif emoji in self.emoji_to_lang:
-            selected_lang = self.emoji_to_lang[emoji]
-            await self.translate_message(reaction.message, selected_lang, user)
+            view = LanguageButtons(self, message, user, options)
+            view.prompt = await message.channel.send(f"{user.mention} Please select a language:", view=view)
         else:
-            logging.info(f"Emoji {emoji} not recognized for translation")
+            selected_lang = self.emoji_to_lang[emoji]
+            await self.translate_message(message, selected_lang, user)
 
     async def translate_message(self, message, target_lang, user):
+        """Queues a translation of message, batching flags that arrive within batch_window."""
         message_id = message.id
-        if message_id in self.translated_messages and target_lang in self.translated_messages[message_id]:
+        if await self.translated_messages.lookup(message_id, target_lang):
             await message.add_reaction('❤️')
             return
 
-        bucket = self.cooldown.get_bucket(message)
-        retry_after = bucket.update_rate_limit()
-        if retry_after:
-            await message.channel.send(f"{user.mention} Please wait {retry_after:.2f} seconds before translating again.", delete_after=10)
-            return
+        batch = self.pending_batches.get(message_id)
+        if batch is None or user not in batch.values():
+            retry_after = await self.bot.rate_limiter.hit('translate', user.id, self.cooldown_rate, self.cooldown_per)
+            if retry_after:
+                await message.channel.send(f"{user.mention} Please wait {retry_after:.2f} seconds before translating again.", delete_after=10)
+                return
 
         if len(message.content) > self.char_limit:
             await message.channel.send(f"{user.mention} The message is too long to translate (max {self.char_limit} characters).", delete_after=10)
             return
 
-        try:
-            translated_text, src_lang = await self.translate_text(message.content, target_lang)
+        if batch is None:
+            batch = self.pending_batches[message_id] = {}
+            task = asyncio.create_task(self.flush_batch(message))
+            self.batch_tasks.add(task)
+            task.add_done_callback(self.batch_tasks.discard)
+        batch.setdefault(target_lang, user)
+
+    async def flush_batch(self, message):
+        """Translates every language queued for message into one consolidated embed."""
+        await asyncio.sleep(self.batch_window)
+        lock = self.batch_locks.setdefault(message.id, asyncio.Lock())
+        async with lock:
+            batch = self.pending_batches.pop(message.id, {})
+            try:
+                async with self.bot.quotas.run('translate', message.guild and message.guild.id, cost=len(batch)):
+                    await self.post_batch(message, batch)
+            except QuotaExceeded as e:
+                await message.channel.send(str(e), delete_after=20)
+            except Exception as e:
+                logging.error(f"Translation error: {str(e)}")
+                error_message = f"An error occurred during translation: {str(e)}\nPlease try again later or use a different language code."
+                await message.channel.send(error_message, delete_after=20)
+        if not lock.locked() and message.id not in self.pending_batches:
+            self.batch_locks.pop(message.id, None)
+
+    async def post_batch(self, message, batch):
+        src_lang = self.detect_source(message.content)
+        langs = list(batch)
+        results = await asyncio.gather(
+            *(self.translate_from(message.content, src_lang, lang) for lang in langs),
+            return_exceptions=True
+        )
+
+        translated = []
+        for lang, result in zip(langs, results):
+            if isinstance(result, Exception):
+                logging.error(f"Translation error for {lang}: {result}")
+                await message.channel.send(
+                    f"{batch[lang].mention} An error occurred during translation to {lang}: {result}\nPlease try again later.",
+                    delete_after=20
+                )
+            else:
+                translated.append((lang, result))
+        if len(message.content) > FIELD_LIMIT:
+            long_translations, translated = translated, []
+        else:
+            long_translations = [(lang, text) for lang, text in translated if len(text) > FIELD_LIMIT]
+            translated = [(lang, text) for lang, text in translated if len(text) <= FIELD_LIMIT]
+
+        for lang, text in long_translations:
+            user = batch[lang]
+            pages = build_translation_pages(message.content, src_lang, text, lang, f"Requested by {user.name}")
+            paginator = PaginatorView(pages, author=user)
+            await paginator.send(message.channel)
+            await self.translated_messages.add(message.id, lang, paginator.message.id, message.channel.id)
+
+        if not translated:
+            if long_translations:
+                await message.add_reaction('❤️')
+            return
 
+        requesters = list(dict.fromkeys(user.name for user in batch.values()))
+        placed = []
+        remaining = translated
+        sent_message = self.batch_messages.get(message.id)
+        sent_requesters = requesters
+        if sent_message is not None:
+            sent_requesters = list(dict.fromkeys(self.batch_requesters.get(message.id, []) + requesters))
+            embed = sent_message.embeds[0].copy()
+            embed.set_footer(text=requested_by(sent_requesters))
+            added, remaining = add_translation_fields(embed, translated)
+            if added:
+                try:
+                    sent_message = await sent_message.edit(embed=embed)
+                    placed += [(lang, sent_message) for lang in added]
+                except discord.HTTPException as e:
+                    logging.warning(f"Failed to add to the translation of message {message.id}: {e}")
+                    sent_message = None
+                    remaining = translated
+
+        # Whatever does not fit in one embed continues in a new message
+        while remaining:
             embed = discord.Embed(title="Translation", color=discord.Color.blue())
             embed.add_field(name=f"Original ({src_lang})", value=message.content, inline=False)
-            embed.add_field(name=f"Translation ({target_lang})", value=translated_text, inline=False)
-            embed.set_footer(text=f"Requested by {user.name}")
-
+            embed.set_footer(text=requested_by(requesters))
+            added, remaining = add_translation_fields(embed, remaining)
+            if not added:
+                logging.error(f"Translation of message {message.id} does not fit in an embed")
+                break
             sent_message = await message.channel.send(embed=embed)
-            
-            if message_id not in self.translated_messages:
-                self.translated_messages[message_id] = {}
-            self.translated_messages[message_id][target_lang] = (sent_message.id, datetime.utcnow())
+            sent_requesters = requesters
+            placed += [(lang, sent_message) for lang in added]
 
-            await message.add_reaction('❤️')
+        self.batch_messages.set(message.id, sent_message)
+        self.batch_requesters.set(message.id, sent_requesters)
+        for lang, translation_message in placed:
+            await self.translated_messages.add(message.id, lang, translation_message.id, message.channel.id)
 
-        except Exception as e:
-            logging.error(f"Translation error: {str(e)}")
-            error_message = f"An error occurred during translation: {str(e)}\nPlease try again later or use a different language code."
-            await message.channel.send(error_message, delete_after=20)
+        await message.add_reaction('❤️')
+
+    async def remove_translation(self, channel_id, translation_id, lang):
+        """Removes one language from a consolidated translation, deleting it if none are left."""
+        channel = self.bot.get_partial_messageable(channel_id)
+        try:
+            translation_message = await channel.fetch_message(translation_id)
+        except discord.errors.NotFound:
+            return None
+
+        embed = translation_message.embeds[0].copy() if translation_message.embeds else None
+        field_name = f"Translation ({lang})"
+        if embed is None or not any(f.name.startswith("Translation (") and f.name != field_name for f in embed.fields):
+            await translation_message.delete()
+            return None
+
+        for index in reversed(range(len(embed.fields))):
+            if embed.fields[index].name == field_name:
+                embed.remove_field(index)
+        return await translation_message.edit(embed=embed)
 
     @commands.Cog.listener()
-    async def on_reaction_remove(self, reaction, user):
-        if user.bot or reaction.message.author.bot:
+    async def on_raw_reaction_remove(self, payload):
+        emoji = str(payload.emoji)
+        if emoji not in self.emoji_to_lang or payload.user_id == self.bot.user.id:
             return
 
-        emoji = str(reaction.emoji)
-        if not self.FLAG_EMOJI_PATTERN.match(emoji):
-            return
+        target_lang = self.emoji_to_lang[emoji]
+        tracked = await self.translated_messages.lookup(payload.message_id, target_lang)
+        if tracked:
+            remaining = await self.remove_translation(tracked.channel_id, tracked.translation_id, target_lang)
+            consolidated = self.batch_messages.get(payload.message_id)
+            if consolidated is not None and consolidated.id == tracked.translation_id:
+                if remaining is None:
+                    self.batch_messages.pop(payload.message_id)
+                    self.batch_requesters.pop(payload.message_id)
+                else:
+                    self.batch_messages.set(payload.message_id, remaining)
 
-        if emoji in self.emoji_to_lang:
-            message_id = reaction.message.id
-            target_lang = self.emoji_to_lang[emoji]
-            if message_id in self.translated_messages and target_lang in self.translated_messages[message_id]:
-                translation_id, _ = self.translated_messages[message_id][target_lang]
-                try:
-                    translation_message = await reaction.message.channel.fetch_message(translation_id)
-                    await translation_message.delete()
-                except discord.errors.NotFound:
-                    pass
-                
-                del self.translated_messages[message_id][target_lang]
-                if not self.translated_messages[message_id]:
-                    del self.translated_messages[message_id]
+            await self.translated_messages.remove(payload.message_id, target_lang)
 
     @commands.command(name='translate')
+    @rate_limit('translate', 1, 10.0)
     async def translate_command(self, ctx, lang: str, *, text: str):
         """Translate text to a specified language"""
         target_lang = self.lang_code_map.get(lang.lower(), lang.lower())
@@ -251,23 +490,68 @@ class TranslationCog(commands.Cog):
             return
 
         try:
-            translated_text, src_lang = await self.translate_text(text, target_lang)
+            async with self.bot.quotas.run('translate', ctx.guild and ctx.guild.id):
+                translated_text, src_lang = await self.translate_text(text, target_lang)
+            if len(text) > FIELD_LIMIT or len(translated_text) > FIELD_LIMIT:
+                pages = build_translation_pages(text, src_lang, translated_text, target_lang, f"Requested by {ctx.author.name}")
+                await PaginatorView(pages, author=ctx.author).send(ctx)
+                return
+
             embed = discord.Embed(title="Translation", color=discord.Color.blue())
             embed.add_field(name=f"Original ({src_lang})", value=text, inline=False)
             embed.add_field(name=f"Translation ({target_lang})", value=translated_text, inline=False)
             await ctx.send(embed=embed)
+        except QuotaExceeded as e:
+            await ctx.send(str(e))
         except Exception as e:
             await ctx.send(f"An error occurred during translation: {str(e)}. Please try again later.")
 
-    @commands.command(name='languages', aliases=['lang'])
-    async def list_languages(self, ctx):
-        """List all supported languages with pagination"""
-        languages_per_page = 10
-        all_languages = sorted(self.language_emoji_map.items(), key=lambda x: self.language_names.get(x[0], x[0]))
-        pages = []
+    async def language_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=language_index.label(code), value=code)
+            for code in language_index.search(current)
+        ]
+
+    @app_commands.command(name="translate", description="Translate text to another language")
+    @app_commands.describe(language="Language to translate to", text="Text to translate")
+    @app_commands.autocomplete(language=language_autocomplete)
+    @rate_limit('translate', 1, 10.0)
+    async def translate_slash(self, interaction: discord.Interaction, language: str, text: str):
+        target_lang = language_index.resolve(language)
+        if target_lang is None:
+            await interaction.response.send_message("Unknown language. Pick one from the suggestions.", ephemeral=True)
+            return
 
-        for i in range(0, len(all_languages), languages_per_page):
-            page_languages = all_languages[i:i+languages_per_page]
+        await interaction.response.defer()
+        try:
+            async with self.bot.quotas.run('translate', interaction.guild_id):
+                translated_text, src_lang = await self.translate_text(text, target_lang)
+            if len(text) > FIELD_LIMIT or len(translated_text) > FIELD_LIMIT:
+                pages = build_translation_pages(text, src_lang, translated_text, target_lang, f"Requested by {interaction.user.name}")
+                await PaginatorView(pages, author=interaction.user).send(interaction)
+                return
+
+            embed = discord.Embed(title="Translation", color=discord.Color.blue())
+            embed.add_field(name=f"Original ({src_lang})", value=text, inline=False)
+            embed.add_field(name=f"Translation ({target_lang})", value=translated_text, inline=False)
+            await interaction.followup.send(embed=embed)
+        except QuotaExceeded as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"An error occurred during translation: {str(e)}. Please try again later.", ephemeral=True)
+
+    def language_page(self, index):
+        """Returns one !languages embed page, built on first use and kept until the language catalog changes."""
+        version = language_catalog.catalog_version()
+        if self._language_pages is None or self._language_pages[0] != version:
+            all_languages = sorted(self.language_emoji_map.items(), key=lambda x: self.language_names.get(x[0], x[0]))
+            self._language_pages = (version, all_languages, {})
+        _, all_languages, pages = self._language_pages
+
+        if index not in pages:
+            page_languages = all_languages[index * LANGUAGES_PER_PAGE:(index + 1) * LANGUAGES_PER_PAGE]
+            if not page_languages:
+                return None
             embed = discord.Embed(title="Supported Languages", color=discord.Color.blue())
             
             language_list = ""
@@ -280,22 +564,54 @@ class TranslationCog(commands.Cog):
             
             embed.add_field(name="Usage", value="React with a flag emoji or use `!translate [code] [text]` to translate", inline=False)
             
-            pages.append(embed)
+            pages[index] = embed
+        return pages[index]
 
-        paginator = LanguagePaginator(pages)
-        message = await ctx.send(embed=pages[0], view=paginator)
-        paginator.message = message
+    def language_source(self, _='', interaction=None):
+        return PageSource(self.language_page, total=-(-len(self.language_emoji_map) // LANGUAGES_PER_PAGE))
+
+    @commands.command(name='languages', aliases=['lang'])
+    async def list_languages(self, ctx):
+        """List all supported languages with pagination"""
+        await send_persistent_paginator(ctx, 'languages', source=self.language_source(), delete_after=60)
 
     @commands.command(name='translation_info')
     async def translation_info(self, ctx):
         """Display information about translation limitations"""
         embed = discord.Embed(title="Translation Information", color=discord.Color.blue())
         embed.add_field(name="Character Limit", value=f"{self.char_limit} characters", inline=False)
-        embed.add_field(name="Cooldown", value="1 translation per 10 seconds per user", inline=False)
+        embed.add_field(name="Cooldown", value=f"{self.cooldown_rate} translation per {self.cooldown_per:g} seconds per user", inline=False)
         embed.add_field(name="Usage", value="React to a message with a flag emoji to translate\nor use !translate [lang_code] [text]", inline=False)
         embed.add_field(name="Multi-language Countries", value="Some country flags (e.g., 🇨🇦, 🇨🇭, 🇧🇪) will prompt for language selection", inline=False)
         await ctx.send(embed=embed)
 
+    @commands.command(name='translation_stats')
+    async def translation_stats(self, ctx):
+        """Display translation cache and provider statistics"""
+        stats = self.translation_cache.stats()
+        embed = discord.Embed(title="Translation Statistics", color=discord.Color.blue())
+        embed.add_field(name="Hit Ratio", value=f"{stats['hit_ratio']:.1%}", inline=False)
+        embed.add_field(name="Memory Hits", value=str(stats['memory_hits']), inline=True)
+        embed.add_field(name="Database Hits", value=str(stats['db_hits']), inline=True)
+        embed.add_field(name="Misses", value=str(stats['misses']), inline=True)
+        embed.add_field(name="Entries in Memory", value=str(stats['memory_entries']), inline=False)
+        timers = self.bot.timer_wheel.stats()
+        embed.add_field(
+            name="Pending Timers",
+            value=f"{timers['pending']} ({', '.join(f'{count} {kind}' for kind, count in sorted(timers['by_kind'].items())) or 'none'})",
+            inline=False
+        )
+        for name, provider in self.translator.stats().items():
+            latency = f"{provider['latency'] * 1000:.0f} ms" if provider['latency'] is not None else "n/a"
+            status = "healthy" if provider['healthy'] else "failing over"
+            embed.add_field(
+                name=f"Provider: {name}",
+                value=(f"{provider['requests']} requests, {provider['errors']} errors, "
+                       f"{provider['cancelled']} hedges cancelled\nLatency {latency}, score {provider['score']:.2f}, {status}"),
+                inline=False
+            )
+        await ctx.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(TranslationCog(bot))
     logging.info("TranslationCog has been set up")
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -9,7 +10,10 @@ from discord import app_commands
 from discord.ext import commands
 from pytube import YouTube
 from yt_dlp import YoutubeDL
-from utils.helpers import get_random_user_agent, do_sleep
+from utils.helpers import admin_only, get_random_user_agent, do_sleep
+from utils.media_prefetch import (PREFETCH_SETTING, MediaPrefetcher,
+                                  find_media_urls, metadata_cache)
+from utils.quotas import QuotaExceeded
 
 def unique_filename(directory):
     current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -19,7 +23,7 @@ def load_config():
     with open('/app/config/config.json', 'r') as config_file:
         return json.load(config_file)
 
-def download_instagram_video(post_url, download_dir):
+def download_instagram_video(post_url, download_dir, post=None):
     L = instaloader.Instaloader(
         dirname_pattern=download_dir, 
         filename_pattern="{shortcode}", 
@@ -27,11 +31,13 @@ def download_instagram_video(post_url, download_dir):
         user_agent=get_random_user_agent()
         )
     L.download_comments = False
-    shortcode = post_url.split('/')[-2]
 
-    # Sleep before making the request to get post information
-    do_sleep()
-    post = instaloader.Post.from_shortcode(L.context, shortcode)
+    if post is None:
+        shortcode = post_url.split('/')[-2]
+
+        # Sleep before making the request to get post information
+        do_sleep()
+        post = instaloader.Post.from_shortcode(L.context, shortcode)
     
     # Sleep before downloading the post
     do_sleep()
@@ -78,12 +84,16 @@ def download_with_ytdlp(video_url, download_dir):
         ydl.extract_info(video_url, download=True)
     return output_template
 
-def download_tiktok_video(video_url, download_dir):
-    do_sleep()
+def download_tiktok_video(video_url, download_dir, info=None):
     output_template = unique_filename(download_dir)
     ydl_opts = get_ytdlp_opts(output_template)
     with YoutubeDL(ydl_opts) as ydl:
-        ydl.extract_info(video_url, download=True)
+        if info is None:
+            do_sleep()
+            ydl.extract_info(video_url, download=True)
+        else:
+            # Metadata was prefetched, go straight to fetching the bytes
+            ydl.process_ie_result(info, download=True)
     return output_template
 
 def download_facebook_reel(video_url, download_dir):
@@ -108,6 +118,13 @@ class VideoDownload(commands.Cog):
         self.download_dir = "/app/data/DL-Output"
         if not os.path.exists(self.download_dir):
             os.makedirs(self.download_dir)
+        self.prefetcher = MediaPrefetcher()
+
+    async def cog_load(self):
+        self.prefetcher.start()
+
+    async def cog_unload(self):
+        self.prefetcher.stop()
 
     async def setup(self):
         logging.info("Fetching guild IDs for VideoDownload cog.")
@@ -136,18 +153,25 @@ class VideoDownload(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         logging.info(f"{interaction.user} requested to download a video from {platform.name} with URL: {url}")
         try:
-            if platform.value == 'instagram':
-                video_path = download_instagram_video(url, self.download_dir)
-            elif platform.value == 'youtube':
-                video_path = download_youtube_video(url, self.download_dir)
-            elif platform.value == 'tiktok':
-                video_path = download_tiktok_video(url, self.download_dir)
-            elif platform.value == 'facebook_reels':
-                video_path = download_facebook_reel(url, self.download_dir)
-            elif platform.value == 'youtube_short':
-                video_path = download_youtube_short(url, self.download_dir)
-            else:
-                video_path = download_with_ytdlp(url, self.download_dir)
+            async with self.bot.quotas.run('video_dl', interaction.guild_id):
+                if platform.value == 'instagram':
+                    post = await metadata_cache.get(url)
+                    if not isinstance(post, instaloader.Post):
+                        post = None
+                    video_path = await asyncio.to_thread(download_instagram_video, url, self.download_dir, post)
+                elif platform.value == 'youtube':
+                    video_path = await asyncio.to_thread(download_youtube_video, url, self.download_dir)
+                elif platform.value == 'tiktok':
+                    info = await metadata_cache.get(url)
+                    if not isinstance(info, dict):
+                        info = None
+                    video_path = await asyncio.to_thread(download_tiktok_video, url, self.download_dir, info)
+                elif platform.value == 'facebook_reels':
+                    video_path = await asyncio.to_thread(download_facebook_reel, url, self.download_dir)
+                elif platform.value == 'youtube_short':
+                    video_path = await asyncio.to_thread(download_youtube_short, url, self.download_dir)
+                else:
+                    video_path = await asyncio.to_thread(download_with_ytdlp, url, self.download_dir)
 
             # Check file size
             file_size = os.path.getsize(video_path)
@@ -168,10 +192,35 @@ class VideoDownload(commands.Cog):
                     os.remove(file_path)
 
             await interaction.followup.send(f"The video has been sent to the '{interaction.channel.name}' channel.", ephemeral=True)
+        except QuotaExceeded as e:
+            await interaction.followup.send(str(e), ephemeral=True)
         except Exception as e:
             logging.exception("Failed to download or send the video")
             await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
 
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.author.bot or message.guild is None:
+            return
+        if not self.bot.channel_settings.is_enabled(message.channel.id, PREFETCH_SETTING):
+            return
+        for platform, url in find_media_urls(message.content):
+            self.prefetcher.submit(message.channel.id, platform, url)
+
+    @commands.command(name='prefetch')
+    @admin_only()
+    async def prefetch_command(self, ctx, mode: str):
+        """Turn media link prefetching on or off for this channel"""
+        mode = mode.lower()
+        if mode == 'on':
+            await self.bot.channel_settings.set(ctx.guild.id, ctx.channel.id, PREFETCH_SETTING, 'on')
+            await ctx.send("Media links posted in this channel will now be prefetched.")
+        elif mode == 'off':
+            await self.bot.channel_settings.delete(ctx.channel.id, PREFETCH_SETTING)
+            await ctx.send("Media link prefetching is now off for this channel.")
+        else:
+            await ctx.send("Usage: `!prefetch on` or `!prefetch off`")
+
 async def setup(bot):
     cog = VideoDownload(bot)
     await cog.setup()
@@ -0,0 +1,78 @@
+"""
+ProviderRouter failover, hedging and recovery against the local stand-in servers.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import asyncio
+import time
+
+from benchmarks.stand_in_servers import StandInServer, fake_translation, google_translate_app, libretranslate_app
+from utils.translation_client import GoogleTranslateClient
+from utils.translation_providers import GoogleProvider, LibreTranslateProvider, ProviderRouter
+
+
+def served(provider):
+    return provider.stats.requests - provider.stats.errors
+
+
+def run_with_router(scenario, google_settings, **router_options):
+    """Runs scenario(router, google_app, google, libre) against stand-in Google and LibreTranslate servers."""
+    async def main():
+        google_app = google_translate_app(**google_settings)
+        async with StandInServer(google_app) as google_server, StandInServer(libretranslate_app()) as libre_server:
+            google = GoogleProvider(GoogleTranslateClient(base_url=f"{google_server.base_url}/m"))
+            libre = LibreTranslateProvider(libre_server.base_url)
+            router = ProviderRouter([google, libre], **router_options)
+            try:
+                await scenario(router, google_app, google, libre)
+            finally:
+                await router.close()
+
+    asyncio.run(main())
+
+
+def test_fails_over_when_the_primary_returns_errors():
+    async def scenario(router, google_app, google, libre):
+        assert await router.translate("hello", 'en', 'fr') == fake_translation("hello", 'fr')
+        assert google.stats.errors == 1
+        assert served(libre) == 1
+
+    run_with_router(scenario, {'base_latency': 0.01, 'status': 429})
+
+
+def test_hedges_to_the_next_provider_when_the_primary_is_slow():
+    async def scenario(router, google_app, google, libre):
+        start = time.monotonic()
+        assert await router.translate("hello", 'en', 'fr') == fake_translation("hello", 'fr')
+        assert time.monotonic() - start < 1.0
+        assert served(libre) == 1
+        # Let the losing call unwind from its cancellation
+        await asyncio.sleep(0)
+        assert google.stats.cancelled == 1
+
+    run_with_router(scenario, {'base_latency': 1.5}, hedge_delay=0.2)
+
+
+def test_tripped_provider_recovers_after_a_probe():
+    async def scenario(router, google_app, google, libre):
+        # Probe on every call so the failing primary keeps being tried until it trips
+        router.probe_interval = 0.0
+        for _ in range(3):
+            await router.translate("hello", 'en', 'fr')
+        assert not google.stats.healthy
+        assert served(libre) == 3
+
+        # Skipped while tripped
+        await router.translate("hello", 'en', 'fr')
+        assert google.stats.requests == 3
+
+        router.probe_interval = 0.2
+        google_app['status'] = 200
+        await asyncio.sleep(0.4)
+        assert router.ranked()[0] is libre
+        await router.translate("hello", 'en', 'fr')
+        assert served(google) == 1
+        assert google.stats.healthy
+
+    run_with_router(scenario, {'base_latency': 0.01, 'status': 503}, trip_for=0.3)
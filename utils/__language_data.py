@@ -486,4 +486,278 @@ ADDITIONAL_LANGUAGE_NAMES = {
     'ta': 'Tamil',
     'te': 'Telugu',
     'ur': 'Urdu',
-}
\ No newline at end of file
+}
+
+# Snapshot of the languages Google Translate supports, used until the catalog is refreshed
+GOOGLE_LANGUAGE_NAMES = {
+    'af': 'Afrikaans',
+    'ak': 'Twi',
+    'am': 'Amharic',
+    'ar': 'Arabic',
+    'as': 'Assamese',
+    'ay': 'Aymara',
+    'az': 'Azerbaijani',
+    'be': 'Belarusian',
+    'bg': 'Bulgarian',
+    'bho': 'Bhojpuri',
+    'bm': 'Bambara',
+    'bn': 'Bengali',
+    'bs': 'Bosnian',
+    'ca': 'Catalan',
+    'ceb': 'Cebuano',
+    'ckb': 'Kurdish (Sorani)',
+    'co': 'Corsican',
+    'cs': 'Czech',
+    'cy': 'Welsh',
+    'da': 'Danish',
+    'de': 'German',
+    'doi': 'Dogri',
+    'dv': 'Dhivehi',
+    'ee': 'Ewe',
+    'el': 'Greek',
+    'en': 'English',
+    'eo': 'Esperanto',
+    'es': 'Spanish',
+    'et': 'Estonian',
+    'eu': 'Basque',
+    'fa': 'Persian',
+    'fi': 'Finnish',
+    'fr': 'French',
+    'fy': 'Frisian',
+    'ga': 'Irish',
+    'gd': 'Scots Gaelic',
+    'gl': 'Galician',
+    'gn': 'Guarani',
+    'gom': 'Konkani',
+    'gu': 'Gujarati',
+    'ha': 'Hausa',
+    'haw': 'Hawaiian',
+    'hi': 'Hindi',
+    'hmn': 'Hmong',
+    'hr': 'Croatian',
+    'ht': 'Haitian Creole',
+    'hu': 'Hungarian',
+    'hy': 'Armenian',
+    'id': 'Indonesian',
+    'ig': 'Igbo',
+    'ilo': 'Ilocano',
+    'is': 'Icelandic',
+    'it': 'Italian',
+    'iw': 'Hebrew',
+    'ja': 'Japanese',
+    'jw': 'Javanese',
+    'ka': 'Georgian',
+    'kk': 'Kazakh',
+    'km': 'Khmer',
+    'kn': 'Kannada',
+    'ko': 'Korean',
+    'kri': 'Krio',
+    'ku': 'Kurdish (Kurmanji)',
+    'ky': 'Kyrgyz',
+    'la': 'Latin',
+    'lb': 'Luxembourgish',
+    'lg': 'Luganda',
+    'ln': 'Lingala',
+    'lo': 'Lao',
+    'lt': 'Lithuanian',
+    'lus': 'Mizo',
+    'lv': 'Latvian',
+    'mai': 'Maithili',
+    'mg': 'Malagasy',
+    'mi': 'Maori',
+    'mk': 'Macedonian',
+    'ml': 'Malayalam',
+    'mn': 'Mongolian',
+    'mni-Mtei': 'Meiteilon (Manipuri)',
+    'mr': 'Marathi',
+    'ms': 'Malay',
+    'mt': 'Maltese',
+    'my': 'Myanmar',
+    'ne': 'Nepali',
+    'nl': 'Dutch',
+    'no': 'Norwegian',
+    'nso': 'Sepedi',
+    'ny': 'Chichewa',
+    'om': 'Oromo',
+    'or': 'Odia (Oriya)',
+    'pa': 'Punjabi',
+    'pl': 'Polish',
+    'ps': 'Pashto',
+    'pt': 'Portuguese',
+    'qu': 'Quechua',
+    'ro': 'Romanian',
+    'ru': 'Russian',
+    'rw': 'Kinyarwanda',
+    'sa': 'Sanskrit',
+    'sd': 'Sindhi',
+    'si': 'Sinhala',
+    'sk': 'Slovak',
+    'sl': 'Slovenian',
+    'sm': 'Samoan',
+    'sn': 'Shona',
+    'so': 'Somali',
+    'sq': 'Albanian',
+    'sr': 'Serbian',
+    'st': 'Sesotho',
+    'su': 'Sundanese',
+    'sv': 'Swedish',
+    'sw': 'Swahili',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'tg': 'Tajik',
+    'th': 'Thai',
+    'ti': 'Tigrinya',
+    'tk': 'Turkmen',
+    'tl': 'Filipino',
+    'tr': 'Turkish',
+    'ts': 'Tsonga',
+    'tt': 'Tatar',
+    'ug': 'Uyghur',
+    'uk': 'Ukrainian',
+    'ur': 'Urdu',
+    'uz': 'Uzbek',
+    'vi': 'Vietnamese',
+    'xh': 'Xhosa',
+    'yi': 'Yiddish',
+    'yo': 'Yoruba',
+    'zh-CN': 'Chinese (Simplified)',
+    'zh-TW': 'Chinese (Traditional)',
+    'zu': 'Zulu',
+}
+
+# Native names (endonyms) of the languages above, so users can search in their own language
+NATIVE_LANGUAGE_NAMES = {
+    'af': 'Afrikaans',
+    'ak': 'Twi',
+    'am': 'አማርኛ',
+    'ar': 'العربية',
+    'as': 'অসমীয়া',
+    'ay': 'Aymar aru',
+    'az': 'Azərbaycan dili',
+    'be': 'Беларуская',
+    'bg': 'Български',
+    'bho': 'भोजपुरी',
+    'bm': 'Bamanankan',
+    'bn': 'বাংলা',
+    'bs': 'Bosanski',
+    'ca': 'Català',
+    'ceb': 'Sinugboanon',
+    'ckb': 'کوردیی ناوەندی',
+    'co': 'Corsu',
+    'cs': 'Čeština',
+    'cy': 'Cymraeg',
+    'da': 'Dansk',
+    'de': 'Deutsch',
+    'doi': 'डोगरी',
+    'dv': 'ދިވެހި',
+    'ee': 'Eʋegbe',
+    'el': 'Ελληνικά',
+    'en': 'English',
+    'eo': 'Esperanto',
+    'es': 'Español',
+    'et': 'Eesti',
+    'eu': 'Euskara',
+    'fa': 'فارسی',
+    'fi': 'Suomi',
+    'fil': 'Filipino',
+    'fr': 'Français',
+    'fy': 'Frysk',
+    'ga': 'Gaeilge',
+    'gd': 'Gàidhlig',
+    'gl': 'Galego',
+    'gn': "Avañe'ẽ",
+    'gom': 'कोंकणी',
+    'gu': 'ગુજરાતી',
+    'ha': 'Hausa',
+    'haw': 'ʻŌlelo Hawaiʻi',
+    'he': 'עברית',
+    'hi': 'हिन्दी',
+    'hmn': 'Hmoob',
+    'hr': 'Hrvatski',
+    'ht': 'Kreyòl ayisyen',
+    'hu': 'Magyar',
+    'hy': 'Հայերեն',
+    'id': 'Bahasa Indonesia',
+    'ig': 'Asụsụ Igbo',
+    'ilo': 'Ilokano',
+    'is': 'Íslenska',
+    'it': 'Italiano',
+    'ja': '日本語',
+    'jv': 'Basa Jawa',
+    'ka': 'ქართული',
+    'kk': 'Қазақ тілі',
+    'km': 'ខ្មែរ',
+    'kn': 'ಕನ್ನಡ',
+    'ko': '한국어',
+    'kri': 'Krio',
+    'ku': 'Kurdî',
+    'ky': 'Кыргызча',
+    'la': 'Latina',
+    'lb': 'Lëtzebuergesch',
+    'lg': 'Luganda',
+    'ln': 'Lingála',
+    'lo': 'ລາວ',
+    'lt': 'Lietuvių',
+    'lus': 'Mizo ṭawng',
+    'lv': 'Latviešu',
+    'mai': 'मैथिली',
+    'mg': 'Malagasy',
+    'mi': 'Te Reo Māori',
+    'mk': 'Македонски',
+    'ml': 'മലയാളം',
+    'mn': 'Монгол',
+    'mni-Mtei': 'ꯃꯤꯇꯩꯂꯣꯟ',
+    'mr': 'मराठी',
+    'ms': 'Bahasa Melayu',
+    'mt': 'Malti',
+    'my': 'မြန်မာ',
+    'ne': 'नेपाली',
+    'nl': 'Nederlands',
+    'no': 'Norsk',
+    'nso': 'Sepedi',
+    'ny': 'Chichewa',
+    'om': 'Afaan Oromoo',
+    'or': 'ଓଡ଼ିଆ',
+    'pa': 'ਪੰਜਾਬੀ',
+    'pl': 'Polski',
+    'ps': 'پښتو',
+    'pt': 'Português',
+    'qu': 'Runasimi',
+    'ro': 'Română',
+    'ru': 'Русский',
+    'rw': 'Kinyarwanda',
+    'sa': 'संस्कृतम्',
+    'sd': 'سنڌي',
+    'si': 'සිංහල',
+    'sk': 'Slovenčina',
+    'sl': 'Slovenščina',
+    'sm': 'Gagana Sāmoa',
+    'sn': 'ChiShona',
+    'so': 'Soomaali',
+    'sq': 'Shqip',
+    'sr': 'Српски',
+    'st': 'Sesotho',
+    'su': 'Basa Sunda',
+    'sv': 'Svenska',
+    'sw': 'Kiswahili',
+    'ta': 'தமிழ்',
+    'te': 'తెలుగు',
+    'tg': 'Тоҷикӣ',
+    'th': 'ไทย',
+    'ti': 'ትግርኛ',
+    'tk': 'Türkmençe',
+    'tr': 'Türkçe',
+    'ts': 'Xitsonga',
+    'tt': 'Татарча',
+    'ug': 'ئۇيغۇرچە',
+    'uk': 'Українська',
+    'ur': 'اردو',
+    'uz': 'Oʻzbekcha',
+    'vi': 'Tiếng Việt',
+    'xh': 'isiXhosa',
+    'yi': 'ייִדיש',
+    'yo': 'Yorùbá',
+    'zh-CN': '简体中文',
+    'zh-TW': '繁體中文',
+    'zu': 'isiZulu',
+}
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A bounded least-recently-used cache whose entries expire after a fixed time.
+
+    Lookups and inserts are O(1). Expired entries are dropped lazily when they
+    are read or when they reach the cold end of the LRU order. Given a timer
+    wheel, each entry also gets a timer that drops it as soon as it expires, so
+    large values are not held until something happens to touch them.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Seconds an entry stays valid after it is set
+        hits (int): Number of successful lookups
+        misses (int): Number of lookups that found nothing
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600.0, *, wheel=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.wheel = wheel
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, *, count=True):
+        """Returns the value for key, or default if it is missing or expired."""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at, _ = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return value
+            self._discard(key)
+        if count:
+            self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        """Stores value under key, evicting the least recently used entry when full."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl
+        timer = None
+        if self.wheel is not None and ttl != float('inf'):
+            timer = self.wheel.schedule(ttl, self._expire_entry, key, expires_at, kind='cache')
+        self._discard(key)
+        self._data[key] = (value, expires_at, timer)
+        while len(self._data) > self.maxsize:
+            self._discard(next(iter(self._data)))
+
+    def pop(self, key, default=None):
+        """Removes key and returns its value, or default if it is missing or expired."""
+        entry = self._discard(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return default
+        return entry[0]
+
+    def clear(self):
+        for _, _, timer in self._data.values():
+            if timer is not None:
+                timer.cancel()
+        self._data.clear()
+
+    def expire(self):
+        """Drops every expired entry. Returns the number removed."""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            self._discard(key)
+        return len(expired)
+
+    def _discard(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None and entry[2] is not None:
+            entry[2].cancel()
+        return entry
+
+    def _expire_entry(self, key, expires_at):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] == expires_at:
+            del self._data[key]
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,68 @@
+import logging
+
+
+class ChannelSettings:
+    """
+    In-memory cache of the per-channel settings stored in the channel_settings table.
+
+    The whole table is loaded once at startup and kept in sync on every write,
+    so lookups from hot paths such as on_message never touch the database.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._values = {}
+
+    async def load(self):
+        """Loads every channel setting from the database."""
+        async def fetch_settings(conn):
+            return await conn.fetch("SELECT channel_id, key, value FROM channel_settings")
+
+        rows = await self.bot.execute_db_operation(fetch_settings)
+        values = {}
+        for row in rows:
+            values.setdefault(row['channel_id'], {})[row['key']] = row['value']
+        self._values = values
+        logging.info(f"Loaded {len(rows)} channel settings")
+
+    def get(self, channel_id, key, default=None):
+        return self._values.get(channel_id, {}).get(key, default)
+
+    def is_enabled(self, channel_id, key):
+        return self.get(channel_id, key) == 'on'
+
+    def channels_with(self, key):
+        """Returns a dict of channel ID to value for every channel that has key set."""
+        return {channel_id: settings[key] for channel_id, settings in self._values.items() if key in settings}
+
+    def keys_for(self, channel_id, prefix=''):
+        """Returns a dict of key to value for every setting of a channel starting with prefix."""
+        settings = self._values.get(channel_id)
+        if not settings:
+            return {}
+        return {key: value for key, value in settings.items() if key.startswith(prefix)}
+
+    async def set(self, guild_id, channel_id, key, value):
+        async def upsert(conn):
+            await conn.execute(
+                "INSERT INTO channel_settings (channel_id, key, value, guild_id) VALUES ($1, $2, $3, $4) "
+                "ON CONFLICT (channel_id, key) DO UPDATE SET value = $3, updated_at = CURRENT_TIMESTAMP",
+                channel_id, key, value, guild_id
+            )
+
+        await self.bot.execute_db_operation(upsert)
+        self._values.setdefault(channel_id, {})[key] = value
+
+    async def delete(self, channel_id, key):
+        async def remove(conn):
+            await conn.execute(
+                "DELETE FROM channel_settings WHERE channel_id = $1 AND key = $2",
+                channel_id, key
+            )
+
+        await self.bot.execute_db_operation(remove)
+        settings = self._values.get(channel_id)
+        if settings is not None:
+            settings.pop(key, None)
+            if not settings:
+                del self._values[channel_id]
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+
+from utils.fx_rates import RateTable
+
+SPARK_BARS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values, width=60):
+    """Renders values as a line of block characters, averaging them down to width."""
+    if len(values) > width:
+        step = len(values) / width
+        chunks = [values[int(i * step):int((i + 1) * step)] for i in range(width)]
+        values = [sum(chunk) / len(chunk) for chunk in chunks]
+    low, high = min(values), max(values)
+    span = high - low or 1
+    return ''.join(SPARK_BARS[int((v - low) / span * (len(SPARK_BARS) - 1))] for v in values)
+
+
+class FxHistory:
+    """
+    Daily exchange-rate snapshots stored compactly in Postgres.
+
+    Each day is one fx_history row holding the base currency and a packed float8
+    array of rates. fx_currencies maps every currency code to its 1-based position
+    in that array, so a new currency only appends a position and old rows stay
+    valid. Charts read just the two array elements they need for a date range.
+
+    Attributes:
+        rates (FxRates): Fetches snapshots from the upstream API
+        positions (dict): Currency code to array position
+    """
+
+    def __init__(self, bot, rates):
+        self.bot = bot
+        self.rates = rates
+        self.positions = {}
+
+    async def load(self):
+        """Loads the currency positions from the database."""
+        async def fetch_currencies(conn):
+            return await conn.fetch("SELECT idx, code FROM fx_currencies")
+
+        rows = await self.bot.execute_db_operation(fetch_currencies)
+        self.positions = {row['code']: row['idx'] for row in rows}
+
+    async def _register(self, codes):
+        new_codes = sorted(set(codes) - set(self.positions))
+        if not new_codes:
+            return
+
+        async def add_currencies(conn):
+            for code in new_codes:
+                # A concurrent writer may take the same index first, in which case
+                # nothing is inserted; each retry sees the index it committed
+                while await conn.fetchval(
+                    "INSERT INTO fx_currencies (idx, code) "
+                    "SELECT COALESCE(MAX(idx), 0) + 1, $1 FROM fx_currencies "
+                    "ON CONFLICT DO NOTHING RETURNING idx",
+                    code
+                ) is None:
+                    if await conn.fetchval("SELECT 1 FROM fx_currencies WHERE code = $1", code):
+                        break
+            return await conn.fetch("SELECT idx, code FROM fx_currencies")
+
+        rows = await self.bot.execute_db_operation(add_currencies)
+        self.positions = {row['code']: row['idx'] for row in rows}
+
+    def pack(self, table):
+        packed = [None] * max(self.positions.values(), default=0)
+        for code, rate in table.rates.items():
+            position = self.positions.get(code)
+            if position is not None:
+                packed[position - 1] = float(rate)
+        return packed
+
+    def unpack(self, day, base, packed):
+        codes = {idx: code for code, idx in self.positions.items()}
+        rates = {codes[i + 1]: Decimal(str(rate)) for i, rate in enumerate(packed)
+                 if rate is not None and i + 1 in codes}
+        return RateTable(base, day.isoformat(), rates)
+
+    async def store(self, tables):
+        """Writes a batch of tables in one transaction, replacing rows for the same dates."""
+        if not tables:
+            return
+        await self._register(code for table in tables for code in table.rates)
+        rows = [(date.fromisoformat(table.date), table.base, self.pack(table)) for table in tables]
+
+        async def upsert_rows(conn):
+            await conn.executemany(
+                "INSERT INTO fx_history (day, base, rates) VALUES ($1, $2, $3) "
+                "ON CONFLICT (day) DO UPDATE SET base = $2, rates = $3",
+                rows
+            )
+
+        await self.bot.execute_db_operation(upsert_rows)
+
+    async def ingest(self, table):
+        await self.store([table])
+        logging.info(f"Stored FX snapshot for {table.date}")
+
+    async def fetch_snapshot(self, day):
+        """Downloads the table published for a date, or None if there is none."""
+        try:
+            data, _ = await self.rates.fetch(date=day.isoformat())
+        except RuntimeError as e:
+            logging.warning(f"No FX snapshot for {day}: {e}")
+            return None
+        return RateTable.from_upstream(self.rates.base, data)
+
+    async def missing_days(self, start, end):
+        async def fetch_days(conn):
+            return await conn.fetch("SELECT day FROM fx_history WHERE day BETWEEN $1 AND $2", start, end)
+
+        stored = {row['day'] for row in await self.bot.execute_db_operation(fetch_days)}
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)
+                if start + timedelta(days=i) not in stored]
+
+    async def backfill(self, start, end, *, batch_size=30, concurrency=6):
+        """
+        Fetches and stores every missing day between start and end.
+
+        Days are downloaded concurrently and written batch_size at a time, one
+        transaction per batch, so a long backfill costs few round trips and a
+        failure only loses the batch in progress.
+
+        Returns:
+            int: Number of days stored
+        """
+        days = await self.missing_days(start, end)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(day):
+            async with semaphore:
+                return await self.fetch_snapshot(day)
+
+        stored = 0
+        for i in range(0, len(days), batch_size):
+            tables = [t for t in await asyncio.gather(*(fetch(day) for day in days[i:i + batch_size])) if t]
+            # Mirrors answer unknown dates with the latest table, keep one row per real date
+            tables = list({table.date: table for table in tables}.values())
+            await self.store(tables)
+            stored += len(tables)
+        if days:
+            logging.info(f"Backfilled {stored} of {len(days)} missing FX days between {start} and {end}")
+        return stored
+
+    async def table_on(self, day, max_gap=7):
+        """Returns the snapshot for day, or the closest earlier one within max_gap days."""
+        async def fetch_row(conn):
+            return await conn.fetchrow(
+                "SELECT day, base, rates FROM fx_history WHERE day <= $1 AND day > $2 ORDER BY day DESC LIMIT 1",
+                day, day - timedelta(days=max_gap)
+            )
+
+        row = await self.bot.execute_db_operation(fetch_row)
+        if row is None:
+            return None
+        return self.unpack(row['day'], row['base'], row['rates'])
+
+    async def series(self, source, target, start, end):
+        """
+        Returns [(day, rate)] for source→target between start and end.
+
+        Raises:
+            KeyError: If either currency has never been stored
+        """
+        source_idx, target_idx = self.positions[source], self.positions[target]
+
+        async def fetch_series(conn):
+            return await conn.fetch(
+                "SELECT day, rates[$1] AS source, rates[$2] AS target FROM fx_history "
+                "WHERE day BETWEEN $3 AND $4 ORDER BY day",
+                source_idx, target_idx, start, end
+            )
+
+        rows = await self.bot.execute_db_operation(fetch_series)
+        return [(row['day'], row['target'] / row['source']) for row in rows
+                if row['source'] and row['target'] is not None]
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+
+import aiohttp
+
+# fawazahmed0/currency-api mirrors, tried in order. {date} is 'latest' or YYYY-MM-DD.
+RATE_URLS = [
+    "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@{date}/v1/currencies/{base}.json",
+    "https://{date}.currency-api.pages.dev/v1/currencies/{base}.json",
+]
+CACHE_PATH = "/app/data/fx_rates.json"
+
+
+def rate_urls_from_env():
+    """
+    Returns the mirror URL templates, overridden by FX_API_URL when it is set.
+
+    FX_API_URL holds one or more comma-separated templates with {date} and {base}
+    placeholders, such as a local stand-in for testing.
+    """
+    override = os.getenv('FX_API_URL')
+    if not override:
+        return RATE_URLS
+    return [url.strip() for url in override.split(',') if url.strip()]
+
+
+def parse_amount(amount_str):
+    """
+    Parses an amount written with either comma or period as the decimal separator.
+
+    '1,000.50', '1.000,50', '1000,5' and '1,000,000' are all understood.
+
+    Raises:
+        InvalidOperation: If the result is not a number
+    """
+    # First, determine if it's using comma or period as decimal separator
+    if ',' in amount_str and '.' in amount_str:
+        # If both separators are present, the last one is the decimal separator
+        if amount_str.rindex(',') > amount_str.rindex('.'):
+            # European format (1.000,00)
+            amount_str = amount_str.replace('.', '').replace(',', '.')
+        else:
+            # US/UK format (1,000.00)
+            amount_str = amount_str.replace(',', '')
+    elif ',' in amount_str:
+        # If only comma is present, check if it's used as decimal or thousands separator
+        if amount_str.count(',') == 1 and len(amount_str.split(',')[1]) <= 2:
+            # Likely a decimal separator (e.g., 1000,50)
+            amount_str = amount_str.replace(',', '.')
+        else:
+            # Likely thousands separators (e.g., 1,000,000)
+            amount_str = amount_str.replace(',', '')
+    elif amount_str.count('.') > 1:
+        # Several periods can only be thousands separators (e.g., 1.000.000)
+        amount_str = amount_str.replace('.', '')
+    return Decimal(amount_str)
+
+
+# An amount with optional thousands groups and decimals, as understood by parse_amount
+AMOUNT_PATTERN = r'\d+(?:[.,]\d{3})*(?:[.,]\d+)?'
+
+CURRENCY_SYMBOLS = {
+    'US$': 'usd', 'S$': 'sgd', 'HK$': 'hkd', 'C$': 'cad', 'A$': 'aud', 'NZ$': 'nzd',
+    'RM': 'myr', 'Rp': 'idr', '$': 'usd', '€': 'eur', '£': 'gbp', '¥': 'jpy', '₹': 'inr',
+    '₩': 'krw', '₱': 'php', '฿': 'thb', '₫': 'vnd', '₺': 'try', '₽': 'rub',
+}
+_SYMBOLS = '|'.join(re.escape(s) for s in sorted(CURRENCY_SYMBOLS, key=len, reverse=True))
+_TRAILING_SYMBOLS = '|'.join(re.escape(s) for s in CURRENCY_SYMBOLS if len(s) == 1)
+
+# One pass finds '€1.200,50', 'S$ 20', '50 SGD', '50€' and 'SGD 50'. Codes after an
+# amount may be lowercase; a code before one must be uppercase so words are not read as codes.
+CURRENCY_MENTION_PATTERN = re.compile(
+    rf'(?<![\w$])(?P<symbol>{_SYMBOLS})\s?(?P<symbol_amount>{AMOUNT_PATTERN})(?![\w.,]?\d)'
+    rf'|(?<![\w.,])(?P<amount>{AMOUNT_PATTERN})\s?(?:(?P<code>[A-Za-z]{{3}})(?![A-Za-z])|(?P<trailing>{_TRAILING_SYMBOLS}))'
+    rf'|(?<![A-Za-z])(?P<prefix_code>[A-Z]{{3}})\s?(?P<prefix_amount>{AMOUNT_PATTERN})(?![\w.,]?\d)'
+)
+
+_DIGIT = re.compile(r'\d')
+
+# ISO codes that are also common lowercase words, only taken as currencies when uppercase
+WORD_CODES = frozenset({'all', 'bob', 'cup', 'mad', 'mop', 'pen', 'sos', 'top', 'try', 'gel', 'ron', 'cat', 'dot', 'one'})
+
+
+def find_currency_mentions(content, known, limit=5):
+    """
+    Returns up to limit (amount, currency) pairs mentioned in a message.
+
+    Args:
+        content (str): Message text
+        known: Container of lowercase currency codes to accept, such as a RateTable
+        limit (int): Maximum number of mentions returned
+    """
+    # Every mention has a digit; most chat messages have none and stop here
+    if not _DIGIT.search(content):
+        return []
+    found = {}
+    for match in CURRENCY_MENTION_PATTERN.finditer(content):
+        symbol, code = match.group('symbol') or match.group('trailing'), match.group('code') or match.group('prefix_code')
+        if symbol:
+            currency = CURRENCY_SYMBOLS[symbol]
+        elif code.islower() and code in WORD_CODES:
+            continue
+        else:
+            currency = code.lower()
+        if currency not in known:
+            continue
+        try:
+            amount = parse_amount(match.group('symbol_amount') or match.group('amount') or match.group('prefix_amount'))
+        except InvalidOperation:
+            continue
+        found.setdefault((amount, currency), None)
+        if len(found) >= limit:
+            break
+    return list(found)
+
+
+class RateTable:
+    """
+    Exchange rates of every currency against one base currency on one date.
+
+    Any pair is derived by triangulating through the base: source→target is
+    rates[target] / rates[source].
+    """
+    __slots__ = ('base', 'date', 'rates')
+
+    def __init__(self, base, date, rates):
+        self.base = base
+        self.date = date
+        self.rates = rates
+
+    def __contains__(self, currency):
+        return currency in self.rates
+
+    @classmethod
+    def from_upstream(cls, base, data):
+        rates = {}
+        for currency, value in data[base].items():
+            try:
+                rate = Decimal(str(value))
+            except InvalidOperation:
+                continue
+            if rate > 0:
+                rates[currency] = rate
+        rates[base] = Decimal(1)
+        return cls(base, data.get('date', 'Unknown date'), rates)
+
+    def to_upstream(self):
+        return {'date': self.date, self.base: {currency: str(rate) for currency, rate in self.rates.items()}}
+
+    def rate(self, source, target):
+        """Returns the rate from source to target, or None if either currency is unknown."""
+        source_rate = self.rates.get(source)
+        target_rate = self.rates.get(target)
+        if source_rate is None or target_rate is None:
+            return None
+        return target_rate / source_rate
+
+    def convert(self, amount, source, target):
+        rate = self.rate(source, target)
+        return None if rate is None else amount * rate
+
+    def matrix(self, amounts, source, targets):
+        """
+        Converts every amount into every target in one pass.
+
+        Each cross rate is derived once, so the work is one multiplication per cell.
+
+        Returns:
+            list[list[Decimal]]: One row per amount, one column per target
+        """
+        rates = [self.rate(source, target) for target in targets]
+        return [[amount * rate for rate in rates] for amount in amounts]
+
+
+class FxRates:
+    """
+    Latest exchange-rate table, kept in memory and on disk.
+
+    One table against the base currency is downloaded per upstream update and
+    every pair is triangulated from it, so conversions need no network I/O.
+    The upstream publishes once a day: refresh() skips the request until the
+    table is from an earlier UTC day, and then sends the previous ETag so an
+    unchanged table costs a 304.
+
+    Attributes:
+        base (str): Base currency of the stored table
+        table (RateTable): Current table, or None before the first load
+    """
+
+    def __init__(self, *, base='eur', urls=None, cache_path=CACHE_PATH, check_interval=3600.0, timeout=10.0):
+        self.base = base
+        self.urls = urls or rate_urls_from_env()
+        self.cache_path = cache_path
+        self.check_interval = check_interval
+        self.timeout = timeout
+        self.table = None
+        self._etag = None
+        self._checked_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def load(self):
+        """Loads the last saved table from disk. Returns whether one was found."""
+        try:
+            with open(self.cache_path, 'r') as cache_file:
+                saved = json.load(cache_file)
+            self.table = RateTable.from_upstream(self.base, saved['table'])
+            self._etag = saved.get('etag')
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Ignoring unreadable FX cache at {self.cache_path}: {e}")
+            return False
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w') as cache_file:
+                json.dump({'etag': self._etag, 'table': self.table.to_upstream()}, cache_file)
+        except OSError as e:
+            logging.warning(f"Failed to save FX cache: {e}")
+
+    def is_current(self):
+        today = datetime.now(timezone.utc).date().isoformat()
+        return self.table is not None and self.table.date >= today
+
+    async def fetch(self, date='latest', etag=None):
+        """
+        Downloads the table for a date from the first mirror that answers.
+
+        Returns:
+            tuple[dict | None, str | None]: The upstream JSON, or None if unchanged
+            since etag, and the response's ETag
+        """
+        headers = {'If-None-Match': etag} if etag else {}
+        errors = []
+        for template in self.urls:
+            url = template.format(date=date, base=self.base)
+            try:
+                async with self._get_session().get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return None, etag
+                    if response.status != 200:
+                        errors.append(f"{url}: HTTP {response.status}")
+                        continue
+                    return await response.json(content_type=None), response.headers.get('ETag')
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                errors.append(f"{url}: {e}")
+        raise RuntimeError("All FX mirrors failed (" + "; ".join(errors) + ")")
+
+    async def refresh(self, *, force=False):
+        """
+        Fetches a newer table if the current one is out of date.
+
+        Returns:
+            bool: Whether the table changed
+        """
+        async with self._refresh_lock:
+            if not force and (self.is_current() or time.monotonic() - self._checked_at < self.check_interval):
+                return False
+            self._checked_at = time.monotonic()
+
+            try:
+                data, etag = await self.fetch(etag=None if force or self.table is None else self._etag)
+            except RuntimeError as e:
+                logging.warning(f"Failed to refresh FX rates, keeping current table: {e}")
+                return False
+            if data is None or (self.table is not None and data.get('date') == self.table.date):
+                return False
+
+            self.table = RateTable.from_upstream(self.base, data)
+            self._etag = etag
+            self._save()
+            logging.info(f"FX rates refreshed for {self.table.date} ({len(self.table.rates)} currencies)")
+            return True
+
+    async def get_table(self):
+        """Returns the current table, fetching it only if none has ever been loaded."""
+        if self.table is None:
+            await self.refresh(force=True)
+        return self.table
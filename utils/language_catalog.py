@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+import time
+
+from utils.__language_data import ADDITIONAL_LANGUAGE_NAMES, GOOGLE_LANGUAGE_NAMES
+
+CATALOG_PATH = "/app/data/language_catalog.json"
+REFRESH_INTERVAL = 24 * 3600.0
+
+_names = {}
+_refreshed_at = 0.0
+_version = 0
+
+
+def _build(provider_names):
+    names = dict(provider_names)
+    names.update(ADDITIONAL_LANGUAGE_NAMES)
+    return names
+
+
+def _load():
+    """Builds the catalog from the bundled snapshot and the last refreshed copy on disk."""
+    global _names, _refreshed_at
+    provider_names = GOOGLE_LANGUAGE_NAMES
+    try:
+        with open(CATALOG_PATH, 'r') as catalog_file:
+            provider_names = {**GOOGLE_LANGUAGE_NAMES, **json.load(catalog_file)}
+        _refreshed_at = os.path.getmtime(CATALOG_PATH)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable language catalog at {CATALOG_PATH}: {e}")
+    _names = _build(provider_names)
+
+
+def get_language_names():
+    """Returns a dict of language code to English name. Never touches the network."""
+    return _names
+
+
+def catalog_version():
+    """Returns a number that changes whenever the catalog is refreshed."""
+    return _version
+
+
+async def refresh(client, *, force=False):
+    """
+    Refreshes the catalog from the translation provider if it is more than a day old.
+
+    Args:
+        client (GoogleTranslateClient): Client used to fetch the provider's language list
+        force (bool): Refresh even if the catalog is recent
+
+    Returns:
+        bool: Whether the catalog was refreshed
+    """
+    global _names, _refreshed_at, _version
+    if not force and time.time() - _refreshed_at < REFRESH_INTERVAL:
+        return False
+
+    try:
+        provider_names = await client.supported_languages()
+    except Exception as e:
+        logging.warning(f"Failed to refresh language catalog, keeping current copy: {e}")
+        return False
+
+    _names = _build({**GOOGLE_LANGUAGE_NAMES, **provider_names})
+    _refreshed_at = time.time()
+    _version += 1
+
+    try:
+        os.makedirs(os.path.dirname(CATALOG_PATH), exist_ok=True)
+        with open(CATALOG_PATH, 'w') as catalog_file:
+            json.dump(provider_names, catalog_file)
+    except OSError as e:
+        logging.warning(f"Failed to save language catalog: {e}")
+
+    logging.info(f"Language catalog refreshed with {len(provider_names)} provider languages")
+    return True
+
+
+_load()
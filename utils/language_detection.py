@@ -0,0 +1,119 @@
+import asyncio
+import logging
+
+from langdetect import DetectorFactory, detect
+from langdetect.detector_factory import init_factory
+
+from utils.cache import TTLCache
+from utils.translation_cache import text_hash
+
+# langdetect is randomized unless seeded, which made the same message detect differently between calls
+DetectorFactory.seed = 0
+
+_detected = TTLCache(maxsize=8192, ttl=24 * 3600.0)
+
+_UKRAINIAN = set('іїєґ')
+_BELARUSIAN = set('ў')
+_MACEDONIAN = set('ѓќѕ')
+_SERBIAN = set('ђћџљњј')
+_URDU = set('ٹڈڑںےھ')
+_PERSIAN = set('پچژگک')
+
+
+def _script_of(char):
+    code = ord(char)
+    if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF or 0xFF66 <= code <= 0xFF9F:
+        return 'kana'
+    if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return 'hangul'
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+        return 'han'
+    if 0x0400 <= code <= 0x04FF:
+        return 'cyrillic'
+    if 0x0600 <= code <= 0x06FF or 0x0750 <= code <= 0x077F or 0xFB50 <= code <= 0xFDFF or 0xFE70 <= code <= 0xFEFF:
+        return 'arabic'
+    if 0x0E00 <= code <= 0x0E7F:
+        return 'thai'
+    if 0x0370 <= code <= 0x03FF:
+        return 'greek'
+    if 0x0590 <= code <= 0x05FF:
+        return 'hebrew'
+    return 'other'
+
+
+def detect_script(text):
+    """
+    Detects the language of text written in a script that identifies it on its own.
+
+    Returns a langdetect-style language code, or None when the text is mostly in a
+    script shared by many languages (such as Latin) and needs statistical detection.
+    """
+    counts = {}
+    letters = []
+    for char in text:
+        if char.isalpha():
+            script = _script_of(char)
+            counts[script] = counts.get(script, 0) + 1
+            if script != 'other':
+                letters.append(char)
+
+    total = sum(counts.values())
+    if not total or counts.get('other', 0) * 2 >= total:
+        return None
+
+    if counts.get('kana'):
+        return 'ja'
+    script = max(counts, key=counts.get)
+    chars = set(letters)
+
+    if script == 'hangul':
+        return 'ko'
+    if script == 'han':
+        # GB2312 only contains simplified characters, so traditional text fails to encode
+        try:
+            ''.join(c for c in letters if _script_of(c) == 'han').encode('gb2312')
+            return 'zh-cn'
+        except UnicodeEncodeError:
+            return 'zh-tw'
+    if script == 'cyrillic':
+        if chars & _UKRAINIAN:
+            return 'uk'
+        if chars & _BELARUSIAN:
+            return 'be'
+        if chars & _MACEDONIAN:
+            return 'mk'
+        if chars & _SERBIAN:
+            return 'sr'
+        if 'ъ' in chars and not chars & {'ы', 'э'}:
+            return 'bg'
+        return 'ru'
+    if script == 'arabic':
+        if chars & _URDU:
+            return 'ur'
+        if chars & _PERSIAN:
+            return 'fa'
+        return 'ar'
+    return {'thai': 'th', 'greek': 'el', 'hebrew': 'he'}.get(script)
+
+
+def detect_language(text):
+    """Detects the language of text, memoized by text hash."""
+    key = text_hash(text)
+    language = _detected.get(key)
+    if language is None:
+        language = detect_script(text) or detect(text)
+        _detected.set(key, language)
+    return language
+
+
+def warm_up():
+    """Loads langdetect's language profiles, which otherwise happens on the first detection."""
+    init_factory()
+
+
+async def warm_up_in_background():
+    try:
+        await asyncio.to_thread(warm_up)
+        logging.info("Language detector profiles loaded")
+    except Exception as e:
+        logging.warning(f"Failed to warm up language detector: {e}")
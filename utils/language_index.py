@@ -0,0 +1,139 @@
+import bisect
+import unicodedata
+
+from utils.__language_data import (ADDITIONAL_LANGUAGE_NAMES, GOOGLE_LANGUAGE_NAMES,
+                                   LANG_CODE_MAP, LANGUAGE_EMOJI_MAP, NATIVE_LANGUAGE_NAMES)
+
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+
+def fold(text):
+    """Lowercases text and strips accents so 'Français' matches 'francais'."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LanguageIndex:
+    """
+    Search index over language codes, English names, native names and aliases.
+
+    Built once from static data. Every searchable term, and every word inside a
+    multi-word term, goes into a sorted list for prefix lookups by bisection, and
+    each term's trigrams go into an inverted index for typo-tolerant matches.
+    Lookups touch only the terms sharing a prefix or trigram with the query.
+
+    Attributes:
+        names (dict): Language code to English name
+        native_names (dict): Language code to native name
+    """
+
+    def __init__(self, names, native_names, aliases, popular=()):
+        self.names = names
+        self.native_names = native_names
+        popular = [code for code in popular if code in names]
+        self._default = popular + sorted(set(names) - set(popular), key=names.get)
+        self._terms = {}
+        for code, name in names.items():
+            for term in (code, name, native_names.get(code, '')):
+                if term:
+                    self._terms.setdefault(fold(term), set()).add(code)
+        for alias, code in aliases.items():
+            if code in names:
+                self._terms.setdefault(fold(alias), set()).add(code)
+
+        self._prefixes = sorted(
+            (key, term)
+            for term in self._terms
+            for key in {term, *term.replace('(', ' ').replace(')', ' ').split()}
+        )
+        self._prefix_keys = [key for key, _ in self._prefixes]
+
+        self._trigrams = {}
+        self._term_trigrams = {}
+        for term in self._terms:
+            grams = trigrams(term)
+            self._term_trigrams[term] = grams
+            for gram in grams:
+                self._trigrams.setdefault(gram, []).append(term)
+
+    def label(self, code):
+        """Returns the display label for a code, such as 'Japanese · 日本語 (ja)'."""
+        name = self.names.get(code, code)
+        native = self.native_names.get(code)
+        if native and native != name:
+            return f"{name} · {native} ({code})"
+        return f"{name} ({code})"
+
+    def resolve(self, value):
+        """Returns the code for an exact code, name or alias, or None."""
+        if value in self.names:
+            return value
+        codes = self._terms.get(fold(value))
+        if codes and len(codes) == 1:
+            return next(iter(codes))
+        return None
+
+    def search(self, query, limit=MAX_CHOICES):
+        """
+        Returns up to limit language codes matching query, best first.
+
+        Exact matches rank first, then prefix matches of a whole term, then prefix
+        matches of a word inside a term, then fuzzy trigram matches.
+        """
+        query = fold(query)
+        if not query:
+            return self._default[:limit]
+
+        scores = {}
+
+        def add(codes, score):
+            for code in codes:
+                if score > scores.get(code, 0.0):
+                    scores[code] = score
+
+        add(self._terms.get(query, ()), 4.0)
+
+        start = bisect.bisect_left(self._prefix_keys, query)
+        for key, term in self._prefixes[start:]:
+            if not key.startswith(query):
+                break
+            # Shorter terms are closer to what was typed
+            closeness = len(query) / len(term)
+            add(self._terms[term], (3.0 if key == term else 2.0) + closeness)
+
+        if len(scores) < limit and len(query) >= 3:
+            query_grams = trigrams(query)
+            shared = {}
+            for gram in query_grams:
+                for term in self._trigrams.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            for term, count in shared.items():
+                similarity = count / (len(query_grams) + len(self._term_trigrams[term]) - count)
+                if similarity >= 0.3:
+                    add(self._terms[term], similarity)
+
+        ranked = sorted(scores, key=lambda code: (-scores[code], self.names[code]))
+        return ranked[:limit]
+
+
+def _build_index():
+    names = {**GOOGLE_LANGUAGE_NAMES, **ADDITIONAL_LANGUAGE_NAMES}
+    # Drop legacy codes such as 'iw' whose current code is listed too
+    names = {code: name for code, name in names.items()
+             if LANG_CODE_MAP.get(code.lower(), code) == code or LANG_CODE_MAP.get(code.lower()) not in names}
+    native_names = {code: NATIVE_LANGUAGE_NAMES.get(code) or NATIVE_LANGUAGE_NAMES.get(LANG_CODE_MAP.get(code.lower(), code))
+                    for code in names}
+
+    canonical = {LANG_CODE_MAP.get(code.lower(), code): code for code in names}
+    canonical.update((code, code) for code in names)
+    aliases = {alias: canonical[target] for alias, target in LANG_CODE_MAP.items() if target in canonical}
+    return LanguageIndex(names, native_names, aliases, popular=sorted(LANGUAGE_EMOJI_MAP, key=lambda code: names.get(code, code)))
+
+
+language_index = _build_index()
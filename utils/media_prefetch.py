@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+
+import instaloader
+from yt_dlp import YoutubeDL
+
+from utils.cache import TTLCache
+from utils.helpers import get_random_user_agent, do_sleep
+
+PREFETCH_SETTING = 'media_prefetch'
+
+# One pass over the message finds every supported link, so messages without links cost a single scan.
+MEDIA_URL_PATTERN = re.compile(
+    r'https?://(?:(?:www|m|vm|vt)\.)?'
+    r'(?:(?P<tiktok>tiktok\.com/[^\s<>]+)'
+    r'|(?P<instagram>instagram\.com/(?:p|reels?|tv)/(?P<shortcode>[\w-]+)/?))',
+    re.IGNORECASE
+)
+
+
+def normalize_media_url(url):
+    """
+    Reduces a media link to the key its post is cached under.
+
+    Drops the query string, fragment and trailing slash, lowercases the scheme and
+    host, and removes a www. or m. prefix, so every way of linking the same post
+    shares one entry.
+    """
+    url = url.split('#', 1)[0].split('?', 1)[0].rstrip('/')
+    scheme, separator, rest = url.partition('://')
+    if not separator:
+        return url
+    host, slash, path = rest.partition('/')
+    host = host.lower()
+    if host.startswith(('www.', 'm.')):
+        host = host.split('.', 1)[1]
+    return f"{scheme.lower()}://{host}{slash}{path}"
+
+
+def find_media_urls(content):
+    """Returns a list of (platform, url) tuples for every supported link in a message."""
+    if '://' not in content:
+        return []
+    found = []
+    for match in MEDIA_URL_PATTERN.finditer(content):
+        platform = 'tiktok' if match.group('tiktok') else 'instagram'
+        found.append((platform, normalize_media_url(match.group(0))))
+    return found
+
+
+def extract_video_info(url):
+    """Resolves a video's metadata and formats with yt-dlp without downloading it."""
+    do_sleep()
+    with YoutubeDL({'format': 'best', 'quiet': True, 'no_warnings': True}) as ydl:
+        return ydl.extract_info(url, download=False)
+
+
+def fetch_instagram_post(url):
+    """Fetches an Instagram post's metadata with instaloader."""
+    match = MEDIA_URL_PATTERN.match(url)
+    if not match or not match.group('shortcode'):
+        raise ValueError(f"Not an Instagram post URL: {url}")
+    loader = instaloader.Instaloader(save_metadata=False, user_agent=get_random_user_agent())
+    do_sleep()
+    return instaloader.Post.from_shortcode(loader.context, match.group('shortcode'))
+
+
+EXTRACTORS = {
+    'tiktok': extract_video_info,
+    'instagram': fetch_instagram_post,
+}
+
+
+class MediaMetadataCache:
+    """
+    Short-lived cache of extracted media metadata, shared by the download commands.
+
+    Entries expire after a few minutes because the CDN URLs inside them are signed
+    and go stale. Extractions that are still running are tracked as futures so a
+    download command can wait for the prefetch instead of starting a second one.
+    """
+
+    def __init__(self, maxsize=256, ttl=600.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._pending = {}
+
+    def is_known(self, url):
+        url = normalize_media_url(url)
+        return url in self._pending or url in self._cache
+
+    def begin(self, url):
+        future = asyncio.get_running_loop().create_future()
+        self._pending[normalize_media_url(url)] = future
+        return future
+
+    def finish(self, url, value=None, error=None):
+        url = normalize_media_url(url)
+        future = self._pending.pop(url, None)
+        if error is None:
+            self._cache.set(url, value)
+        if future is not None and not future.done():
+            future.set_result(value if error is None else None)
+
+    async def get(self, url, timeout=60.0):
+        """Returns cached metadata for url, waiting for an in-flight prefetch if there is one."""
+        url = normalize_media_url(url)
+        future = self._pending.get(url)
+        if future is not None:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._cache.get(url)
+
+
+metadata_cache = MediaMetadataCache()
+
+
+class MediaPrefetcher:
+    """
+    Warms the metadata cache for links posted in opted-in channels.
+
+    A single background worker processes a small bounded queue, so prefetching
+    never competes with more than one extraction at a time. Each channel and the
+    bot as a whole have a sliding-window budget, and links beyond it are ignored.
+    """
+
+    def __init__(self, cache=metadata_cache, *, per_channel=5, channel_window=600.0,
+                 global_limit=60, global_window=3600.0, queue_size=20, delay=2.0):
+        self.cache = cache
+        self.per_channel = per_channel
+        self.channel_window = channel_window
+        self.global_limit = global_limit
+        self.global_window = global_window
+        self.delay = delay
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self._channel_usage = {}
+        self._global_usage = deque()
+        self._worker = None
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        # Queued links were marked pending in submit; release them so commands stop waiting on them
+        while not self.queue.empty():
+            _, url = self.queue.get_nowait()
+            self.cache.finish(url, error=True)
+            self.queue.task_done()
+
+    def _take_budget(self, channel_id):
+        now = time.monotonic()
+        usage = self._channel_usage.setdefault(channel_id, deque())
+        for window, limit, stamps in ((self.channel_window, self.per_channel, usage),
+                                      (self.global_window, self.global_limit, self._global_usage)):
+            while stamps and now - stamps[0] > window:
+                stamps.popleft()
+            if len(stamps) >= limit:
+                return False
+        usage.append(now)
+        self._global_usage.append(now)
+        return True
+
+    def submit(self, channel_id, platform, url):
+        """Queues a link for prefetching. Returns False if it was dropped."""
+        if self.cache.is_known(url) or self.queue.full():
+            return False
+        if not self._take_budget(channel_id):
+            logging.info(f"Prefetch budget exhausted for channel {channel_id}, skipping {url}")
+            return False
+        self.cache.begin(url)
+        self.queue.put_nowait((platform, url))
+        return True
+
+    async def _run(self):
+        while True:
+            platform, url = await self.queue.get()
+            try:
+                # Yield to foreground work before starting the next extraction
+                await asyncio.sleep(self.delay)
+                info = await asyncio.to_thread(EXTRACTORS[platform], url)
+                self.cache.finish(url, info)
+                logging.info(f"Prefetched {platform} metadata for {url}")
+            except asyncio.CancelledError:
+                self.cache.finish(url, error=True)
+                raise
+            except Exception as e:
+                self.cache.finish(url, error=e)
+                logging.warning(f"Prefetch failed for {url}: {e}")
+            finally:
+                self.queue.task_done()
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
+
+from utils.cache import TTLCache
+
+MW_URL = "https://www.merriam-webster.com/dictionary/{word}"
+MW_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                            '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'}
+
+# Only the part-of-speech headings and definition groups are turned into tags,
+# the rest of the page (scripts, navigation, ads) is skipped while parsing
+_DEFINITION_PARTS = SoupStrainer(['h2', 'div'], attrs={'class': ['parts-of-speech', 'vg']})
+
+_parse_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mw-parse")
+
+
+def parse_mw_page(html):
+    """
+    Extracts the definitions from a Merriam-Webster entry page.
+
+    Returns:
+        dict[str, list[str]]: Part of speech to its definitions, in page order
+    """
+    soup = BeautifulSoup(html, 'html.parser', parse_only=_DEFINITION_PARTS)
+    definitions = {}
+    for pos_tag in soup.find_all('h2', class_='parts-of-speech'):
+        part_of_speech = pos_tag.get_text(strip=True)
+        if part_of_speech in definitions:
+            continue
+        definitions[part_of_speech] = []
+        definition_section = pos_tag.find_next('div', class_='vg')
+        if not definition_section:
+            continue
+        for sense in definition_section.find_all('div', class_='sb'):
+            for def_text in sense.find_all('span', class_='dtText'):
+                definition = def_text.get_text().lstrip(": ")
+                if definition:
+                    definitions[part_of_speech].append(definition)
+    return {pos: defs for pos, defs in definitions.items() if defs}
+
+
+class MerriamWebster:
+    """
+    Merriam-Webster lookups that never block the event loop.
+
+    Pages are downloaded with aiohttp under a total timeout, and parsed in a small
+    thread pool under a second timeout. Parsed definitions are cached for a week,
+    and words with no entry for an hour, so repeated lookups skip both steps.
+
+    Attributes:
+        cache (TTLCache): Word to parsed definitions, empty when MW has no entry
+    """
+
+    def __init__(self, *, fetch_timeout=8.0, parse_timeout=5.0, ttl=7 * 24 * 3600, miss_ttl=3600):
+        self.fetch_timeout = fetch_timeout
+        self.parse_timeout = parse_timeout
+        self.miss_ttl = miss_ttl
+        self.cache = TTLCache(maxsize=4096, ttl=ttl)
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=MW_HEADERS, timeout=aiohttp.ClientTimeout(total=self.fetch_timeout)
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def fetch(self, word):
+        """Returns the entry page for word, or None if MW has no entry."""
+        url = MW_URL.format(word=urllib.parse.quote(word))
+        async with self._get_session().get(url) as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            return await response.text()
+
+    async def lookup(self, word):
+        """
+        Returns the definitions of word by part of speech, or None.
+
+        None means MW has no entry or could not be reached in time; only the
+        former is cached.
+        """
+        word = word.strip().lower()
+        cached = self.cache.get(word)
+        if cached is not None:
+            return cached or None
+
+        try:
+            html = await self.fetch(word)
+            if html is None:
+                definitions = {}
+            else:
+                loop = asyncio.get_running_loop()
+                definitions = await asyncio.wait_for(
+                    loop.run_in_executor(_parse_pool, parse_mw_page, html), self.parse_timeout
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning(f"Merriam-Webster lookup for {word!r} failed: {e!r}")
+            return None
+
+        self.cache.set(word, definitions, ttl=None if definitions else self.miss_ttl)
+        return definitions or None
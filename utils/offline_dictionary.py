@@ -0,0 +1,281 @@
+"""
+Offline English dictionary in SQLite, with SymSpell spelling suggestions.
+
+Build the database from the WordNet database files (data.* and index.* from
+WordNet 3.x or Open English WordNet's WNDB release):
+    python -m utils.offline_dictionary path/to/wordnet/dict [--frequencies words.txt] [--out dictionary.sqlite3]
+
+--frequencies takes a 'word count' per line list used to rank suggestions;
+without one, words with more senses rank higher.
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import time
+
+DICTIONARY_PATH = os.getenv('DICTIONARY_PATH', '/app/data/dictionary.sqlite3')
+
+POS_NAMES = {'n': 'noun', 'v': 'verb', 'a': 'adjective', 's': 'adjective', 'r': 'adverb'}
+WORDNET_FILES = {'noun': 'noun', 'verb': 'verb', 'adj': 'adjective', 'adv': 'adverb'}
+
+# WordNet's detachment rules: inflected suffix to the base form's suffix
+MORPHY_RULES = {
+    'noun': [('s', ''), ('ses', 's'), ('xes', 'x'), ('zes', 'z'), ('ches', 'ch'), ('shes', 'sh'),
+             ('men', 'man'), ('ies', 'y')],
+    'verb': [('s', ''), ('ies', 'y'), ('es', 'e'), ('es', ''), ('ed', 'e'), ('ed', ''), ('ing', 'e'), ('ing', '')],
+    'adjective': [('er', ''), ('est', ''), ('er', 'e'), ('est', 'e')],
+}
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+SCHEMA = """
+    CREATE TABLE words (id INTEGER PRIMARY KEY, word TEXT NOT NULL UNIQUE, frequency INTEGER NOT NULL);
+    CREATE TABLE entries (
+        word TEXT NOT NULL, sense INTEGER NOT NULL, pos TEXT NOT NULL, definition TEXT NOT NULL,
+        PRIMARY KEY (word, sense)
+    ) WITHOUT ROWID;
+    CREATE TABLE forms (form TEXT NOT NULL, lemma TEXT NOT NULL, PRIMARY KEY (form, lemma)) WITHOUT ROWID;
+    CREATE TABLE deletes (key TEXT NOT NULL, word_id INTEGER NOT NULL, PRIMARY KEY (key, word_id)) WITHOUT ROWID;
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def deletes(word, max_distance=MAX_EDIT_DISTANCE, prefix_length=PREFIX_LENGTH):
+    """Returns the word's prefix and every string made by deleting up to max_distance characters from it."""
+    prefix = word[:prefix_length]
+    found = {prefix}
+    frontier = {prefix}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance between a and b, allowing adjacent transpositions.
+
+    Shared prefixes and suffixes are skipped and only cells within max_distance of
+    the diagonal are computed. Returns max_distance + 1 as soon as the distance
+    is known to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return max(len(a), len(b))
+
+    worse = max_distance + 1
+    previous2 = None
+    previous = [j if j <= max_distance else worse for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [worse] * (len(b) + 1)
+        if i <= max_distance:
+            current[0] = i
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > max_distance:
+            return worse
+        previous2, previous = previous, current
+    return min(previous[-1], worse)
+
+
+class OfflineDictionary:
+    """
+    Read-only English dictionary stored in a local SQLite file.
+
+    Entries are keyed by word, so a lookup is one index probe, fast enough to
+    run on the event loop. Inflected forms are reduced to their lemma with
+    WordNet's exception lists and suffix rules. On a miss, suggest() runs a
+    SymSpell lookup: every dictionary word was stored under the strings made by
+    deleting up to two characters from its prefix, so candidates for a typo are
+    the words sharing one of the typo's own deletes, found in a single query
+    and ranked by edit distance and frequency.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        self.max_distance = int(meta.get('max_distance', MAX_EDIT_DISTANCE))
+        self.prefix_length = int(meta.get('prefix_length', PREFIX_LENGTH))
+        self.source = meta.get('source', 'WordNet')
+
+    @classmethod
+    def open(cls, path=DICTIONARY_PATH):
+        """Returns the dictionary at path, or None if it has not been built."""
+        if not os.path.exists(path):
+            return None
+        try:
+            dictionary = cls(path)
+        except sqlite3.Error as e:
+            logging.warning(f"Ignoring unreadable offline dictionary at {path}: {e}")
+            return None
+        logging.info(f"Loaded offline dictionary from {path}")
+        return dictionary
+
+    def close(self):
+        self._db.close()
+
+    def __contains__(self, word):
+        return self._db.execute("SELECT 1 FROM entries WHERE word = ? LIMIT 1", (word,)).fetchone() is not None
+
+    def lemmas(self, word):
+        """Returns the dictionary words that word may be a form of, itself first."""
+        candidates = [word]
+        candidates += [row[0] for row in self._db.execute("SELECT lemma FROM forms WHERE form = ?", (word,))]
+        for rules in MORPHY_RULES.values():
+            for suffix, ending in rules:
+                if word.endswith(suffix) and len(word) > len(suffix):
+                    candidates.append(word[:-len(suffix)] + ending)
+        return [w for w in dict.fromkeys(candidates) if w in self]
+
+    def lookup(self, word):
+        """
+        Returns (lemma, {part_of_speech: [definitions]}) for word, or None.
+        """
+        word = word.strip().lower()
+        lemmas = self.lemmas(word)
+        if not lemmas:
+            return None
+        definitions = {}
+        for pos, definition in self._db.execute(
+            "SELECT pos, definition FROM entries WHERE word = ? ORDER BY sense", (lemmas[0],)
+        ):
+            definitions.setdefault(pos, []).append(definition)
+        return lemmas[0], definitions
+
+    def suggest(self, word, limit=5):
+        """Returns up to limit dictionary words within the maximum edit distance of word, closest first."""
+        word = word.strip().lower()
+        keys = list(deletes(word, self.max_distance, self.prefix_length))
+        rows = self._db.execute(
+            f"SELECT DISTINCT w.word, w.frequency FROM deletes d JOIN words w ON w.id = d.word_id "
+            f"WHERE d.key IN ({','.join('?' * len(keys))})",
+            keys
+        ).fetchall()
+        ranked = []
+        for candidate, frequency in rows:
+            distance = edit_distance(word, candidate, self.max_distance)
+            if 0 < distance <= self.max_distance:
+                ranked.append((distance, -frequency, candidate))
+        ranked.sort()
+        return [candidate for _, _, candidate in ranked[:limit]]
+
+
+def read_wordnet(directory):
+    """
+    Reads WordNet's data.* and index.* files.
+
+    Returns:
+        tuple[dict, dict]: lemma to [(pos, definition)] in WordNet's sense order,
+        and inflected form to [lemma] from the *.exc exception lists
+    """
+    senses = {}
+    forms = {}
+    for suffix, pos in WORDNET_FILES.items():
+        glosses = {}
+        with open(os.path.join(directory, f"data.{suffix}"), encoding='utf-8') as data:
+            for line in data:
+                if line.startswith(' '):
+                    continue
+                fields, _, gloss = line.partition(' | ')
+                # The definition comes before any quoted examples
+                definition = gloss.split('; "')[0].strip().rstrip(';')
+                glosses[fields.split(' ', 1)[0]] = definition
+
+        with open(os.path.join(directory, f"index.{suffix}"), encoding='utf-8') as index:
+            for line in index:
+                if line.startswith(' '):
+                    continue
+                fields = line.split()
+                lemma = fields[0].replace('_', ' ')
+                synset_count, pointer_count = int(fields[2]), int(fields[3])
+                offsets = fields[6 + pointer_count:6 + pointer_count + synset_count]
+                senses.setdefault(lemma, []).extend((pos, glosses[o]) for o in offsets if o in glosses)
+
+        exceptions_path = os.path.join(directory, f"{suffix}.exc")
+        if os.path.exists(exceptions_path):
+            with open(exceptions_path, encoding='utf-8') as exceptions:
+                for line in exceptions:
+                    form, *lemmas = line.split()
+                    forms.setdefault(form.replace('_', ' '), []).extend(l.replace('_', ' ') for l in lemmas)
+    return senses, forms
+
+
+def read_frequencies(path):
+    frequencies = {}
+    with open(path, encoding='utf-8') as counts:
+        for line in counts:
+            parts = line.split()
+            if len(parts) >= 2 and parts[-1].isdigit():
+                frequencies[' '.join(parts[:-1]).lower()] = int(parts[-1])
+    return frequencies
+
+
+def build(wordnet_dir, out_path, frequencies_path=None):
+    """Builds the dictionary database at out_path from the WordNet files in wordnet_dir."""
+    start = time.perf_counter()
+    senses, forms = read_wordnet(wordnet_dir)
+    frequencies = read_frequencies(frequencies_path) if frequencies_path else {}
+
+    tmp_path = f"{out_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = sqlite3.connect(tmp_path)
+    db.executescript(SCHEMA)
+    with db:
+        db.executemany(
+            "INSERT INTO entries (word, sense, pos, definition) VALUES (?, ?, ?, ?)",
+            ((lemma, i, pos, definition) for lemma, entries in senses.items() for i, (pos, definition) in enumerate(entries))
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO forms (form, lemma) VALUES (?, ?)",
+            ((form, lemma) for form, lemmas in forms.items() for lemma in lemmas if lemma in senses)
+        )
+        # Only single words are suggested; phrases are looked up exactly
+        words = sorted(w for w in senses if w.replace('-', '').replace("'", '').isalpha())
+        db.executemany(
+            "INSERT INTO words (id, word, frequency) VALUES (?, ?, ?)",
+            ((i, w, frequencies.get(w, len(senses[w]))) for i, w in enumerate(words))
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO deletes (key, word_id) VALUES (?, ?)",
+            ((key, i) for i, w in enumerate(words) for key in deletes(w))
+        )
+        db.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [('max_distance', str(MAX_EDIT_DISTANCE)), ('prefix_length', str(PREFIX_LENGTH)), ('source', 'WordNet')]
+        )
+    db.execute("VACUUM")
+    db.close()
+    os.replace(tmp_path, out_path)
+    print(f"Built {out_path}: {len(senses)} entries, {len(words)} suggestable words "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline dictionary database from WordNet.")
+    parser.add_argument('wordnet_dir', help="Directory with WordNet's data.*, index.* and *.exc files")
+    parser.add_argument('--frequencies', help="Optional 'word count' per line list for ranking suggestions")
+    parser.add_argument('--out', default=DICTIONARY_PATH, help="Database to write")
+    args = parser.parse_args()
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    build(args.wordnet_dir, args.out, args.frequencies)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,72 +1,404 @@
+import asyncio
+import inspect
+import time
+
 from discord.ui import View, Button
 import discord
 
+from utils.cache import TTLCache
+from utils.timer_wheel import WheelView, timer_wheel
+
+
+class PageSource:
+    """
+    Produces a paginator's pages on demand.
+
+    Wraps a list of pages, a sync or async callable taking a page index, or a
+    sync or async iterator. Pages from a callable are kept in a small cache and
+    concurrent requests for the same page share one call; pages from an
+    iterator are kept once produced, since it cannot be rewound. The total may
+    be unknown: a callable returning None, or an exhausted iterator, marks the end.
+
+    Attributes:
+        total (int | None): Number of pages, or None while unknown
+    """
+
+    def __init__(self, pages, *, total=None, cache_size=8):
+        self.total = total
+        self._list = None
+        self._call = None
+        self._iterator = None
+        self._produced = None
+        if isinstance(pages, (list, tuple)):
+            self._list = list(pages)
+            self.total = len(self._list)
+        elif hasattr(pages, '__aiter__') or hasattr(pages, '__iter__'):
+            self._iterator = pages.__aiter__() if hasattr(pages, '__aiter__') else iter(pages)
+            self._produced = []
+            self._lock = asyncio.Lock()
+        elif callable(pages):
+            self._call = pages
+            self._cache = TTLCache(maxsize=cache_size, ttl=float('inf'))
+            self._pending = {}
+        else:
+            raise TypeError(f"Cannot paginate {type(pages).__name__}")
+
+    def peek(self, index):
+        """Returns the page at index if it is ready without producing anything, else None."""
+        if self._list is not None:
+            return self._list[index] if 0 <= index < len(self._list) else None
+        if self._produced is not None:
+            return self._produced[index] if 0 <= index < len(self._produced) else None
+        return self._cache.get(index, count=False)
+
+    async def get(self, index):
+        """Returns the page at index, or None if the source has no such page."""
+        if index < 0 or (self.total is not None and index >= self.total):
+            return None
+        page = self.peek(index)
+        if page is not None:
+            return page
+        if self._produced is not None:
+            return await self._advance(index)
+
+        task = self._pending.get(index)
+        if task is None:
+            task = asyncio.ensure_future(self._produce(index))
+            self._pending[index] = task
+            task.add_done_callback(lambda _: self._pending.pop(index, None))
+        # A viewer giving up must not cancel a page someone else may be waiting for
+        return await asyncio.shield(task)
+
+    async def _produce(self, index):
+        page = self._call(index)
+        if inspect.isawaitable(page):
+            page = await page
+        if page is None:
+            if self.total is None or index < self.total:
+                self.total = index
+        else:
+            self._cache.set(index, page)
+        return page
+
+    async def _advance(self, index):
+        async with self._lock:
+            while len(self._produced) <= index and self.total is None:
+                try:
+                    if hasattr(self._iterator, '__anext__'):
+                        page = await self._iterator.__anext__()
+                    else:
+                        page = next(self._iterator)
+                except (StopIteration, StopAsyncIteration):
+                    self.total = len(self._produced)
+                    break
+                self._produced.append(page)
+        return self.peek(index)
+
+
+def neighbour_pages(index, total, loop):
+    """Returns the pages Previous and Next lead to from index, None where a button leads nowhere."""
+    if index > 0:
+        previous = index - 1
+    elif loop and total:
+        # Wrapping backwards needs to know where the end is
+        previous = total - 1
+    else:
+        previous = None
+    if total is None or index < total - 1:
+        following = index + 1
+    elif loop:
+        following = 0
+    else:
+        following = None
+    return (None if previous == index else previous), (None if following == index else following)
+
+
+async def fetch_for_interaction(interaction, source, index, loop):
+    """
+    Gets a page for a button press, deferring first if it has to be produced.
+
+    Returns:
+        tuple: The index actually shown, the page or None, and the coroutine
+        function that edits the message
+    """
+    page = source.peek(index)
+    if page is not None:
+        return index, page, interaction.response.edit_message
+    # Producing the page may outlast the interaction's response window
+    await interaction.response.defer()
+    page = await source.get(index)
+    if page is None and loop and index > 0:
+        # Ran past the end of a source whose length was unknown
+        index, page = 0, await source.get(0)
+    return index, page, interaction.edit_original_response
+
+
+class PaginatorView(WheelView):
+    """
+    Previous/Next buttons over the pages of a PageSource.
+
+    pages may be a list of embeds or anything PageSource accepts. Pages are only
+    produced when first shown, and with prefetch the next one is produced while
+    the current one is being read. Without an author, anyone can turn the pages.
+    """
 
-class PaginatorView(View):
     def __init__(
         self,
-        pages: list[discord.Embed],
-        author: discord.User,
+        pages,
+        author: discord.User = None,
         *,
         loop: bool = False,
         timeout: int = 60,
+        total: int = None,
+        prefetch: bool = True,
+        delete_on_timeout: bool = False,
     ):
         super().__init__(timeout=timeout)
-        self.pages = pages
+        self.source = pages if isinstance(pages, PageSource) else PageSource(pages, total=total)
         self.index = 0
         self.loop = loop
         self.message = None
         self.author = author
+        self.prefetch = prefetch
+        self.delete_on_timeout = delete_on_timeout
+        self._prefetch_task = None
 
     async def on_timeout(self):
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
         if self.message:
             try:
-                await self.message.edit(view=None)
+                if self.delete_on_timeout:
+                    await self.message.delete()
+                else:
+                    await self.message.edit(view=None)
             except discord.NotFound:
                 pass
 
     async def send(self, ctx):
+        page = await self.source.get(self.index)
+        if page is None:
+            return
         self.update_buttons()
-        self.message = await ctx.send(embed=self.pages[self.index], view=self)
+        if isinstance(ctx, discord.Interaction):
+            # Interactions are expected to be deferred already
+            self.message = await ctx.followup.send(embed=page, view=self, wait=True)
+        else:
+            self.message = await ctx.send(embed=page, view=self)
+        self.prefetch_next()
+
+    def prefetch_next(self):
+        total = self.source.total
+        if self.prefetch and (total is None or self.index + 1 < total) and self.source.peek(self.index + 1) is None:
+            self._prefetch_task = asyncio.create_task(self.source.get(self.index + 1))
 
     def update_buttons(self):
-        self.children[0].disabled = len(self.pages) <= 1 or (
-            self.index == 0 and not self.loop
-        )
-        self.children[1].disabled = len(self.pages) <= 1 or (
-            self.index == len(self.pages) - 1 and not self.loop
-        )
+        previous, following = neighbour_pages(self.index, self.source.total, self.loop)
+        self.children[0].disabled = previous is None
+        self.children[1].disabled = following is None
 
-    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
-    async def previous(self, interaction: discord.Interaction, button: Button):
-        if interaction.user != self.author:
+    async def show(self, interaction: discord.Interaction, index: int):
+        index, page, respond = await fetch_for_interaction(interaction, self.source, index, self.loop)
+        if page is None:
+            self.update_buttons()
+            return await respond(view=self)
+
+        self.index = index
+        self.update_buttons()
+        await respond(embed=page, view=self)
+        self.prefetch_next()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.author is not None and interaction.user != self.author:
             await interaction.response.send_message(
                 "You can't use these buttons.", ephemeral=True
             )
-            return
+            return False
+        return True
 
-        if self.index > 0:
-            self.index -= 1
-        elif self.loop:
-            self.index = len(self.pages) - 1
-        else:
-            return await interaction.response.defer()
-        self.update_buttons()
-        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+    async def turn(self, interaction: discord.Interaction, target):
+        if target is None:
+            # The end was only found by prefetching, so the button was still enabled
+            self.update_buttons()
+            return await interaction.response.edit_message(view=self)
+        await self.show(interaction, target)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, neighbour_pages(self.index, self.source.total, self.loop)[0])
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
     async def next(self, interaction: discord.Interaction, button: Button):
-        if interaction.user != self.author:
-            await interaction.response.send_message(
-                "You can't use these buttons.", ephemeral=True
-            )
+        await self.turn(interaction, neighbour_pages(self.index, self.source.total, self.loop)[1])
+
+
+# Page source factories for persistent paginators, by key. Each takes the argument
+# stored in the button and the interaction that needs the pages (None when sending),
+# and returns pages for PageSource, possibly awaitable, or None. A factory may
+# respond to the interaction itself, for instance to explain why there are no pages.
+_source_factories = {}
+_sources = TTLCache(maxsize=256, ttl=3600, wheel=timer_wheel)
+_prefetches = set()
+# Persistent paginators deleted after a while without page turns, by message ID:
+# [message, expires_at, idle seconds]. Not kept across restarts.
+_expiring = {}
+
+
+def register_page_source(key, factory):
+    """Registers how persistent paginators with this key rebuild their pages after a restart."""
+    _source_factories[key] = factory
+
+
+async def get_page_source(key, arg, interaction=None):
+    """Returns the PageSource for key and arg, rebuilding it from its factory if it is not cached."""
+    source = _sources.get((key, arg), count=False)
+    if source is not None:
+        return source
+    factory = _source_factories.get(key)
+    if factory is None:
+        return None
+    pages = factory(arg, interaction)
+    if inspect.isawaitable(pages):
+        pages = await pages
+    if pages is None:
+        return None
+    source = pages if isinstance(pages, PageSource) else PageSource(pages)
+    _sources.set((key, arg), source)
+    return source
+
+
+class PageButton(discord.ui.DynamicItem[Button],
+                 template=r'pg:(?P<action>[pn]):(?P<target>\d+):(?P<owner>\d+):(?P<loop>[01]):(?P<key>[\w-]+):(?P<arg>.*)'):
+    """
+    Previous or Next button of a persistent paginator.
+
+    Everything needed to turn the page is in the custom_id: the page source key
+    and argument, the page the button leads to, the owner (0 for anyone) and
+    whether the pages wrap around. One registered handler serves every such
+    button, so no view is kept per message and the buttons keep working after
+    a restart.
+    """
+
+    def __init__(self, action, target, owner_id, loop, key, arg, *, disabled=False):
+        custom_id = f"pg:{action}:{target}:{owner_id}:{int(loop)}:{key}:{arg}"
+        super().__init__(Button(
+            label="Previous" if action == 'p' else "Next",
+            style=discord.ButtonStyle.secondary,
+            custom_id=custom_id,
+            disabled=disabled,
+        ))
+        self.action = action
+        self.target = target
+        self.owner_id = owner_id
+        self.loop = loop
+        self.key = key
+        self.arg = arg
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match['action'], int(match['target']), int(match['owner']), match['loop'] == '1',
+                   match['key'], match['arg'])
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.owner_id and interaction.user.id != self.owner_id:
+            await interaction.response.send_message("You can't use these buttons.", ephemeral=True)
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        expiring = _expiring.get(interaction.message.id) if interaction.message else None
+        if expiring is not None:
+            expiring[1] = time.monotonic() + expiring[2]
+        source = await get_page_source(self.key, self.arg, interaction)
+        if source is None:
+            if not interaction.response.is_done():
+                await interaction.response.edit_message(view=None)
             return
+        index, page, respond = await fetch_for_interaction(interaction, source, self.target, self.loop)
+        if page is None:
+            return await respond(view=persistent_view(self.key, self.arg, self.target - 1, source.total,
+                                                      self.owner_id, self.loop))
+        await respond(embed=page, view=persistent_view(self.key, self.arg, index, source.total, self.owner_id, self.loop))
+        _prefetch(source, index)
 
-        if self.index < len(self.pages) - 1:
-            self.index += 1
-        elif self.loop:
-            self.index = 0
-        else:
-            return await interaction.response.defer()
-        self.update_buttons()
-        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+
+def persistent_view(key, arg, index, total, owner_id=0, loop=False):
+    """Builds the buttons of a persistent paginator showing page index."""
+    previous, following = neighbour_pages(index, total, loop)
+    view = View(timeout=None)
+    view.add_item(PageButton('p', previous or 0, owner_id, loop, key, arg, disabled=previous is None))
+    view.add_item(PageButton('n', following or 0, owner_id, loop, key, arg, disabled=following is None))
+    # Stopped views are not stored: PageButton's template routes the clicks
+    view.stop()
+    return view
+
+
+def _expire_message(message_id):
+    message, expires_at, _ = _expiring[message_id]
+    remaining = expires_at - time.monotonic()
+    if remaining > 0:
+        # Pages were turned since the timer was set
+        timer_wheel.schedule(remaining, _expire_message, message_id, kind='paginator')
+        return None
+    del _expiring[message_id]
+    return _delete_quietly(message)
+
+
+async def _delete_quietly(message):
+    try:
+        await message.delete()
+    except discord.NotFound:
+        pass
+
+
+def _prefetch(source, index):
+    if source.total is None or index + 1 < source.total:
+        task = asyncio.create_task(source.get(index + 1))
+        _prefetches.add(task)
+        task.add_done_callback(_prefetches.discard)
+
+
+async def send_persistent_paginator(ctx, key, arg='', *, source=None, owner=None, loop=False, delete_after=None):
+    """
+    Sends the first page of a persistent paginator over the registered source key.
+
+    source, when given, is cached as the pages for key and arg so they are not
+    rebuilt right away. With delete_after, the message is deleted once its pages
+    have not been turned for that many seconds; after a restart it is kept.
+    Falls back to a regular PaginatorView when the arguments do not fit in a
+    custom_id.
+
+    Returns:
+        discord.Message | None: The message sent, or None if there are no pages
+    """
+    if source is not None:
+        source = source if isinstance(source, PageSource) else PageSource(source)
+        _sources.set((key, arg), source)
+    else:
+        source = await get_page_source(key, arg)
+        if source is None:
+            return None
+
+    owner_id = owner.id if owner is not None else 0
+    view = persistent_view(key, arg, 0, source.total, owner_id, loop)
+    if any(len(item.custom_id) > 100 for item in view.children):
+        paginator = PaginatorView(source, author=owner, loop=loop, timeout=delete_after or 60,
+                                  delete_on_timeout=delete_after is not None)
+        await paginator.send(ctx)
+        return paginator.message
+
+    page = await source.get(0)
+    if page is None:
+        return None
+    if source.total is not None and source.total <= 1:
+        view = None
+    if isinstance(ctx, discord.Interaction):
+        # Interactions are expected to be deferred already
+        message = await ctx.followup.send(embed=page, view=view or discord.utils.MISSING, wait=True)
+    else:
+        message = await ctx.send(embed=page, view=view)
+    if delete_after is not None:
+        _expiring[message.id] = [message, time.monotonic() + delete_after, delete_after]
+        timer_wheel.schedule(delete_after, _expire_message, message.id, kind='paginator')
+    _prefetch(source, 0)
+    return message
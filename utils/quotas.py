@@ -0,0 +1,274 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+# Default global concurrency and per-guild daily budget for each metered operation
+OPERATIONS = {
+    'video_dl': {'label': 'video downloads', 'slots': 2, 'daily': 50},
+    'ig_photo': {'label': 'Instagram photo downloads', 'slots': 2, 'daily': 100},
+    'translate': {'label': 'translations', 'slots': 8, 'daily': 2000},
+    'define': {'label': 'dictionary lookups', 'slots': 4, 'daily': 500},
+}
+
+BUDGET_KEY = 'quota:'
+WEIGHT_KEY = 'quota_weight'
+
+# bot_settings rows under guild_id 0 hold the defaults for every guild
+DEFAULTS_GUILD_ID = 0
+# Direct messages are accounted for as if they came from one guild, kept apart
+# from the defaults since no guild has a negative ID
+DM_GUILD_ID = -1
+
+
+class QuotaExceeded(Exception):
+    """Raised when a guild has used its daily budget for an operation."""
+
+    def __init__(self, operation, guild_id, budget):
+        self.operation = operation
+        self.guild_id = guild_id
+        self.budget = budget
+        label = OPERATIONS[operation]['label']
+        super().__init__(f"This server has used its daily budget of {budget} {label}. It resets at 00:00 UTC.")
+
+
+class FairScheduler:
+    """
+    Weighted fair queuing of one operation's slots between guilds.
+
+    Each request gets a virtual finish tag: the later of the scheduler's virtual
+    time and the guild's previous tag, plus cost divided by the guild's weight.
+    Free slots go to the smallest tag, so a guild that queues many requests only
+    gets its weighted share while other guilds are waiting, and still gets every
+    slot when nobody else is.
+
+    Attributes:
+        slots (int): Maximum requests running at once
+    """
+
+    def __init__(self, slots):
+        self.slots = slots
+        self.running = 0
+        self.virtual_time = 0.0
+        self._last_finish = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._waiting = {}
+
+    def waiting(self, guild_id=None):
+        if guild_id is None:
+            return sum(self._waiting.values())
+        return self._waiting.get(guild_id, 0)
+
+    async def acquire(self, guild_id, weight=1.0, cost=1):
+        start = max(self.virtual_time, self._last_finish.get(guild_id, 0.0))
+        finish = start + cost / weight
+        self._last_finish[guild_id] = finish
+
+        if self.running < self.slots and not self._heap:
+            self.running += 1
+            self.virtual_time = finish
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (finish, next(self._counter), guild_id, future))
+        self._waiting[guild_id] = self._waiting.get(guild_id, 0) + 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as the waiter gave up, hand it on
+                self.release()
+            raise
+
+    def release(self):
+        self.running -= 1
+        while self._heap and self.running < self.slots:
+            finish, _, guild_id, future = heapq.heappop(self._heap)
+            self._waiting[guild_id] -= 1
+            if not self._waiting[guild_id]:
+                del self._waiting[guild_id]
+            if future.done():
+                continue
+            self.running += 1
+            self.virtual_time = finish
+            future.set_result(None)
+
+        if not self._heap and not self.running:
+            # Idle: old finish tags no longer matter
+            self._last_finish.clear()
+            self.virtual_time = 0.0
+
+
+class GuildQuotas:
+    """
+    Per-guild daily budgets and fair scheduling for expensive operations.
+
+    Budgets and weights live in bot_settings: 'quota:<operation>' holds a daily
+    budget and 'quota_weight' a scheduling weight, with guild_id 0 holding the
+    defaults for every guild, and direct messages count as guild_id -1. Usage is
+    counted per UTC day in the guild_usage table, where each charge checks the
+    budget and adds to the count in one statement. The count it returns is kept
+    in memory, so requests over budget are turned away without a round trip.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.schedulers = {name: FairScheduler(spec['slots']) for name, spec in OPERATIONS.items()}
+        self._settings = {}
+        self._usage = {}
+        self._day = self._today()
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).date()
+
+    def _roll_over(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._usage.clear()
+
+    async def load(self):
+        """Loads quota settings and today's usage from the database."""
+        async def fetch_quotas(conn):
+            settings = await conn.fetch(
+                "SELECT guild_id, key, value FROM bot_settings WHERE key LIKE 'quota%'"
+            )
+            usage = await conn.fetch(
+                "SELECT guild_id, operation, count FROM guild_usage WHERE day = $1", self._today()
+            )
+            return settings, usage
+
+        settings, usage = await self.bot.execute_db_operation(fetch_quotas)
+        self._day = self._today()
+        self._settings = {(row['guild_id'], row['key']): row['value'] for row in settings}
+        self._usage = {(row['guild_id'], row['operation']): row['count'] for row in usage}
+        logging.info(f"Loaded {len(settings)} quota settings")
+        await self.prune()
+
+    def _setting(self, guild_id, key, default):
+        value = self._settings.get((guild_id, key), self._settings.get((DEFAULTS_GUILD_ID, key)))
+        try:
+            return float(value) if value is not None else default
+        except ValueError:
+            return default
+
+    def budget_for(self, guild_id, operation):
+        return int(self._setting(guild_id, f"{BUDGET_KEY}{operation}", OPERATIONS[operation]['daily']))
+
+    def weight_for(self, guild_id):
+        return max(self._setting(guild_id, WEIGHT_KEY, 1.0), 0.01)
+
+    def used(self, guild_id, operation):
+        self._roll_over()
+        return self._usage.get((guild_id, operation), 0)
+
+    def usage(self, guild_id=None):
+        """Returns {guild_id: {operation: (used, budget)}} for today, for one guild or all of them."""
+        self._roll_over()
+        guild_ids = {guild_id} if guild_id is not None else {g for g, _ in self._usage}
+        return {
+            g: {op: (self._usage.get((g, op), 0), self.budget_for(g, op)) for op in OPERATIONS}
+            for g in sorted(guild_ids)
+        }
+
+    async def _charge(self, guild_id, operation, cost, budget):
+        """Adds cost to today's count unless that would exceed budget. Returns whether it was charged."""
+        async def add_usage(conn):
+            return await conn.fetchval(
+                "INSERT INTO guild_usage (guild_id, operation, day, count) "
+                "SELECT $1, $2, $3, $4 WHERE $4 <= $5 "
+                "ON CONFLICT (guild_id, operation, day) DO UPDATE SET count = guild_usage.count + $4 "
+                "WHERE guild_usage.count + $4 <= $5 "
+                "RETURNING count",
+                guild_id, operation, self._day, cost, budget
+            )
+
+        try:
+            count = await self.bot.execute_db_operation(add_usage)
+        except Exception as e:
+            logging.warning(f"Failed to record usage for guild {guild_id}: {e}")
+            # Fall back to the count in memory, which was checked by the caller
+            self._usage[(guild_id, operation)] = self._usage.get((guild_id, operation), 0) + cost
+            return True
+        if count is None:
+            return False
+        self._usage[(guild_id, operation)] = count
+        return True
+
+    async def _record(self, guild_id, operation, cost):
+        async def add_usage(conn):
+            return await conn.fetchval(
+                "INSERT INTO guild_usage (guild_id, operation, day, count) VALUES ($1, $2, $3, $4) "
+                "ON CONFLICT (guild_id, operation, day) DO UPDATE SET count = guild_usage.count + $4 "
+                "RETURNING count",
+                guild_id, operation, self._day, cost
+            )
+
+        self._usage[(guild_id, operation)] = self._usage.get((guild_id, operation), 0) + cost
+        try:
+            self._usage[(guild_id, operation)] = await self.bot.execute_db_operation(add_usage)
+        except Exception as e:
+            logging.warning(f"Failed to record usage for guild {guild_id}: {e}")
+
+    @asynccontextmanager
+    async def run(self, operation, guild_id, cost=1):
+        """
+        Charges a guild's budget and waits for a fair share of the operation's slots.
+
+        The charge is refunded if the wrapped block raises.
+
+        Raises:
+            QuotaExceeded: If the guild has no budget left today
+        """
+        guild_id = guild_id or DM_GUILD_ID
+        budget = self.budget_for(guild_id, operation)
+        if self.used(guild_id, operation) + cost > budget:
+            raise QuotaExceeded(operation, guild_id, budget)
+        if not await self._charge(guild_id, operation, cost, budget):
+            # Other processes used up the budget since the count was last seen
+            raise QuotaExceeded(operation, guild_id, budget)
+
+        scheduler = self.schedulers[operation]
+        try:
+            await scheduler.acquire(guild_id, self.weight_for(guild_id), cost)
+        except BaseException:
+            await self._record(guild_id, operation, -cost)
+            raise
+        try:
+            yield
+        except BaseException:
+            await self._record(guild_id, operation, -cost)
+            raise
+        finally:
+            scheduler.release()
+
+    async def set(self, guild_id, key, value):
+        """Stores a quota setting, or removes it when value is None."""
+        async def store_setting(conn):
+            if value is None:
+                await conn.execute("DELETE FROM bot_settings WHERE key = $1 AND guild_id = $2", key, guild_id)
+            else:
+                await conn.execute(
+                    "INSERT INTO bot_settings (key, value, guild_id) VALUES ($1, $2, $3) "
+                    "ON CONFLICT (key, guild_id) DO UPDATE SET value = $2, updated_at = CURRENT_TIMESTAMP",
+                    key, str(value), guild_id
+                )
+
+        await self.bot.execute_db_operation(store_setting)
+        if value is None:
+            self._settings.pop((guild_id, key), None)
+        else:
+            self._settings[(guild_id, key)] = str(value)
+
+    async def prune(self, keep_days=90):
+        async def delete_old(conn):
+            await conn.execute("DELETE FROM guild_usage WHERE day < $1::date - $2::int", self._today(), keep_days)
+
+        try:
+            await self.bot.execute_db_operation(delete_old)
+        except Exception as e:
+            logging.warning(f"Failed to prune guild usage: {e}")
@@ -0,0 +1,249 @@
+import asyncio
+import functools
+import logging
+import time
+
+import discord
+from discord.ext import commands
+
+from utils.cache import TTLCache
+
+# Keeps the database at one round trip per call: refill, spend and report in a single
+# UPSERT, timed by the database clock so every process agrees on elapsed time.
+# $1 bucket, $2 capacity, $3 tokens refilled per second, $4 cost
+_CONSUME_SQL = """
+    INSERT INTO rate_limits AS r (bucket, tokens, updated_at, last_allowed)
+    VALUES ($1, $2 - $4, now(), now())
+    ON CONFLICT (bucket) DO UPDATE SET
+        tokens = CASE
+            WHEN least($2, r.tokens + extract(epoch FROM now() - r.updated_at) * $3) >= $4
+            THEN least($2, r.tokens + extract(epoch FROM now() - r.updated_at) * $3) - $4
+            ELSE least($2, r.tokens + extract(epoch FROM now() - r.updated_at) * $3)
+        END,
+        last_allowed = CASE
+            WHEN least($2, r.tokens + extract(epoch FROM now() - r.updated_at) * $3) >= $4
+            THEN now()
+            ELSE r.last_allowed
+        END,
+        updated_at = now()
+    RETURNING tokens, last_allowed = updated_at AS allowed
+"""
+
+
+class MemoryBackend:
+    """
+    Token buckets kept in process memory.
+
+    Used on its own for single-process deployments, and as the fallback when the
+    database is unavailable. Buckets are forgotten once they would be full again.
+    """
+
+    def __init__(self, maxsize=100_000):
+        self._buckets = TTLCache(maxsize=maxsize)
+
+    async def consume(self, bucket, capacity, refill, cost=1):
+        """
+        Spends cost tokens from a bucket if it has them.
+
+        Returns:
+            tuple[bool, float]: Whether the call was allowed and the tokens left afterwards
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(bucket, (capacity, now), count=False)
+        tokens = min(capacity, tokens + (now - updated) * refill)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets.set(bucket, (tokens, now), ttl=(capacity - tokens) / refill)
+        return allowed, tokens
+
+
+class PostgresBackend:
+    """
+    Token buckets stored in the rate_limits table, shared by every bot process.
+
+    Each call is a single atomic UPSERT, so concurrent processes cannot spend the
+    same token twice. Rows untouched for a day are pruned every hour.
+    """
+
+    def __init__(self, bot, *, prune_interval=3600.0):
+        self.bot = bot
+        self.prune_interval = prune_interval
+        self._last_prune = time.monotonic()
+        self._prune_task = None
+
+    async def consume(self, bucket, capacity, refill, cost=1):
+        async def consume_tokens(conn):
+            return await conn.fetchrow(_CONSUME_SQL, bucket, float(capacity), float(refill), float(cost))
+
+        row = await self.bot.execute_db_operation(consume_tokens)
+        if time.monotonic() - self._last_prune > self.prune_interval and self._prune_task is None:
+            self._last_prune = time.monotonic()
+            self._prune_task = asyncio.create_task(self.prune())
+            self._prune_task.add_done_callback(lambda _: setattr(self, '_prune_task', None))
+        return row['allowed'], row['tokens']
+
+    async def prune(self):
+        async def delete_idle(conn):
+            await conn.execute("DELETE FROM rate_limits WHERE updated_at < now() - interval '1 day'")
+
+        try:
+            await self.bot.execute_db_operation(delete_idle)
+        except Exception as e:
+            logging.warning(f"Failed to prune rate limits: {e}")
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limits over a shared backend with an in-process fast path.
+
+    Most calls never wait on the backend. Each process keeps an estimate of every
+    bucket it has used recently, lowered by the backend's answer to each of its
+    spends. The estimate misses only what other processes spent since that answer,
+    so a bucket it shows empty is refused locally, and a bucket it shows with a
+    token to spare beyond the cost is allowed immediately, with the spend written to
+    the backend in the background. Buckets the process does not know, and calls that
+    would spend the last token, wait for the backend's atomic answer, which keeps
+    the shared count exact near the limit and across restarts. Processes spending
+    from the same bucket between two of each other's writes can still overshoot it by
+    the spare tokens they each saw. If the backend fails, the in-memory fallback
+    takes over so commands keep working.
+
+    Attributes:
+        backend: Shared bucket store such as PostgresBackend or MemoryBackend
+        fallback (MemoryBackend): Used when the backend raises
+    """
+
+    def __init__(self, backend=None, *, maxsize=100_000):
+        self.backend = backend or MemoryBackend(maxsize)
+        self.fallback = self.backend if isinstance(self.backend, MemoryBackend) else MemoryBackend(maxsize)
+        self._local = TTLCache(maxsize=maxsize)
+        self._pending = set()
+        self.fast_allowed = 0
+        self.fast_denied = 0
+        self.backend_calls = 0
+
+    async def _consume(self, bucket, capacity, refill, cost):
+        self.backend_calls += 1
+        try:
+            return await self.backend.consume(bucket, capacity, refill, cost)
+        except Exception as e:
+            logging.warning(f"Rate limit backend failed, using in-memory buckets: {e}")
+            return await self.fallback.consume(bucket, capacity, refill, cost)
+
+    def _remember(self, bucket, capacity, refill, tokens):
+        self._local.set(bucket, (tokens, time.monotonic()), ttl=(capacity - tokens) / refill)
+
+    def _estimate(self, bucket, capacity, refill, now):
+        local = self._local.get(bucket, count=False)
+        if local is None:
+            return capacity
+        return min(capacity, local[0] + (now - local[1]) * refill)
+
+    async def _write_behind(self, bucket, capacity, refill, cost):
+        allowed, tokens = await self._consume(bucket, capacity, refill, cost)
+        # The backend has not seen spends still being written, the estimate has not
+        # seen other processes' spends; each is an upper bound, so keep the lower
+        tokens = min(tokens, self._estimate(bucket, capacity, refill, time.monotonic()))
+        self._remember(bucket, capacity, refill, tokens)
+
+    async def hit(self, name, key, rate, per, *, burst=None, cost=1):
+        """
+        Spends from the bucket for name and key.
+
+        Args:
+            name (str): Limit name, shared by everything that should count together
+            key: Scope of the bucket, usually a user ID
+            rate (int): Calls allowed per period
+            per (float): Period in seconds
+            burst (int): Bucket capacity, defaults to rate
+            cost (int): Tokens this call spends
+
+        Returns:
+            float: 0 if the call is allowed, otherwise seconds until it would be
+        """
+        bucket = f"{name}:{key}"
+        capacity = burst or rate
+        refill = rate / per
+        now = time.monotonic()
+
+        local = self._local.get(bucket, count=False)
+        if local is not None:
+            tokens = min(capacity, local[0] + (now - local[1]) * refill)
+            if tokens < cost:
+                self.fast_denied += 1
+                return (cost - tokens) / refill
+            # Only spend optimistically when this call would not use the last token
+            if tokens - cost >= 1:
+                self.fast_allowed += 1
+                self._remember(bucket, capacity, refill, tokens - cost)
+                task = asyncio.create_task(self._write_behind(bucket, capacity, refill, cost))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+                return 0.0
+
+        allowed, tokens = await self._consume(bucket, capacity, refill, cost)
+        if allowed:
+            # Spends still being written behind are not in the backend's answer yet
+            tokens = min(tokens, self._estimate(bucket, capacity, refill, time.monotonic()) - cost)
+        self._remember(bucket, capacity, refill, max(tokens, 0.0))
+        return 0.0 if allowed else (cost - tokens) / refill
+
+    def stats(self):
+        return {
+            'fast_allowed': self.fast_allowed,
+            'fast_denied': self.fast_denied,
+            'backend_calls': self.backend_calls,
+            'tracked_buckets': len(self._local),
+        }
+
+
+def _event_user_id(event):
+    if isinstance(event, commands.Context):
+        return event.author.id
+    if isinstance(event, discord.Message):
+        return event.author.id
+    if isinstance(event, discord.Interaction):
+        return event.user.id
+    if isinstance(event, discord.RawReactionActionEvent):
+        return event.user_id
+    return None
+
+
+def rate_limit(name, rate, per, *, burst=None, key=_event_user_id):
+    """
+    Decorator that rate limits a command or listener through bot.rate_limiter.
+
+    The bucket is scoped by key, which is called with the first Context, Message,
+    Interaction or reaction payload among the arguments and defaults to the user
+    who triggered it. Limited commands tell the user how long to wait; limited
+    listeners are skipped silently.
+
+    Args:
+        name (str): Limit name, shared by everything that should count together
+        rate (int): Calls allowed per period
+        per (float): Period in seconds
+        burst (int): Bucket capacity, defaults to rate
+        key (Callable): Returns the bucket scope for an event, or None to skip limiting
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cog = args[0] if args else None
+            limiter = getattr(getattr(cog, 'bot', None), 'rate_limiter', None)
+            event = next((arg for arg in args if _event_user_id(arg) is not None), None)
+            scope = key(event) if event is not None else None
+            if limiter is None or scope is None:
+                return await func(*args, **kwargs)
+
+            retry_after = await limiter.hit(name, scope, rate, per, burst=burst)
+            if not retry_after:
+                return await func(*args, **kwargs)
+            if isinstance(event, commands.Context):
+                await event.send(f"{event.author.mention} Please wait {retry_after:.2f} seconds before using this again.",
+                                 delete_after=10)
+            elif isinstance(event, discord.Interaction) and not event.response.is_done():
+                await event.response.send_message(f"Please wait {retry_after:.2f} seconds before using this again.",
+                                                  ephemeral=True)
+        return wrapper
+    return decorator
@@ -0,0 +1,128 @@
+import asyncio
+import re
+import urllib.parse
+
+# Separators tried from coarsest to finest, each paired with the text used to join pieces back
+# together. Splits that match no text, such as after CJK sentence endings, are joined with nothing.
+_LEVELS = [
+    (re.compile(r'\n\s*\n'), '\n\n'),
+    (re.compile(r'\n'), '\n'),
+    (re.compile(r'(?<=[.!?…])\s+|(?<=[。！？])'), ' '),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def encoded_length(text):
+    """Returns how many characters text takes up in a URL query string."""
+    return len(urllib.parse.quote_plus(text))
+
+
+def _split_parts(pattern, separator, text):
+    """Splits text on pattern into (part, separator after it) pairs."""
+    parts = []
+    start = 0
+    for match in pattern.finditer(text):
+        parts.append((text[start:match.start()], separator if match.group() else ''))
+        start = match.end()
+    parts.append((text[start:], ''))
+    return parts
+
+
+def _slice(text, limit, measure):
+    slices = []
+    start = 0
+    size = 0
+    for i, char in enumerate(text):
+        width = measure(char)
+        if size + width > limit and i > start:
+            slices.append((text[start:i], ''))
+            start, size = i, 0
+        size += width
+    slices.append((text[start:], ''))
+    return slices
+
+
+def split_text(text, limit, *, measure=len, _level=0):
+    """
+    Splits text into chunks of at most limit along natural boundaries.
+
+    Paragraphs are kept together where possible, then lines, sentences and words.
+    A single word longer than limit is cut into slices. Sizes are measured with
+    measure, the number of characters by default. Text too long for one chunk that
+    is nothing but whitespace gives no chunks.
+
+    Returns:
+        list[tuple[str, str]]: Each chunk with the separator that joins it to the next one.
+    """
+    if measure(text) <= limit:
+        return [(text, '')]
+    if _level == len(_LEVELS):
+        return _slice(text, limit, measure)
+
+    pattern, separator = _LEVELS[_level]
+    chunks = []
+    current = ''
+    current_size = 0
+    joiner = ''
+    for part, part_separator in _split_parts(pattern, separator, text):
+        if not part.strip():
+            continue
+        size = measure(part)
+        if size > limit:
+            if current:
+                chunks.append((current, joiner))
+                current, current_size = '', 0
+            pieces = split_text(part, limit, measure=measure, _level=_level + 1)
+            if pieces:
+                pieces[-1] = (pieces[-1][0], part_separator)
+                chunks.extend(pieces)
+        elif current and current_size + measure(joiner) + size > limit:
+            chunks.append((current, joiner))
+            current, current_size = part, size
+        elif current:
+            current = f"{current}{joiner}{part}"
+            current_size += measure(joiner) + size
+        else:
+            current, current_size = part, size
+        joiner = part_separator
+    if current:
+        chunks.append((current, joiner))
+
+    if chunks:
+        chunks[-1] = (chunks[-1][0], '')
+    return chunks
+
+
+def join_chunks(chunks):
+    return ''.join(f"{chunk}{separator}" for chunk, separator in chunks)
+
+
+async def translate_in_chunks(translate, text, *, chunk_size, concurrency=4, measure=encoded_length):
+    """
+    Translates long text as concurrent chunks and reassembles them in order.
+
+    Args:
+        translate (Callable[[str], Awaitable[str]]): Translates a single chunk
+        text (str): Text to translate
+        chunk_size (int): Maximum size of each upstream request's text, as counted by measure
+        concurrency (int): Maximum chunks in flight at once
+        measure (Callable[[str], int]): Sizes text, by default its URL-encoded length
+
+    Returns:
+        str: The translated text
+    """
+    chunks = split_text(text, chunk_size, measure=measure)
+    if not chunks:
+        # Only whitespace, nothing to translate
+        return text
+    if len(chunks) == 1:
+        return await translate(text)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def translate_chunk(chunk):
+        async with semaphore:
+            return await translate(chunk)
+
+    translations = await asyncio.gather(*(translate_chunk(chunk) for chunk, _ in chunks))
+    return join_chunks(zip(translations, (separator for _, separator in chunks)))
@@ -0,0 +1,273 @@
+import asyncio
+import inspect
+import logging
+import math
+import time
+
+import discord
+
+
+class TimerHandle:
+    """A callback scheduled on a TimerWheel. Cancelling it is O(1)."""
+    __slots__ = ('deadline', 'kind', '_tick', '_callback', '_args', '_slot', '_wheel')
+
+    def __init__(self, wheel, tick, deadline, kind, callback, args):
+        self.deadline = deadline
+        self.kind = kind
+        self._tick = tick
+        self._callback = callback
+        self._args = args
+        self._slot = None
+        self._wheel = wheel
+
+    @property
+    def pending(self):
+        return self._slot is not None
+
+    def cancel(self):
+        """Stops the callback from running. Does nothing if it already ran or was cancelled."""
+        if self._slot is not None:
+            del self._slot[self]
+            self._slot = None
+            self._wheel._forget(self)
+            self._wheel.cancelled += 1
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel running every timeout and expiry on one task.
+
+    Time advances in ticks. Each level is a ring of wheel_size slots, and a level
+    covers wheel_size times the span of the one below it: with the defaults, the
+    first level holds timers due in the next 32 seconds at half a second
+    resolution, the second the next 34 minutes, the third 36 hours and the last
+    97 days, where anything later also waits. A timer goes in the slot for its
+    deadline on the lowest level that reaches it, and each slot is a dict, so
+    scheduling and cancelling are O(1) however many timers are pending. When a
+    lower level wraps around, the matching slot above is emptied into the levels
+    below, so a timer is moved at most once per level before it fires.
+
+    One task sleeps from tick to tick, and waits without ticking while nothing is
+    pending. Callbacks may be plain functions or coroutine functions, which run
+    as tasks; they fire up to one tick late, never early.
+
+    Attributes:
+        tick (float): Seconds per tick
+        fired (int): Number of callbacks run
+        cancelled (int): Number of timers cancelled before they fired
+    """
+
+    def __init__(self, *, tick=0.5, wheel_size=64, levels=4):
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.fired = 0
+        self.cancelled = 0
+        self._bits = (wheel_size - 1).bit_length()
+        if 1 << self._bits != wheel_size:
+            raise ValueError("wheel_size must be a power of two")
+        self._mask = wheel_size - 1
+        self._levels = [[{} for _ in range(wheel_size)] for _ in range(levels)]
+        self._horizon = wheel_size ** levels - 1
+        self._origin = time.monotonic()
+        self._now = 0
+        self._size = 0
+        self._counts = {}
+        self._driver = None
+        self._wakeup = None
+        self._tasks = set()
+
+    def __len__(self):
+        return self._size
+
+    def pending(self, kind=None):
+        """Returns the number of timers waiting to fire, of one kind or in total."""
+        if kind is None:
+            return len(self)
+        return self._counts.get(kind, 0)
+
+    def stats(self):
+        return {
+            'pending': len(self),
+            'by_kind': dict(self._counts),
+            'by_level': [sum(len(slot) for slot in level) for level in self._levels],
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+        }
+
+    def schedule(self, delay, callback, *args, kind='timer'):
+        """
+        Runs callback(*args) once delay seconds have passed.
+
+        Args:
+            delay (float): Seconds to wait
+            callback: Function or coroutine function to call
+            kind (str): Label the timer is counted under in pending() and stats()
+
+        Returns:
+            TimerHandle: Handle whose cancel() stops the timer
+        """
+        now = time.monotonic()
+        if not self._size:
+            # Every slot is empty, so the ticks spent idle can be skipped
+            self._now = max(self._now, int((now - self._origin) / self.tick))
+        deadline = now + max(delay, 0.0)
+        # Ticks fire at their end, so a timer never goes off before its deadline
+        tick = max(math.ceil((deadline - self._origin) / self.tick), self._now + 1)
+        handle = TimerHandle(self, tick, deadline, kind, callback, args)
+        self._insert(handle)
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        self._size += 1
+        self._wake()
+        return handle
+
+    def _insert(self, handle):
+        tick = min(handle._tick, self._now + self._horizon)
+        delta = tick - self._now
+        level = 0
+        while delta >> (self._bits * (level + 1)) and level < len(self._levels) - 1:
+            level += 1
+        slot = self._levels[level][(tick >> (self._bits * level)) & self._mask]
+        slot[handle] = None
+        handle._slot = slot
+
+    def _forget(self, handle):
+        self._size -= 1
+        count = self._counts[handle.kind] - 1
+        if count:
+            self._counts[handle.kind] = count
+        else:
+            del self._counts[handle.kind]
+
+    def _advance(self):
+        """Moves the wheel forward one tick and runs the timers that became due."""
+        self._now += 1
+        for level in range(len(self._levels) - 1, 0, -1):
+            if self._now & ((1 << (self._bits * level)) - 1) == 0:
+                slot = self._levels[level][(self._now >> (self._bits * level)) & self._mask]
+                if slot:
+                    handles = list(slot)
+                    slot.clear()
+                    for handle in handles:
+                        self._insert(handle)
+
+        slot = self._levels[0][self._now & self._mask]
+        if not slot:
+            return
+        due = [handle for handle in slot if handle._tick <= self._now]
+        for handle in due:
+            del slot[handle]
+            handle._slot = None
+            self._forget(handle)
+            self._fire(handle)
+
+    def _fire(self, handle):
+        self.fired += 1
+        try:
+            result = handle._callback(*handle._args)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._finished)
+        except Exception:
+            logging.exception(f"Timer callback {handle._callback!r} failed")
+
+    def _finished(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error("Timer callback failed", exc_info=task.exception())
+
+    def _wake(self):
+        if self._wakeup is not None:
+            if not self._wakeup.is_set():
+                self._wakeup.set()
+        elif self._driver is None:
+            try:
+                self.start()
+            except RuntimeError:
+                # No running loop yet; start() picks the timer up later
+                pass
+
+    def start(self):
+        """Starts the task driving the wheel on the running event loop."""
+        if self._driver is None or self._driver.done():
+            loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._driver = loop.create_task(self._run())
+
+    async def stop(self):
+        """Stops the driver. Pending timers stay scheduled and fire once it is started again."""
+        if self._driver is not None:
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
+        self._driver = None
+        self._wakeup = None
+
+    async def _run(self):
+        while True:
+            if not self._size:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            due = int((time.monotonic() - self._origin) / self.tick)
+            while self._now < due:
+                self._advance()
+            await asyncio.sleep(self._origin + (self._now + 1) * self.tick - time.monotonic())
+
+
+# The bot's shared wheel, also reachable as bot.timer_wheel
+timer_wheel = TimerWheel()
+
+
+class WheelView(discord.ui.View):
+    """
+    View whose timeout is a timer on the shared wheel instead of a task of its own.
+
+    discord.py sees a view without a timeout. The wheel timer is armed when the
+    view starts listening and cancelled by stop(). Like discord.py's own timeout,
+    an interaction only pushes the expiry back, and a timer that finds it moved
+    schedules itself again for the rest, so busy views cost nothing per click.
+
+    Attributes:
+        idle_timeout (float | None): Seconds without interaction before the view times out
+    """
+
+    def __init__(self, *, timeout=180.0, wheel=None):
+        super().__init__(timeout=None)
+        self.idle_timeout = timeout
+        self.wheel = timer_wheel if wheel is None else wheel
+        self._timer = None
+        self._expires_at = None
+
+    def _arm(self, delay):
+        self._timer = self.wheel.schedule(delay, self._check_timeout, kind='view')
+
+    def _check_timeout(self):
+        remaining = self._expires_at - time.monotonic()
+        if remaining > 0:
+            self._arm(remaining)
+        else:
+            self._timer = None
+            self._dispatch_timeout()
+
+    def _start_listening_from_store(self, store):
+        super()._start_listening_from_store(store)
+        if self._timer is not None:
+            self._timer.cancel()
+        if self.idle_timeout:
+            self._expires_at = time.monotonic() + self.idle_timeout
+            self._arm(self.idle_timeout)
+
+    async def _scheduled_task(self, item, interaction):
+        # Any interaction keeps the view alive, even one interaction_check rejects
+        if self._timer is not None:
+            self._expires_at = time.monotonic() + self.idle_timeout
+        await super()._scheduled_task(item, interaction)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        super().stop()
@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import unicodedata
+
+from utils.cache import TTLCache
+
+
+def normalize_text(text):
+    """Normalizes Unicode form and whitespace so trivially different copies share a cache key."""
+    return unicodedata.normalize('NFC', ' '.join(text.split()))
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """
+    Two-tier cache of translations keyed by (text hash, source language, target language).
+
+    An in-process LRU answers repeated phrases without any I/O. Misses fall through
+    to the translation_cache table, which survives restarts and is shared by every
+    process using the same database. Database errors are logged and treated as misses
+    so the cache can never break translation.
+
+    Attributes:
+        memory (TTLCache): The in-process tier
+        ttl (float): Seconds an entry stays valid in either tier
+        max_rows (int): Maximum number of rows kept in the database tier
+    """
+
+    def __init__(self, bot, *, maxsize=4096, ttl=7 * 24 * 3600.0, max_rows=200_000):
+        self.bot = bot
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl, wheel=bot.timer_wheel)
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.db_hits = 0
+        self.misses = 0
+
+    async def get(self, text, source, target):
+        """Returns the cached translation, or None if neither tier has it."""
+        key = (text_hash(text), source, target)
+        translation = self.memory.get(key)
+        if translation is not None:
+            return translation
+
+        async def fetch_translation(conn):
+            return await conn.fetchval(
+                "UPDATE translation_cache SET last_used_at = CURRENT_TIMESTAMP "
+                "WHERE text_hash = $1 AND source = $2 AND target = $3 "
+                "AND created_at > CURRENT_TIMESTAMP - make_interval(secs => $4) "
+                "RETURNING translation",
+                *key, self.ttl
+            )
+
+        try:
+            translation = await self.bot.execute_db_operation(fetch_translation)
+        except Exception as e:
+            logging.warning(f"Translation cache lookup failed: {e}")
+            translation = None
+
+        if translation is None:
+            self.misses += 1
+            return None
+
+        self.db_hits += 1
+        self.memory.set(key, translation)
+        return translation
+
+    async def set(self, text, source, target, translation):
+        key = (text_hash(text), source, target)
+        self.memory.set(key, translation)
+
+        async def store_translation(conn):
+            await conn.execute(
+                "INSERT INTO translation_cache (text_hash, source, target, translation) VALUES ($1, $2, $3, $4) "
+                "ON CONFLICT (text_hash, source, target) DO UPDATE "
+                "SET translation = $4, created_at = CURRENT_TIMESTAMP, last_used_at = CURRENT_TIMESTAMP",
+                *key, translation
+            )
+
+        try:
+            await self.bot.execute_db_operation(store_translation)
+        except Exception as e:
+            logging.warning(f"Failed to store translation in cache: {e}")
+
+    async def prune(self):
+        """Removes expired rows and trims the table to max_rows, least recently used first."""
+        async def prune_rows(conn):
+            expired = await conn.execute(
+                "DELETE FROM translation_cache WHERE created_at <= CURRENT_TIMESTAMP - make_interval(secs => $1)",
+                self.ttl
+            )
+            trimmed = await conn.execute(
+                "DELETE FROM translation_cache WHERE ctid IN ("
+                "SELECT ctid FROM translation_cache ORDER BY last_used_at DESC OFFSET $1)",
+                self.max_rows
+            )
+            return expired, trimmed
+
+        try:
+            expired, trimmed = await self.bot.execute_db_operation(prune_rows)
+            logging.info(f"Translation cache pruned ({expired}, {trimmed})")
+        except Exception as e:
+            logging.warning(f"Failed to prune translation cache: {e}")
+
+    @property
+    def hit_ratio(self):
+        hits = self.memory.hits + self.db_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'memory_hits': self.memory.hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'memory_entries': len(self.memory),
+        }
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+GOOGLE_TRANSLATE_URL = "https://translate.google.com/m"
+GOOGLE_LANGUAGES_URL = "https://translate.googleapis.com/translate_a/l"
+MAX_CHARS = 5000
+
+
+class TranslationError(Exception):
+    """Raised when the translation backend fails or returns no translation."""
+    pass
+
+
+class GoogleTranslateClient:
+    """
+    Non-blocking client for the Google Translate endpoint used by deep_translator.
+
+    A single aiohttp session is kept open for the lifetime of the client so
+    connections are reused across translations. Every request has a timeout and
+    a semaphore bounds how many are in flight at once, so a slow upstream delays
+    translations instead of the event loop.
+
+    Attributes:
+        base_url (str): Translation endpoint
+        timeout (float): Seconds before a request is abandoned
+        max_concurrency (int): Maximum number of requests in flight
+    """
+
+    def __init__(self, *, base_url=GOOGLE_TRANSLATE_URL, timeout=10.0, max_concurrency=8):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    @staticmethod
+    def parse_translation(html):
+        soup = BeautifulSoup(html, "html.parser")
+        element = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+        return element.get_text(strip=True) if element else None
+
+    async def supported_languages(self):
+        """Fetches the provider's target languages as a dict of language code to English name."""
+        params = {"client": "gtx", "hl": "en"}
+        try:
+            async with self._get_session().get(GOOGLE_LANGUAGES_URL, params=params) as response:
+                if response.status != 200:
+                    raise TranslationError(f"Language list request returned HTTP {response.status}")
+                data = await response.json(content_type=None)
+        except asyncio.TimeoutError:
+            raise TranslationError(f"Language list request timed out after {self.timeout} seconds")
+        except aiohttp.ClientError as e:
+            raise TranslationError(f"Language list request failed: {e}")
+
+        languages = data.get("tl") if isinstance(data, dict) else None
+        if not languages:
+            raise TranslationError("Language list response contained no languages")
+        return languages
+
+    async def translate(self, text, source, target):
+        """
+        Translates text from source to target.
+
+        Args:
+            text (str): Text to translate, at most 5000 characters
+            source (str): Source language code, or 'auto'
+            target (str): Target language code
+
+        Returns:
+            str: The translated text
+
+        Raises:
+            TranslationError: If the request fails, times out or returns no translation
+        """
+        text = text.strip()
+        if not text or source == target:
+            return text
+        if len(text) > MAX_CHARS:
+            raise TranslationError(f"Text exceeds {MAX_CHARS} characters")
+
+        params = {"sl": source, "tl": target, "q": text}
+        async with self._semaphore:
+            try:
+                async with self._get_session().get(self.base_url, params=params) as response:
+                    if response.status == 429:
+                        raise TranslationError("Too many requests to the translation service")
+                    if response.status != 200:
+                        raise TranslationError(f"Translation service returned HTTP {response.status}")
+                    html = await response.text()
+            except asyncio.TimeoutError:
+                raise TranslationError(f"Translation timed out after {self.timeout} seconds")
+            except aiohttp.ClientError as e:
+                raise TranslationError(f"Translation request failed: {e}")
+
+        translation = self.parse_translation(html)
+        if not translation:
+            logging.warning(f"No translation found in response for {source} -> {target}")
+            raise TranslationError(f"Translation failed for {source} to {target}")
+        return translation
@@ -0,0 +1,284 @@
+import abc
+import asyncio
+import logging
+import os
+import time
+
+import aiohttp
+
+from utils.translation_client import GoogleTranslateClient, TranslationError
+
+# LibreTranslate uses its own codes for a few languages
+LIBRETRANSLATE_CODES = {
+    'zh-CN': 'zh',
+    'zh-TW': 'zt',
+    'fil': 'tl',
+}
+
+
+class ProviderStats:
+    """Rolling latency and error metrics for one provider."""
+    __slots__ = ('requests', 'errors', 'cancelled', 'latency', 'success_rate',
+                 'consecutive_failures', 'tripped_until', 'last_used')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.latency = None
+        self.success_rate = 1.0
+        self.consecutive_failures = 0
+        self.tripped_until = 0.0
+        self.last_used = time.monotonic()
+
+    def record_latency(self, elapsed, alpha=0.2):
+        self.latency = elapsed if self.latency is None else (1 - alpha) * self.latency + alpha * elapsed
+
+    def record_success(self, elapsed, alpha=0.2):
+        self.requests += 1
+        self.record_latency(elapsed, alpha)
+        self.success_rate = (1 - alpha) * self.success_rate + alpha
+        self.consecutive_failures = 0
+
+    def record_failure(self, alpha=0.2, trip_after=3, trip_for=30.0):
+        self.requests += 1
+        self.errors += 1
+        self.success_rate = (1 - alpha) * self.success_rate
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= trip_after:
+            self.tripped_until = time.monotonic() + trip_for
+
+    @property
+    def healthy(self):
+        return time.monotonic() >= self.tripped_until
+
+
+class TranslationProvider(abc.ABC):
+    """Base class for translation backends."""
+    name = 'provider'
+
+    def __init__(self, *, weight=1.0):
+        self.weight = weight
+        self.stats = ProviderStats()
+
+    @property
+    def score(self):
+        """Higher is better: the recent success rate, discounted by latency and the provider's weight."""
+        latency = self.stats.latency if self.stats.latency is not None else 0.5
+        return self.weight * self.stats.success_rate / (0.1 + latency)
+
+    @abc.abstractmethod
+    async def translate(self, text, source, target):
+        """Returns text translated from source to target, raising TranslationError on failure."""
+
+    async def close(self):
+        pass
+
+
+class GoogleProvider(TranslationProvider):
+    name = 'google'
+
+    def __init__(self, client=None, *, weight=1.0):
+        super().__init__(weight=weight)
+        self.client = client or GoogleTranslateClient()
+
+    async def translate(self, text, source, target):
+        return await self.client.translate(text, source, target)
+
+    async def supported_languages(self):
+        return await self.client.supported_languages()
+
+    async def close(self):
+        await self.client.close()
+
+
+class LibreTranslateProvider(TranslationProvider):
+    """Client for a self-hosted LibreTranslate-compatible /translate endpoint."""
+    name = 'libretranslate'
+
+    def __init__(self, base_url, *, api_key=None, timeout=10.0, max_concurrency=8, weight=0.8):
+        super().__init__(weight=weight)
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def translate(self, text, source, target):
+        payload = {
+            'q': text,
+            'source': LIBRETRANSLATE_CODES.get(source, source),
+            'target': LIBRETRANSLATE_CODES.get(target, target),
+            'format': 'text',
+        }
+        if self.api_key:
+            payload['api_key'] = self.api_key
+
+        async with self._semaphore:
+            try:
+                async with self._get_session().post(f"{self.base_url}/translate", json=payload) as response:
+                    if response.status != 200:
+                        raise TranslationError(f"LibreTranslate returned HTTP {response.status}")
+                    data = await response.json()
+            except asyncio.TimeoutError:
+                raise TranslationError(f"LibreTranslate timed out after {self.timeout} seconds")
+            except aiohttp.ClientError as e:
+                raise TranslationError(f"LibreTranslate request failed: {e}")
+
+        translation = data.get('translatedText') if isinstance(data, dict) else None
+        if not translation:
+            raise TranslationError(f"Translation failed for {source} to {target}")
+        return translation
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+class ProviderRouter:
+    """
+    Routes translations across providers with hedging and failover.
+
+    Providers are ranked by health score. The best one is tried first; if it has
+    not answered within the hedge delay the next one is started as well, and the
+    first successful reply wins. A provider that fails hands over to the next one
+    immediately, and one that fails several times in a row is skipped for a while.
+    A provider that failures, a trip or slow replies have ranked below one it is
+    preferred over, and that has not been used for probe_interval seconds, is
+    tried first once so it can win its place back after it recovers. Providers
+    ranked in their preferred order are never probed, so a healthy primary
+    serves every request and the others are only hedges and failovers.
+
+    Attributes:
+        providers (list[TranslationProvider]): Providers in order of preference
+        hedge_delay (float): Longest wait before hedging to the next provider
+        probe_interval (float): Seconds after which an idle, demoted provider is tried first again
+        trip_for (float): Seconds a provider is skipped after repeated failures
+    """
+
+    def __init__(self, providers, *, hedge_delay=1.5, probe_interval=30.0, trip_for=30.0):
+        self.providers = providers
+        self.hedge_delay = hedge_delay
+        self.probe_interval = probe_interval
+        self.trip_for = trip_for
+
+    def ranked(self):
+        healthy = [p for p in self.providers if p.stats.healthy]
+        return sorted(healthy or self.providers, key=lambda p: p.score, reverse=True)
+
+    def _with_probe(self, ranked):
+        """Moves the first demoted provider that has been idle for probe_interval to the front."""
+        now = time.monotonic()
+        preference = {provider: i for i, provider in enumerate(self.providers)}
+        for position, provider in enumerate(ranked[1:], 1):
+            demoted = any(preference[ahead] > preference[provider] for ahead in ranked[:position])
+            if demoted and now - provider.stats.last_used >= self.probe_interval:
+                return [provider] + [p for p in ranked if p is not provider]
+        return ranked
+
+    def hedge_delay_for(self, provider):
+        if provider.stats.latency is None:
+            return self.hedge_delay
+        return max(0.25, min(provider.stats.latency * 3, self.hedge_delay))
+
+    async def _call(self, provider, text, source, target):
+        start = time.perf_counter()
+        provider.stats.last_used = time.monotonic()
+        try:
+            result = await provider.translate(text, source, target)
+        except asyncio.CancelledError:
+            # Losing a hedge means the provider took at least this long
+            provider.stats.cancelled += 1
+            provider.stats.record_latency(time.perf_counter() - start)
+            raise
+        except Exception:
+            provider.stats.record_failure(trip_for=self.trip_for)
+            raise
+        provider.stats.record_success(time.perf_counter() - start)
+        return result
+
+    async def translate(self, text, source, target):
+        """Translates text with the healthiest provider, hedging and failing over as needed."""
+        ranked = self.ranked()
+        candidates = iter(self._with_probe(ranked))
+        pending = {}
+        errors = []
+
+        def launch():
+            provider = next(candidates, None)
+            if provider is not None:
+                pending[asyncio.create_task(self._call(provider, text, source, target))] = provider
+            return provider
+
+        if launch() is None:
+            raise TranslationError("No translation providers are configured")
+        # Probes are hedged on the best provider's latency so they cost little when still slow
+        primary = ranked[0]
+        hedge_delay = self.hedge_delay_for(primary)
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    provider = launch()
+                    if provider is not None:
+                        logging.info(f"Hedging translation to {provider.name} after {hedge_delay:.2f}s")
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        errors.append(f"{provider.name}: {e}")
+                        logging.warning(f"Translation provider {provider.name} failed: {e}")
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise TranslationError("All translation providers failed (" + "; ".join(errors) + ")")
+
+    async def supported_languages(self):
+        for provider in self.providers:
+            if hasattr(provider, 'supported_languages'):
+                return await provider.supported_languages()
+        raise TranslationError("No provider can list supported languages")
+
+    def stats(self):
+        return {
+            provider.name: {
+                'requests': provider.stats.requests,
+                'errors': provider.stats.errors,
+                'cancelled': provider.stats.cancelled,
+                'latency': provider.stats.latency,
+                'score': provider.score,
+                'healthy': provider.stats.healthy,
+            }
+            for provider in self.providers
+        }
+
+    async def close(self):
+        for provider in self.providers:
+            await provider.close()
+
+
+def build_router_from_env():
+    """Builds the router from the LIBRETRANSLATE_URL and LIBRETRANSLATE_API_KEY environment variables."""
+    providers = [GoogleProvider()]
+    libretranslate_url = os.getenv('LIBRETRANSLATE_URL')
+    if libretranslate_url:
+        providers.append(LibreTranslateProvider(libretranslate_url, api_key=os.getenv('LIBRETRANSLATE_API_KEY')))
+    return ProviderRouter(providers)
@@ -0,0 +1,142 @@
+import logging
+import time
+
+
+class TrackedTranslation:
+    """A translation the bot posted in reply to a flag reaction."""
+    __slots__ = ('translation_id', 'channel_id', 'expires_at', 'timer')
+
+    def __init__(self, translation_id, channel_id, expires_at):
+        self.translation_id = translation_id
+        self.channel_id = channel_id
+        self.expires_at = expires_at
+        self.timer = None
+
+
+class TranslationTracker:
+    """
+    Remembers which translation message was posted for each (message, language) pair.
+
+    Entries live in a dict for O(1) lookups, and each one has a timer on the bot's
+    timer wheel that drops it when it expires, so nothing has to scan for expired
+    entries. Once max_entries is reached the oldest entries are evicted first.
+
+    When persist is set, entries are also written to the translated_messages table so
+    reaction removal still finds translations posted before a restart.
+
+    Attributes:
+        ttl (float): Seconds a translation stays tracked
+        max_entries (int): Maximum number of entries kept in memory
+        persist (bool): Whether entries are stored in the database
+    """
+
+    def __init__(self, bot, *, ttl=3600.0, max_entries=50_000, persist=True):
+        self.bot = bot
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _push(self, key, entry):
+        self._discard(key)
+        entry.timer = self.bot.timer_wheel.schedule(
+            entry.expires_at - time.time(), self._expire_entry, key, entry, kind='translation'
+        )
+        self._entries[key] = entry
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.timer is not None:
+            entry.timer.cancel()
+        return entry
+
+    def _expire_entry(self, key, entry):
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+
+    def get(self, message_id, lang):
+        """Returns the in-memory entry for a message and language, or None."""
+        entry = self._entries.get((message_id, lang))
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry
+
+    async def lookup(self, message_id, lang):
+        """Returns the entry for a message and language, falling back to the database."""
+        entry = self.get(message_id, lang)
+        if entry is not None or not self.persist:
+            return entry
+
+        async def fetch_entry(conn):
+            return await conn.fetchrow(
+                "SELECT translation_id, channel_id, extract(epoch FROM expires_at) AS expires_at "
+                "FROM translated_messages WHERE message_id = $1 AND lang = $2 AND expires_at > now()",
+                message_id, lang
+            )
+
+        try:
+            row = await self.bot.execute_db_operation(fetch_entry)
+        except Exception as e:
+            logging.warning(f"Failed to look up tracked translation: {e}")
+            return None
+
+        if row is None:
+            return None
+        entry = TrackedTranslation(row['translation_id'], row['channel_id'], float(row['expires_at']))
+        self._push((message_id, lang), entry)
+        return entry
+
+    async def add(self, message_id, lang, translation_id, channel_id):
+        entry = TrackedTranslation(translation_id, channel_id, time.time() + self.ttl)
+        while self._entries and len(self._entries) >= self.max_entries:
+            self._discard(next(iter(self._entries)))
+        self._push((message_id, lang), entry)
+
+        if not self.persist:
+            return
+
+        async def store_entry(conn):
+            await conn.execute(
+                "INSERT INTO translated_messages (message_id, lang, translation_id, channel_id, expires_at) "
+                "VALUES ($1, $2, $3, $4, to_timestamp($5)) "
+                "ON CONFLICT (message_id, lang) DO UPDATE SET translation_id = $3, channel_id = $4, expires_at = to_timestamp($5)",
+                message_id, lang, translation_id, channel_id, entry.expires_at
+            )
+
+        try:
+            await self.bot.execute_db_operation(store_entry)
+        except Exception as e:
+            logging.warning(f"Failed to persist tracked translation: {e}")
+
+    async def remove(self, message_id, lang):
+        self._discard((message_id, lang))
+
+        if not self.persist:
+            return
+
+        async def delete_entry(conn):
+            await conn.execute(
+                "DELETE FROM translated_messages WHERE message_id = $1 AND lang = $2",
+                message_id, lang
+            )
+
+        try:
+            await self.bot.execute_db_operation(delete_entry)
+        except Exception as e:
+            logging.warning(f"Failed to delete tracked translation: {e}")
+
+    async def prune_persisted(self):
+        """Deletes expired rows from the database."""
+        if not self.persist:
+            return
+
+        async def delete_expired(conn):
+            await conn.execute("DELETE FROM translated_messages WHERE expires_at <= now()")
+
+        try:
+            await self.bot.execute_db_operation(delete_expired)
+        except Exception as e:
+            logging.warning(f"Failed to prune tracked translations: {e}")
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import discord
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional, oversized images are skipped without it
+    Image = None
+
+MAX_ATTACHMENTS_PER_MESSAGE = 10
+DEFAULT_UPLOAD_LIMIT = 10 * 1024 * 1024  # Discord's limit for unboosted guilds and DMs
+
+_recompress_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="recompress")
+
+
+def get_upload_limit(channel):
+    """Returns the per-message upload limit in bytes for a channel."""
+    guild = getattr(channel, "guild", None)
+    if guild is not None:
+        return guild.filesize_limit
+    return DEFAULT_UPLOAD_LIMIT
+
+
+def plan_uploads(sizes, max_files=MAX_ATTACHMENTS_PER_MESSAGE, max_bytes=DEFAULT_UPLOAD_LIMIT):
+    """
+    Bin-packs attachments into as few messages as possible.
+
+    Uses first-fit decreasing, a heuristic that usually comes close to the fewest
+    messages but is not guaranteed to find them.
+
+    Args:
+        sizes (list[int]): Size in bytes of each attachment
+        max_files (int): Maximum number of attachments per message
+        max_bytes (int): Maximum total upload size per message
+
+    Returns:
+        tuple[list[list[int]], list[int]]: The batches as lists of indexes in their
+        original order, and the indexes that do not fit in any message.
+    """
+    batches = []
+    batch_sizes = []
+    oversized = []
+
+    for index in sorted(range(len(sizes)), key=lambda i: sizes[i], reverse=True):
+        size = sizes[index]
+        if size > max_bytes:
+            oversized.append(index)
+            continue
+        for b, batch in enumerate(batches):
+            if len(batch) < max_files and batch_sizes[b] + size <= max_bytes:
+                batch.append(index)
+                batch_sizes[b] += size
+                break
+        else:
+            batches.append([index])
+            batch_sizes.append(size)
+
+    batches = sorted((sorted(batch) for batch in batches), key=lambda batch: batch[0])
+    return batches, sorted(oversized)
+
+
+def shrink_image(path, max_bytes):
+    """
+    Re-encodes an image as JPEG until it fits in max_bytes.
+
+    The JPEG is written next to the original with a .jpg extension and replaces
+    it on success; on failure the original is left as it was.
+
+    Returns:
+        str | None: Path of the shrunk image, or None if it could not be made to fit
+    """
+    if Image is None:
+        return None
+
+    with Image.open(path) as original:
+        image = original.convert("RGB")
+
+    root, extension = os.path.splitext(path)
+    target = root + ".jpg"
+    if extension.lower() in (".jpg", ".jpeg"):
+        target = path
+    elif os.path.exists(target):
+        target = f"{root}-recompressed.jpg"
+
+    for _ in range(6):
+        for quality in (85, 75, 65, 50):
+            image.save(target, format="JPEG", quality=quality, optimize=True)
+            if os.path.getsize(target) <= max_bytes:
+                if target != path:
+                    os.remove(path)
+                return target
+        image = image.resize((int(image.width * 0.75), int(image.height * 0.75)), Image.LANCZOS)
+    if target != path:
+        os.remove(target)
+    return None
+
+
+async def recompress_images(paths, max_bytes):
+    """
+    Shrinks the given images in the worker pool.
+
+    Returns:
+        dict[str, str]: Original path to the shrunk image's path, for the images that now fit
+    """
+    if Image is None:
+        logging.info("Pillow is not installed, skipping recompression of oversized images")
+        return {}
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(_recompress_pool, shrink_image, path, max_bytes) for path in paths),
+        return_exceptions=True
+    )
+
+    shrunk = {}
+    for path, result in zip(paths, results):
+        if isinstance(result, Exception):
+            logging.warning(f"Failed to recompress {path}: {result}")
+        elif result:
+            shrunk[path] = result
+    return shrunk
+
+
+async def send_files_in_batches(channel, content, paths, *, recompress=True):
+    """
+    Uploads files to a channel using as few messages as the channel's limits allow.
+
+    Parts are sent one after another, each holding its files in the order given.
+    Since files are grouped by size, a part can hold files that were not adjacent,
+    so the order is only kept within each part, not across them.
+
+    Args:
+        channel (discord.abc.Messageable): Where to send the files
+        content (str): Message text, suffixed with the part number when split
+        paths (list[str]): Files to upload
+        recompress (bool): Whether to recompress images that exceed the upload limit
+
+    Returns:
+        list[str]: The paths that could not be sent because they are too large.
+    """
+    max_bytes = get_upload_limit(channel)
+    sizes = [os.path.getsize(path) for path in paths]
+
+    if recompress:
+        too_large = [path for path, size in zip(paths, sizes) if size > max_bytes]
+        if too_large:
+            shrunk = await recompress_images(too_large, max_bytes)
+            paths = [shrunk.get(path, path) for path in paths]
+            sizes = [os.path.getsize(path) for path in paths]
+
+    batches, oversized = plan_uploads(sizes, max_bytes=max_bytes)
+    for part, batch in enumerate(batches, start=1):
+        text = content if len(batches) == 1 else f"{content} ({part}/{len(batches)})"
+        files = [discord.File(paths[i], filename=os.path.basename(paths[i])) for i in batch]
+        await channel.send(text, files=files)
+    return [paths[i] for i in oversized]